@@ -1,10 +1,15 @@
+import sys
+
 from ansys.aedt.core import Hfss
 
+# Headless by default; --graphical opens the AEDT window and waits for Enter at the end
+GRAPHICAL = "--graphical" in sys.argv[1:]
+
 # Launch HFSS using updated PyAEDT syntax
 hfss = Hfss(
     project="MyHFSS_Project",
     design="PatchDesign",
-    non_graphical=False,
+    non_graphical=not GRAPHICAL,
     new_desktop=True
 )
 
@@ -18,8 +23,9 @@ box.transparency = 0.6
 # Save project
 hfss.save_project()
 
-# Wait for user input before closing HFSS
-input("\n✅ HFSS is open. Press Enter to close it...")
+# Wait for user input before closing HFSS (graphical sessions only)
+if not hfss.non_graphical:
+    input("\n✅ HFSS is open. Press Enter to close it...")
 
 # Close and release AEDT
 hfss.release_desktop(close_projects=True, close_desktop=True)
@@ -0,0 +1,169 @@
+import argparse
+import csv
+import json
+import os
+import time
+
+from sweep_scheduler import run_sweep, write_table
+
+# Headless batch runner: every row of a JSON/CSV design file goes through the
+# full build -> analyze -> export pipeline in non-graphical sessions, with no
+# input() prompts, and the results land in one summary table.
+#
+#   python batch_cli.py designs.csv --workers 2 --cores 4 --summary summary.csv
+#   python batch_cli.py designs.csv --dry-run      # analytic dimensions only, no AEDT
+#
+# designs.json is a list of parameter dicts (or {"designs": [...]});
+# designs.csv has one parameter per column (',' or ';' delimited). Keys are
+# patch_pipeline.DEFAULT_PARAMS names (f0, h, W, L, truncation, yf_from_origin,
+# ...) plus an optional "name" label. Empty cells keep the default; the value
+# "analytic" uses the transmission-line value instead of the hand-tuned one.
+
+DRY_RUN_COLUMNS = [
+    "index", "name", "status", "material_name", "eps_r", "eps_eff", "W", "L", "W_sub", "L_sub",
+    "truncation", "xf_from_origin", "yf_from_origin", "air_margin",
+]
+
+SUMMARY_COLUMNS = [
+    "index", "name", "status", "S11_min_dB", "f_res_GHz", "S11_f0_dB", "AR_boresight_dB",
+    "W", "L", "truncation", "xf_from_origin", "yf_from_origin", "cached", "elapsed_s",
+]
+
+
+_MISSING = object()
+
+
+def _coerce(value):
+    if value is None:
+        return _MISSING
+    value = value.strip()
+    if value == "":
+        return _MISSING
+    if value.lower() == "analytic":
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_designs(path):
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        designs = data["designs"] if isinstance(data, dict) else data
+        designs = [{k: (None if v == "analytic" else v) for k, v in d.items()} for d in designs]
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+            designs = [{k: _coerce(v) for k, v in row.items()} for row in csv.DictReader(f, dialect=dialect)]
+    # Unset values fall back to the pipeline defaults
+    return [{k: v for k, v in d.items() if v is not _MISSING} for d in designs]
+
+
+def format_table(rows, columns):
+    columns = [c for c in columns if any(c in row for row in rows)]
+    cells = [[("" if row.get(c) is None else f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]))
+              for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells)
+    return "\n".join(lines)
+
+
+# Analytic dimensions of every design from the material snapshot, no AEDT
+def dry_run(designs, snapshot=None):
+    from material_cache import MaterialSnapshot
+    from patch_pipeline import DEFAULT_PARAMS, read_material, patch_dimensions
+    snapshot = snapshot or MaterialSnapshot()
+    rows = []
+    for index, design in enumerate(designs):
+        params = {**DEFAULT_PARAMS, **{k: v for k, v in design.items() if k != "name"}}
+        row = {"index": index, **design, "material_name": params["material_name"]}
+        try:
+            material = read_material(None, params["material_name"], snapshot)
+            dims = patch_dimensions(params, material["eps_r"])
+            row.update({"eps_r": material["eps_r"], **{c: dims[c] for c in DRY_RUN_COLUMNS if c in dims}})
+            row["status"] = "ok"
+        except ValueError as e:
+            row["status"] = f"failed: {e}"
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a batch of patch designs non-graphically.")
+    parser.add_argument("designs", help="JSON or CSV file of design parameter sets")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "batch_results"))
+    parser.add_argument("--summary", help="Summary table path (default: <output-dir>/summary.csv)")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent HFSS sessions (licence budget)")
+    parser.add_argument("--cores", type=int, default=4, help="Cores per design solve")
+    parser.add_argument("--core-budget", type=int, help="Total cores available (default: all)")
+    parser.add_argument("--version", help="AEDT version, e.g. 2024.2")
+    parser.add_argument("--cache-dir", help="Reuse solved designs from this DesignCache")
+    parser.add_argument("--store-dir", help="Index every run in this ResultsStore")
+    parser.add_argument("--adaptive-sweep", action="store_true", help="Use the adaptive SweepPlanner")
+    parser.add_argument("--local-far-field", action="store_true", help="Compute far-field metrics locally")
+    parser.add_argument("--parametric", action="store_true", help="Build on AEDT design variables")
+    parser.add_argument("--dry-run", action="store_true", help="Analytic design table only, no AEDT")
+    parser.add_argument("--overlap", action="store_true",
+                        help="One session, post-processing overlapped with the next solve (asyncio)")
+    args = parser.parse_args(argv)
+
+    if args.overlap:
+        ignored = [flag for flag, value in [("--adaptive-sweep", args.adaptive_sweep), ("--cache-dir", args.cache_dir),
+                                            ("--store-dir", args.store_dir), ("--core-budget", args.core_budget),
+                                            ("--workers", args.workers != 1)] if value]
+        if ignored:
+            parser.error(f"--overlap runs one session with the fixed sweep and cannot be combined with "
+                         f"{', '.join(ignored)}")
+
+    designs = read_designs(args.designs)
+    if not designs:
+        parser.error(f"No designs found in {args.designs}")
+
+    if args.dry_run:
+        rows = dry_run(designs)
+        os.makedirs(args.output_dir, exist_ok=True)
+        write_table(args.summary or os.path.join(args.output_dir, "design_table.csv"), rows)
+        print("\n" + format_table(rows, DRY_RUN_COLUMNS) + "\n")
+        return 1 if any(r["status"] != "ok" for r in rows) else 0
+
+    design_options = {"local_far_field": args.local_far_field, "parametric": args.parametric}
+    if args.adaptive_sweep:
+        from sweep_planner import SweepPlanner
+        design_options["planner"] = SweepPlanner()
+
+    start = time.time()
+    if args.overlap:
+        from orchestrator import run_async
+        rows = run_async(designs, cores=args.cores, project_dir=args.output_dir, version=args.version,
+                         design_options=design_options)
+    else:
+        rows = run_sweep(
+            designs,
+            cores_per_job=args.cores,
+            core_budget=args.core_budget,
+            licences=args.workers,
+            version=args.version,
+            project_dir=args.output_dir,
+            cache_dir=args.cache_dir,
+            store_dir=args.store_dir,
+            design_options=design_options,
+        )
+    total = time.time() - start
+
+    write_table(args.summary or os.path.join(args.output_dir, "summary.csv"), rows)
+    print("\n" + format_table(rows, SUMMARY_COLUMNS) + "\n")
+    failed = sum(1 for r in rows if r.get("status") != "ok")
+    print(f"✅ {len(rows) - failed}/{len(rows)} design(s) finished in {total:.1f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
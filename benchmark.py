@@ -0,0 +1,196 @@
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+from fake_hfss import FakeHfss
+
+# Python-side benchmark of the scripts and the pipeline stages against the
+# FakeHfss backend, on any machine (no AEDT, no licence).
+#
+#   python benchmark.py --latency 2 --repeat 3
+#   python benchmark.py --json bench.json                    # save a baseline
+#   python benchmark.py --baseline bench.json --tolerance 0.2
+#
+# For every script and every pipeline stage it reports AEDT round trips,
+# wall time and peak Python memory (tracemalloc). With --baseline the run
+# fails (exit 1) when a round-trip count grows or a time exceeds the baseline
+# by more than --tolerance.
+
+SCRIPTS = ["create_box.py", "create_fr4_patch.py", "backup.py"]
+
+STAGES = ["material", "geometry", "excitations", "setup", "analyze", "post_process"]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# Make `from ansys.aedt.core import Hfss` return FakeHfss while active
+@contextlib.contextmanager
+def fake_pyaedt(instances):
+    def factory(*args, **kwargs):
+        hfss = FakeHfss(*args, **kwargs)
+        instances.append(hfss)
+        return hfss
+
+    core = types.ModuleType("ansys.aedt.core")
+    core.Hfss = factory
+    modules = {"ansys": types.ModuleType("ansys"), "ansys.aedt": types.ModuleType("ansys.aedt"), "ansys.aedt.core": core}
+    saved = {name: sys.modules.get(name) for name in modules}
+    saved_input = builtins.input
+    sys.modules.update(modules)
+    builtins.input = lambda prompt="": ""
+    try:
+        yield
+    finally:
+        builtins.input = saved_input
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+@contextlib.contextmanager
+def measure(result, quiet=True):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            yield
+    finally:
+        result["time_s"] = time.perf_counter() - start
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+
+def bench_script(path, quiet=True):
+    instances = []
+    result = {"name": os.path.basename(path), "status": "ok"}
+    cwd, home = os.getcwd(), os.environ.get("HOME")
+    with tempfile.TemporaryDirectory() as tmp, fake_pyaedt(instances):
+        # Fresh home: no material snapshot or caches left by earlier runs
+        os.chdir(tmp)
+        os.environ["HOME"] = tmp
+        try:
+            with measure(result, quiet):
+                runpy.run_path(path, run_name="__main__")
+        except Exception as e:
+            result["status"] = f"{type(e).__name__}: {e}"
+        finally:
+            os.chdir(cwd)
+            if home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = home
+    result["rpc"] = sum(h.rpc_count for h in instances)
+    return result
+
+
+def bench_pipeline(params=None, quiet=True):
+    from patch_pipeline import (
+        DEFAULT_PARAMS, read_material, patch_dimensions, build_geometry,
+        assign_excitations, create_analysis, post_process,
+    )
+
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    hfss = FakeHfss(project="Benchmark", design="FR4PatchDesign", solution_type="Modal")
+    state = {}
+    steps = {
+        "material": lambda: state.update(material=read_material(hfss, params["material_name"])),
+        "geometry": lambda: (state.update(dims=patch_dimensions(params, state["material"]["eps_r"])),
+                             build_geometry(hfss, params, state["dims"])),
+        "excitations": lambda: assign_excitations(hfss),
+        "setup": lambda: create_analysis(hfss, params["f0"]),
+        "analyze": lambda: hfss.analyze(),
+        "post_process": lambda: post_process(hfss, params, state["material"], state["dims"]),
+    }
+    rows = []
+    for stage in STAGES:
+        before = hfss.rpc_count
+        result = {"name": f"pipeline:{stage}", "status": "ok"}
+        with measure(result, quiet):
+            steps[stage]()
+        result["rpc"] = hfss.rpc_count - before
+        rows.append(result)
+    return rows
+
+
+def run_benchmarks(scripts=None, latency=0.0, repeat=1, quiet=True):
+    FakeHfss.latency = latency
+    runs = []
+    for _ in range(repeat):
+        rows = [bench_script(os.path.join(HERE, s), quiet) for s in (scripts or SCRIPTS)]
+        rows += bench_pipeline(quiet=quiet)
+        runs.append(rows)
+    # Best time of the repeats, memory and call counts from the first
+    best = []
+    for i, row in enumerate(runs[0]):
+        best.append({**row, "time_s": min(r[i]["time_s"] for r in runs)})
+    return best
+
+
+def compare(rows, baseline, tolerance=0.2):
+    reference = {r["name"]: r for r in baseline}
+    problems = []
+    for row in rows:
+        ref = reference.get(row["name"])
+        if ref is None:
+            continue
+        if row["rpc"] > ref["rpc"]:
+            problems.append(f"{row['name']}: {row['rpc']} round trips (baseline {ref['rpc']})")
+        if row["time_s"] > ref["time_s"] * (1 + tolerance) and row["time_s"] - ref["time_s"] > 1e-3:
+            problems.append(f"{row['name']}: {row['time_s']:.4f} s (baseline {ref['time_s']:.4f} s)")
+    return problems
+
+
+def print_table(rows):
+    print(f"\n{'Benchmark':<28}{'Round trips':>12}{'Time (ms)':>12}{'Peak (MB)':>11}  Status")
+    for r in rows:
+        print(f"{r['name']:<28}{r['rpc']:>12}{r['time_s'] * 1e3:>12.2f}{r['peak_mb']:>11.2f}  {r['status']}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scripts and pipeline against a fake HFSS.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-call latency in ms")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--scripts", nargs="*", help=f"Scripts to run (default: {' '.join(SCRIPTS)})")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--verbose", action="store_true", help="Show script output")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmarks(args.scripts, args.latency / 1e3, args.repeat, quiet=not args.verbose)
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latency_ms": args.latency, "results": rows}, f, indent=2)
+        print(f"✅ Results saved to: {args.json}")
+
+    failed = [r for r in rows if r["status"] != "ok"]
+    for r in failed:
+        print(f"❌ {r['name']} failed: {r['status']}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(rows, json.load(f)["results"], args.tolerance)
+        for p in problems:
+            print(f"❌ Regression in {p}")
+        if problems:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import time
+
+from solution_batch import SolutionSet
+
+# Resumable build -> solve -> post pipeline, one run directory per design.
+#
+#   ckpt = Checkpoint("fr4_patch_run", params=params, material=material, setup=SETUP_PROPS, sweep=SWEEP)
+#   ckpt.done("build")          # geometry, excitations and setup saved in ckpt.project_file
+#   ckpt.done("solve")          # solved project (.aedt + .aedtresults) saved
+#   ckpt.done("post")           # results in the manifest, arrays in solutions.npz
+#
+# manifest.json records the completed stages and a hash of the inputs; a
+# rerun with other inputs starts over. A rerun with the same inputs reopens
+# the saved project after build or solve and skips straight to the first
+# unfinished stage, or returns the stored results when post is done.
+
+STAGES = ["build", "solve", "post"]
+
+MANIFEST_FORMAT = 1
+
+
+class Checkpoint:
+    def __init__(self, run_dir, project_name="Project", restart=False, **inputs):
+        self.run_dir = os.path.abspath(run_dir)
+        self.project_file = os.path.join(self.run_dir, f"{project_name}.aedt")
+        self.arrays_path = os.path.join(self.run_dir, "solutions.npz")
+        self.manifest_path = os.path.join(self.run_dir, "manifest.json")
+        self.key = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.manifest = None if restart else self._read()
+        if self.manifest is not None and self.manifest.get("key") != self.key:
+            print(f"♻️ Inputs changed since the checkpoint in {self.run_dir}: starting over")
+            self.manifest = None
+        if self.manifest is None:
+            self.manifest = {"format": MANIFEST_FORMAT, "key": self.key, "stages": {}}
+            self._write()
+
+    def _read(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("format") == MANIFEST_FORMAT else None
+
+    def _write(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(tmp, self.manifest_path)
+
+    def done(self, stage):
+        return stage in self.manifest["stages"]
+
+    # Last completed stage, None before build
+    def last(self):
+        return next((s for s in reversed(STAGES) if self.done(s)), None)
+
+    # Stages after `stage` are invalidated: a rebuilt design must be re-solved
+    def mark(self, stage, **info):
+        stages = self.manifest["stages"]
+        for later in STAGES[STAGES.index(stage) + 1:]:
+            stages.pop(later, None)
+        stages[stage] = {"completed": time.strftime("%Y-%m-%d %H:%M:%S"), **info}
+        self._write()
+        print(f"📌 Checkpoint: {stage} done ({self.run_dir})")
+
+    @property
+    def results(self):
+        return self.manifest["stages"].get("post", {}).get("results")
+
+    def solutions(self):
+        return SolutionSet.load(self.arrays_path) if os.path.exists(self.arrays_path) else None
+
+    # Reopen the checkpointed project (False when there is nothing to reopen)
+    def resume(self, hfss):
+        if not self.done("build") or not os.path.exists(self.project_file):
+            self.manifest["stages"].clear()
+            self._write()
+            return False
+        print(f"♻️ Resuming after {self.last()} from {self.project_file}")
+        # Already running (e.g. a live material read on a snapshot miss): restart on the checkpoint
+        if hfss.started:
+            hfss.release_desktop(close_projects=True, close_desktop=True)
+        hfss.configure(project=self.project_file, remove_lock=True, new_desktop=True)
+        return True
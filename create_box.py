@@ -1,77 +1,65 @@
-from ansys.aedt.core import Hfss
-import os
-import math
+import sys
 
-# Launch HFSS using updated PyAEDT syntax
-hfss = Hfss(
+from face_index import FaceIndex
+from lazy_session import LazyHfss
+from material_cache import MaterialSnapshot
+from patch_design import design_patch
+from patch_pipeline import read_material
+
+# Headless by default; --graphical opens the AEDT window and waits for Enter at the end
+GRAPHICAL = "--graphical" in sys.argv[1:]
+
+# Launch HFSS using updated PyAEDT syntax (deferred until the first modeler call)
+hfss = LazyHfss(
     project="MyHFSS_Project",
     design="FR4PatchDesign",
-    non_graphical=False,
+    non_graphical=not GRAPHICAL,
     new_desktop=True,
     solution_type="DrivenModal"
 )
 
 # Specify the material name (must exist in your material library)
 material_name = "FR4_epoxy"
-mat_obj = hfss.materials.exists_material(material_name)
-
-# Check if material exists
-if mat_obj:
-    material = hfss.materials[material_name]
-    
-    # Extract relevant properties
-    eps_r = material.permittivity.value                  # Dielectric constant
-    tan_d = material.dielectric_loss_tangent.value       # Loss tangent
-    mu_r = material.permeability.value                   # Magnetic permeability
-    sigma = material.conductivity.value                  # Conductivity (for conductors)
-
-    # Assign other important variables
-    f0 = 1.575e9   # Center frequency in GHz
-    h = 1.6        # meters # Substrate thickness in millimeters
-
-    print("\n================ Antenna Substrate and Design Parameters ================\n")
-    print(f"Center Design Frequency: {f0 / 1e9} GHz")
-    print(f"Substrate Material: {material_name}")
-    print(f"  Substrate Thickness (h): {h} mm")
-    print(f"  Relative Permittivity (εr): {eps_r}")
-    print(f"  Loss Tangent (tanδ): {tan_d}")
-    print(f"  Relative Permeability (μr): {mu_r}")
-    print(f"  Conductivity (σ): {sigma}")
-    print("\n=========================================================================\n")
-else:
-    print(f"Material {material_name} not found in the material library.")
-
-
-# Constants
-c = 3e11  # Speed of light in mm/s (converted to mm/s from m/s)
-eps_r = float(material.permittivity.value)                  # Dielectric constant
-
-# Patch Width (W)
-W = (c / (2 * f0)) * (math.sqrt(2 / (eps_r + 1)))
-
-# Effective dielectric constant (εeff)
-eps_eff = ((eps_r + 1) / 2) + ( ((eps_r - 1) / 2) * ((1 + (12 * h / W)) ** -0.5) )
-
-# Effective Length (Leff)
-Leff = c / (2 * f0 * math.sqrt(eps_eff))
-
-# Length extension due to fringing (ΔL)
-delta_L = (0.412 * h) * (((eps_eff + 0.3) * ((W / h) + 0.264)) / ((eps_eff - 0.258) * ((W / h) + 0.8)))
-
-# Actual Patch Length (L)
-L = Leff - 2 * delta_L
-
-# Substrate size (based on patch size plus 6 times the substrate thickness)
-W_sub = W + 6 * h
-L_sub = L + 6 * h
-
-# Feed point location (for coax-fed)
-xf = W / 2
-# Estimate y-offset using approximate equation
-yf = L / (2 * math.sqrt(eps_eff))
-
-# Corner truncation (for RHCP)
-truncation = L * (math.sqrt((4 * f0 * h) / (2 * c * math.sqrt(eps_r))))
+
+# Local material snapshot first, live library only on a miss
+try:
+    material = read_material(hfss, material_name, snapshot=MaterialSnapshot())
+except ValueError as e:
+    print(f"❌ {e}")
+    hfss.release_desktop(close_projects=True, close_desktop=True)
+    raise SystemExit(1)
+
+# Extract relevant properties
+eps_r = material["eps_r"]     # Dielectric constant
+tan_d = material["tan_d"]     # Loss tangent
+mu_r = material["mu_r"]       # Magnetic permeability
+sigma = material["sigma"]     # Conductivity (for conductors)
+
+# Assign other important variables
+f0 = 1.575e9   # Center frequency in GHz
+h = 1.6        # meters # Substrate thickness in millimeters
+
+print("\n================ Antenna Substrate and Design Parameters ================\n")
+print(f"Center Design Frequency: {f0 / 1e9} GHz")
+print(f"Substrate Material: {material_name}")
+print(f"  Substrate Thickness (h): {h} mm")
+print(f"  Relative Permittivity (εr): {eps_r}")
+print(f"  Loss Tangent (tanδ): {tan_d}")
+print(f"  Relative Permeability (μr): {mu_r}")
+print(f"  Conductivity (σ): {sigma}")
+print("\n=========================================================================\n")
+
+
+# Analytic patch dimensions (transmission-line model), substrate = patch + 6h
+design = {k: float(v) for k, v in design_patch(f0, eps_r, h, substrate_scale=1, substrate_margin=6).items()}
+W = design["W"]
+eps_eff = design["eps_eff"]
+L = design["L"]
+W_sub = design["W_sub"]
+L_sub = design["L_sub"]
+xf = design["xf"]
+yf = design["yf"]
+truncation = design["truncation"]
 
 # Round the results to 2 decimal places 
 W = round(W, 2)
@@ -225,7 +213,7 @@ airbox.color = [0, 0, 0]
 
 # Assign radiation boundary to all faces except the bottom (lowest Z-center)
 hfss.assign_radiation_boundary_to_faces(
-    [f.id for f in airbox.faces if round(f.center[2], 6) > 0],
+    FaceIndex.load(hfss, airbox.name).select(airbox.name, above=0),
     name="Rad1"
 )
 
@@ -295,8 +283,9 @@ hfss.post.create_report(
 # solution_data.export_data_to_csv(csv_path)
 # print(f"S11 data exported to: {csv_path}")
 
-# Wait for user input before closing HFSS
-input("\n✅ HFSS is open. Press Enter to close it...")
+# Wait for user input before closing HFSS (graphical sessions only)
+if not hfss.non_graphical:
+    input("\n✅ HFSS is open. Press Enter to close it...")
 
 # Save project
 hfss.save_project()
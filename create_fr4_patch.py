@@ -1,439 +1,118 @@
-from ansys.aedt.core import Hfss
 import os
-import math
-import csv
-
-# Launch HFSS using updated PyAEDT syntax
-hfss = Hfss(
+import sys
+
+from checkpoint import Checkpoint
+from lazy_session import LazyHfss
+from material_cache import MaterialSnapshot
+from patch_pipeline import (
+    DEFAULT_PARAMS,
+    SETUP_PROPS,
+    SWEEP,
+    SPHERE,
+    read_material,
+    patch_dimensions,
+    print_substrate,
+    print_dimensions,
+    write_params_txt,
+    build_geometry,
+    assign_excitations,
+    create_analysis,
+    post_process,
+)
+from tracing import Tracer
+
+# python create_fr4_patch.py --dry-run: dimensions and params.txt only, no AEDT
+DRY_RUN = "--dry-run" in sys.argv[1:]
+
+# A rerun resumes from the last completed stage in RUN_DIR; --restart ignores it
+RESTART = "--restart" in sys.argv[1:]
+RUN_DIR = os.path.join(os.getcwd(), "MyHFSS_Project_SinglePatch_run")
+
+# Headless by default; --graphical opens the AEDT window and waits for Enter at the end
+GRAPHICAL = "--graphical" in sys.argv[1:]
+
+# Every AEDT call below goes through the tracer (aedt_trace.json + summary table)
+tracer = Tracer()
+
+# HFSS session, launched only when the geometry stage needs it
+hfss = tracer.wrap(LazyHfss(
     project="MyHFSS_Project_SinglePatch",
     design="FR4PatchDesign",
-    non_graphical=False,
+    non_graphical=not GRAPHICAL,
     new_desktop=True,
     solution_type="Modal"
-)
-
-# Specify the material name (must exist in your material library)
-material_name = "FR4_epoxy"
-mat_obj = hfss.materials.exists_material(material_name)
-
-# Check if material exists
-if mat_obj:
-    material = hfss.materials[material_name]
-    
-    # Extract relevant properties
-    eps_r = material.permittivity.value                  # Dielectric constant
-    tan_d = material.dielectric_loss_tangent.value       # Loss tangent
-    mu_r = material.permeability.value                   # Magnetic permeability
-    sigma = material.conductivity.value                  # Conductivity (for conductors)
-
-    # Assign other important variables
-    f0 = 1.57542e9   # Center frequency in GHz
-    h = 1.6        # meters # Substrate thickness in millimeters
-    Cu_Thickness = 0.035  # Copper thickness in millimeters
-
-    print("\n================ Antenna Substrate and Design Parameters ================\n")
-    print(f"Center Design Frequency: {f0 / 1e9} GHz")
-    print(f"Substrate Material: {material_name}")
-    print(f"  Substrate Thickness (h): {h} mm")
-    print(f"  Copper on Substrate Thickness (h): {Cu_Thickness} mm")
-    print(f"  Relative Permittivity (εr): {eps_r}")
-    print(f"  Loss Tangent (tanδ): {tan_d}")
-    print(f"  Relative Permeability (μr): {mu_r}")
-    print(f"  Conductivity (σ): {sigma}")
-    print("\n=========================================================================\n")
-else:
-    print(f"Material {material_name} not found in the material library.")
-
-
-# Constants
-c = 3e11  # Speed of light in mm/s (converted to mm/s from m/s)
-eps_r = float(material.permittivity.value)                  # Dielectric constant
-
-# Patch Width (W)
-W = (c / (2 * f0)) * (math.sqrt(2 / (eps_r + 1))) 
-
-# Effective dielectric constant (εeff)
-eps_eff = ((eps_r + 1) / 2) + ( ((eps_r - 1) / 2) * ((1 + (12 * h / W)) ** -0.5) )
-
-# Effective Length (Leff)
-Leff = c / (2 * f0 * math.sqrt(eps_eff))
-
-# Length extension due to fringing (ΔL)
-delta_L = (0.412 * h) * (((eps_eff + 0.3) * ((W / h) + 0.264)) / ((eps_eff - 0.258) * ((W / h) + 0.8)))
-
-# Actual Patch Length (L)
-L = (Leff - 2 * delta_L)
-
-W = L = 45
-# W=48
-# L=48  
-# Substrate size (based on 2 times the Patch dimensions)
-W_sub = 2*W
-L_sub = 2*L
-
-# Corner truncation (for RHCP)
-truncation = 6#round(L * (math.sqrt((4 * f0 * h) / (2 * c * math.sqrt(eps_r)))), 0)
-
-# Feed point location (for coax-fed)
-xf = round(W / 2, 3)
-# Estimate y-offset using approximate equation
-yf = round(L / (2 * math.sqrt(eps_eff)), 3)
-
-W = round(W, 3)
-L = round(L, 3)
-W_sub = round(W_sub, 3)
-L_sub = round(L_sub, 3)
-
-W_half = round(W / 2, 3)
-L_half = round(L / 2, 3)
-W_sub_half = round(W_sub / 2, 3)
-L_sub_half = round(L_sub / 2, 3)
-
-xf_from_origin = round(xf - W_half, 3)  
-yf_from_origin = round(yf - L_half, 0) -2.3873
-
-Coax_h = 5
-Coax_R = 1.6
-Coax_pin_R = 0.8
-patch_top = Cu_Thickness + h + Cu_Thickness
-
-lambda_0 = c / f0  # Free-space wavelength in mm
-air_margin = round( lambda_0 / 4 , 0)  # λ/4 padding
-
-# Calculate box origin and size
-rad_x_origin = -W_sub_half - air_margin
-rad_y_origin = -L_sub_half - air_margin
-rad_z_origin = 0  # Touches ground
-
-rad_x_size = W_sub + 2 * air_margin
-rad_y_size = L_sub + 2 * air_margin
-rad_z_size = patch_top + air_margin  # patch_top = h + 2 * Cu_Thickness
-
-# Output
-print("\n================== Computed Patch Antenna Parameters ==================\n")
-print(f"Patch Width (W): {W} mm")
-print(f"Patch Length (L): {L} mm")
-print(f"Substrate Width (W_sub): {W_sub} mm")
-print(f"Substrate Length (L_sub): {L_sub} mm")
-print(f"Feed Point wrt Origin (x, y): ({xf_from_origin} mm, {yf_from_origin} mm)")
-print(f"Corner Truncation Size: {truncation} mm")
-print(f"Effective Dielectric Constant (εeff): {eps_eff:.2f}")
-print(f"Coax Height below Ground: {Coax_h} mm")
-print(f"Radiation Box Margin: {air_margin} mm")
-print("\n=======================================================================\n")
-
-# Create the substrate box
-substrate = hfss.modeler.create_box(
-    [-W_sub_half, -L_sub_half, Cu_Thickness],              # Position
-    [W_sub, L_sub, h],                                # Size (x, y, z)
-    name="Substrate",
-    material=material_name
-)
-substrate.transparency = 0.4
-substrate.color = [143, 175, 175] 
-hfss.modeler.fit_all()
-
-# --- Create cylindrical hole through substrate (for probe feed) ---
-substrate_hole = hfss.modeler.create_cylinder(
-    origin=[xf_from_origin, yf_from_origin, Cu_Thickness],
-    orientation="Z",
-    radius=Coax_pin_R,  # Radius of the hole
-    height=h,  # Same as substrate thickness
-    name="SubstrateHole"
-)
-
-# Subtract the hole from the substrate
-hfss.modeler.subtract("Substrate", "SubstrateHole", keep_originals=False)
-
-
-# Create the ground plane as a box with thickness
-ground = hfss.modeler.create_box(
-    origin=[-W_sub_half, -L_sub_half, 0],   
-    sizes=[W_sub, L_sub, Cu_Thickness],       
-    name="Ground",
-    material="copper"
-)
-ground.color = [0, 255, 128]
-ground.transparency = 0.06
-hfss.modeler.fit_all()
-
-
-# Create a cylinder as the hole
-hole_cylinder = hfss.modeler.create_cylinder(
-    orientation="XY", 
-    origin=[xf_from_origin, yf_from_origin, 0],
-    radius=Coax_R,
-    height=Cu_Thickness,
-    name="Hole3D"
-)
-hole_cylinder.color = [255, 128, 64]
-hfss.modeler.fit_all()
-
-# Subtract the 3D hole from the 3D ground
-hfss.modeler.subtract("Ground", "Hole3D", keep_originals=False)
-
-# Create the patch rectangle with thickness
-patch = hfss.modeler.create_box(
-    origin=[-W_half, -L_half, Cu_Thickness + h],
-    sizes=[W, L, Cu_Thickness],       
-    name="Patch",
-    material="copper"
-)
-patch.color = [255, 0, 0]
-patch.transparency = 0.11
-hfss.modeler.fit_all()
-
-overshoot_TL = 0.0 # small extra margin
-
-# --- Top-Left Corner (XY) ---
-tl_base = [-W_half, L_half + overshoot_TL, patch_top]  # corner point extended outside
-tl_pt2  = [-W_half + truncation, L_half, patch_top]  # move right
-tl_pt3  = [-W_half, L_half - truncation, patch_top]  # move down
-
-trunc_tl = hfss.modeler.create_polyline(
-    [tl_base, tl_pt2, tl_pt3, tl_base],
-    cover_surface=True,
-    name="TruncTopLeft",
-    material="copper"
-)
-hfss.modeler.thicken_sheet("TruncTopLeft", Cu_Thickness)
-
-# --- Bottom-Right Corner (XY) ---
-overshoot_BR = 0.0 # small extra margin
-br_base = [W_half + overshoot_BR, -L_half, patch_top]  # corner point
-br_pt2 = [W_half - truncation, -L_half, patch_top]  # left
-br_pt3 = [W_half, -L_half + truncation, patch_top]  # up
-
-trunc_br = hfss.modeler.create_polyline(
-    [br_base, br_pt2, br_pt3, br_base],
-    cover_surface=True,
-    name="TruncBottomRight",
-    material="copper"
-)
-hfss.modeler.thicken_sheet("TruncBottomRight", Cu_Thickness)
-
-# --- Subtract triangular cuts from the patch ---
-hfss.modeler.subtract("Patch", ["TruncTopLeft", "TruncBottomRight"], keep_originals=False)
-hfss.modeler.fit_all()
-
-# Create the coaxial cable
-coax = hfss.modeler.create_cylinder(
-    origin=[xf_from_origin, yf_from_origin, 0],
-    orientation="XY",
-    height=-Coax_h,
-    radius=Coax_R,
-    name="Coax",
-    material="glass_PTFEreinf"
-)
-coax.color = [128, 128, 192]
-coax.transparency = 0.5
-
-# create the coaxial cable pin
-coax_pin = hfss.modeler.create_cylinder(
-    origin=[xf_from_origin, yf_from_origin, 0],
-    orientation="XY",
-    height=-Coax_h,
-    radius=Coax_pin_R,
-    name="Coax_Pin",
-    material="copper"
-)
-coax_pin.color = [255, 0, 128]
-coax_pin.transparency = 0
-
-# create the pin going into the substrate
-probe = hfss.modeler.create_cylinder(
-    origin=[xf_from_origin, yf_from_origin, 0],
-    orientation="XY",
-    height= Cu_Thickness + h,
-    radius=Coax_pin_R,
-    name="Probe",
-    material="copper"
-)
-probe.color = [255, 0, 128]
-probe.transparency = 0.5
-
-# create the radiation box
-airbox = hfss.modeler.create_box(
-    [rad_x_origin, rad_y_origin, rad_z_origin],
-    [rad_x_size, rad_y_size, rad_z_size],           
-    name="AirBox",
-    material="air"
-)
-airbox.transparency = 0.95
-airbox.color = [0, 0, 0]
-hfss.modeler.fit_all()
-
-# Assign radiation boundary to all faces except the bottom (lowest Z-center)
-hfss.assign_radiation_boundary_to_faces(
-    [f.id for f in airbox.faces if round(f.center[2], 6) > 0],
-    name="Rad1"
-)
-
-# Create port
-port = hfss.modeler.create_circle(
-    orientation="XY",
-    origin=[xf_from_origin, yf_from_origin, -Coax_h],
-    radius=1.6,
-    name="Port"
-)
-port.color = [255, 128, 255]
-
-# Assign wave port with a simple integration line
-hfss.wave_port(
-    port.name,
-    reference=coax.name,
-    name="1",
-    renormalize=False
-)
-
-# Create setup
-setup = hfss.create_setup("Setup1")
-setup.props["Frequency"] = "1.57542GHz"
-setup.props["MaximumPasses"] = 20
-setup.props["DeltaS"] = 0.02
-setup.update()
-
-# Now add the sweep
-sweep = setup.add_sweep(
-    name="Sweep",
-    sweep_type="fast",
-    RangeType="LinearCount",
-    RangeStart="1.54GHz",
-    RangeEnd="1.58GHz",
-    RangeCount= 2001,
-    SaveFields=True,
-    SaveRadFields=True
-)
-sweep.update()
-
-
-# Add infinite sphere with specified angular ranges
-sphere = hfss.insert_infinite_sphere(
-    definition="Theta-Phi",
-    x_start=-180,      # Theta start
-    x_stop=180,        # Theta stop
-    x_step=10,         # Theta step
-    y_start=0,         # Phi start
-    y_stop=360,        # Phi stop
-    y_step=10,         # Phi step
-    units="deg",
-    name="InfiniteSphere1"
-)
+))
+
+# Design inputs (material must exist in your material library)
+params = dict(DEFAULT_PARAMS)
+
+# Local material snapshot first, live library only on a miss
+with tracer.stage("material"):
+    try:
+        material = read_material(None if DRY_RUN else hfss, params["material_name"], snapshot=MaterialSnapshot())
+    except ValueError as e:
+        print(f"❌ {e}")
+        hfss.release_desktop(close_projects=True, close_desktop=True)
+        raise SystemExit(1)
+print_substrate(params, material)
+
+dims = patch_dimensions(params, material["eps_r"])
+print_dimensions(dims)
+
+if DRY_RUN:
+    write_params_txt(os.path.join(os.getcwd(), "params.txt"), params, material, dims)
+    raise SystemExit(0)
+
+# Checkpoints: saved project after build, solved project after analyze,
+# extracted arrays and results after post
+ckpt = Checkpoint(RUN_DIR, "MyHFSS_Project_SinglePatch", restart=RESTART,
+                  params=params, material=material, setup=SETUP_PROPS, sweep=SWEEP, sphere=SPHERE)
+if ckpt.done("post"):
+    print(f"♻️ Already post-processed in {RUN_DIR}: {ckpt.results}")
+    raise SystemExit(0)
+resumed = ckpt.resume(hfss)
+
+# Launch HFSS using updated PyAEDT syntax (reopens the checkpointed project on resume)
+with tracer.stage("startup"):
+    hfss.start()
+
+if not resumed:
+    # Substrate, ground, truncated patch, coax feed, radiation box and port sheet
+    with tracer.stage("geometry"):
+        build_geometry(hfss, params, dims)
+
+    # Radiation boundary and wave port
+    with tracer.stage("excitations"):
+        assign_excitations(hfss)
+
+    # Setup, sweep and infinite sphere
+    with tracer.stage("setup"):
+        create_analysis(hfss, params["f0"])
+
+    with tracer.stage("checkpoint"):
+        hfss.save_project(file_name=ckpt.project_file)
+        ckpt.mark("build", project=ckpt.project_file)
 
 # Analyze the design
-hfss.analyze()
-
-# Create S11 report inside Ansys GUI
-hfss.post.create_report(
-    expressions=["dB(S(1,1))"],
-    primary_sweep_variable="Freq",
-    variations={"Freq": ["All"]},
-    report_category="S Parameter",
-    context="Setup1",
-    plot_type="Rectangular Plot",
-    # name="S11 Report"
-)
-
-# Get solution data from the report
-solution_data = hfss.post.get_solution_data(
-    expressions=["dB(S(1,1))"],
-    primary_sweep_variable="Freq",
-    context="Setup1"
-)
-
-# Define path to export CSV
-csv_path = os.path.join(hfss.working_directory, "S11.csv")
-
-# Export to CSV
-solution_data.export_data_to_csv(csv_path)
-print(f"✅ CSV saved to: {csv_path}")
-
-hfss.post.create_report(
-    expressions=["dB(AxialRatioValue)"],
-    primary_sweep_variable="Theta",
-    variations={
-        "Freq": ["1.57542GHz"],
-        "Phi": ["0deg"],
-        "Theta": [f"{i}deg" for i in range(-180, 181, 10)]
-    },
-    context="InfiniteSphere1",
-    report_category="Far Fields",
-    plot_type="Rectangular Plot"
-    # name="AxialRatio_Phi0deg"
-)
-
-ar_data = hfss.post.get_solution_data(
-    expressions=["db(AxialRatioValue)"],              
-    primary_sweep_variable="Theta",
-    report_category="Far Fields",
-    context="InfiniteSphere1",                    
-    variations={
-        "Freq": ["1.57542GHz"],
-        "Phi": ["0deg"]
-    }
-)
-
-# Export to CSV
-ar_csv_path = os.path.join(hfss.working_directory, "AxialRatio_vs_Theta.csv")
-ar_data.export_data_to_csv(ar_csv_path)
-print(f"✅ CSV saved to: {ar_csv_path}")
-
-try:
-    with open(ar_csv_path, mode="r", encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=";")
-        for row in reader:
-            try:
-                theta = float(row["Theta [deg]"])
-                phi = float(row["Phi [deg]"])
-                freq = float(row["Freq [GHz]"])
-
-                if abs(theta) < 1e-3 and abs(phi) < 1e-3 and abs(freq - 1.57542) < 1e-5:
-                    ar_val = float(row["db(AxialRatioValue)"])
-                    print(f"📌 Axial Ratio at θ = 0°, ϕ = 0°: {ar_val:.2f} dB")
-                    break
-            except ValueError:
-                continue  # Skip malformed lines
-        else:
-            print("❌ θ = 0°, ϕ = 0°, f = 1.57542 GHz not found in CSV.")
-
-except Exception as e:
-    print(f"❌ Failed to read CSV: {e}")
-
-
-# Define path for TXT file in same directory
-txt_path = os.path.join(hfss.working_directory, "params.txt")
-
-# Save the TXT file
-try:
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(f"Center Frequency (GHz): {f0 / 1e9:.3f}\n")
-        f.write(f"Material: {material_name}\n")
-        f.write(f"Substrate thickness (h): {h} mm\n")
-        f.write(f"Copper on Substrate thickness (h): {Cu_Thickness} mm\n")
-        f.write(f"Relative Permittivity (εr): {eps_r}\n")
-        f.write(f"Effective Dielectric Constant (εeff): {eps_eff:.3f}\n")
-        f.write(f"Loss Tangent: {tan_d}\n")
-        f.write(f"Relative Permeability (μr): {mu_r}\n")
-        f.write(f"Conductivity (σ): {sigma}\n")
-        f.write(f"Patch Width (W): {W} mm\n")
-        f.write(f"Patch Length (L): {L} mm\n")
-        f.write(f"Substrate Width (W_sub): {W_sub} mm\n")
-        f.write(f"Substrate Length (L_sub): {L_sub} mm\n")
-        f.write(f"Feed Point wrt Origin (x, y): ({xf_from_origin}, {yf_from_origin}) mm\n")
-        f.write(f"Coax Height below Ground: {Coax_h} mm\n")
-        f.write(f"Coax Radius: {Coax_R} mm\n")
-        f.write(f"Coax Pin Radius: {Coax_pin_R} mm\n")
-        f.write(f"Radiation Box Margin: {air_margin} mm\n")
-        f.write(f"Corner Truncation Size: {truncation} mm\n")
-
-    print(f"✅ TXT saved to: {txt_path}")
-except Exception as e:
-    print(f"❌ Failed to write TXT file: {e}")
-
-
-
-# Wait for user input before closing HFSS
-input("\n✅ HFSS is open. Press Enter to close it...")
+if not ckpt.done("solve"):
+    with tracer.stage("analyze"):
+        hfss.analyze()
+    with tracer.stage("checkpoint"):
+        hfss.save_project()
+        ckpt.mark("solve")
+
+# S11 and axial-ratio reports, CSV exports and params.txt
+with tracer.stage("post_process"):
+    result = post_process(hfss, params, material, dims, arrays_path=ckpt.arrays_path)
+    ckpt.mark("post", results=result)
+
+# Call profile of this run
+tracer.write_chrome_trace(os.path.join(hfss.working_directory, "aedt_trace.json"))
+tracer.print_summary()
+
+# Wait for user input before closing HFSS (graphical sessions only)
+if not hfss.non_graphical:
+    input("\n✅ HFSS is open. Press Enter to close it...")
 
 # Save project
 hfss.save_project()
@@ -441,4 +120,3 @@ hfss.save_project()
 # Close and release AEDT
 hfss.release_desktop(close_projects=True, close_desktop=True)
 print("✅ HFSS closed.")
-
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+# Bump when the pipeline changes in a way that invalidates stored solutions
+CACHE_VERSION = 1
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+# Content-addressed store of solved designs.
+#
+# The key is a SHA-256 of every input that affects the solution (material
+# properties, dimensions, setup props, sweep and infinite sphere), so
+# identical inputs map to the same entry regardless of dict order:
+#
+#   cache = DesignCache(max_bytes=50e9)
+#   key = cache.key(params=params, material=material, setup=SETUP_PROPS, sweep=SWEEP, sphere=SPHERE)
+#   entry = cache.get(key)        # {"results": {...}, "project": "...aedt" or None}
+#
+# Each entry is a folder holding entry.json, the stored results, the exported
+# output files (CSVs, params.txt) restored on a hit, and optionally a copy of
+# the solved project (.aedt + .aedtresults; the .aedtresults only within
+# max_results_bytes, the FieldPolicy budget in run_design). Entries are evicted
+# least-recently-used first once the cache exceeds max_bytes on disk.
+class DesignCache:
+    def __init__(self, cache_dir=None, max_bytes=20e9):
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".patch_design_cache")
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, **inputs):
+        payload = json.dumps({"version": CACHE_VERSION, **inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _read_entry(self, key):
+        try:
+            with open(os.path.join(self._entry_dir(key), "entry.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, directory, entry):
+        tmp = os.path.join(directory, f"entry.json.{uuid.uuid4().hex}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2, default=str)
+        os.replace(tmp, os.path.join(directory, "entry.json"))
+
+    def get(self, key):
+        entry = self._read_entry(key)
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        self._write_entry(self._entry_dir(key), entry)
+        if entry.get("project"):
+            entry["project"] = os.path.join(self._entry_dir(key), entry["project"])
+        return entry
+
+    # Store results, the output files and the solved project when project_file is given;
+    # solutions larger than max_results_bytes are left out of the stored project
+    def put(self, key, results, project_file=None, outputs=None, max_results_bytes=None):
+        staging = os.path.join(self.cache_dir, f".staging_{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        entry = {"key": key, "results": results, "project": None, "outputs": [],
+                 "created": time.time(), "last_used": time.time()}
+        try:
+            for path in outputs or []:
+                if os.path.isfile(path):
+                    os.makedirs(os.path.join(staging, "outputs"), exist_ok=True)
+                    shutil.copy2(path, os.path.join(staging, "outputs"))
+                    entry["outputs"].append(os.path.basename(path))
+            if project_file:
+                shutil.copy2(project_file, staging)
+                results_dir = os.path.splitext(project_file)[0] + ".aedtresults"
+                size = _dir_size(results_dir)
+                if max_results_bytes is not None and size > max_results_bytes:
+                    print(f"🧹 {os.path.basename(results_dir)} ({size / 1e9:.2f} GB) exceeds the "
+                          f"{max_results_bytes / 1e9:g} GB budget: caching the project without solutions")
+                elif os.path.isdir(results_dir):
+                    shutil.copytree(results_dir, os.path.join(staging, os.path.basename(results_dir)))
+                entry["project"] = os.path.basename(project_file)
+            self._write_entry(staging, entry)
+            entry["size"] = _dir_size(staging)
+            self._write_entry(staging, entry)
+
+            target = self._entry_dir(key)
+            if os.path.isdir(target):
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.evict()
+        return entry
+
+    # Copy the output files of a hit back into directory
+    def restore_outputs(self, entry, directory):
+        os.makedirs(directory, exist_ok=True)
+        restored = []
+        for name in entry.get("outputs", []):
+            source = os.path.join(self._entry_dir(entry["key"]), "outputs", name)
+            if os.path.isfile(source):
+                restored.append(shutil.copy2(source, os.path.join(directory, name)))
+        return restored
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith("."):
+                continue
+            entry = self._read_entry(name)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    # Drop least-recently-used entries until the cache fits its disk budget
+    def evict(self):
+        entries = sorted(self.entries(), key=lambda e: e.get("last_used", 0))
+        total = sum(e.get("size", 0) for e in entries)
+        removed = 0
+        while entries and total > self.max_bytes:
+            entry = entries.pop(0)
+            shutil.rmtree(self._entry_dir(entry["key"]), ignore_errors=True)
+            total -= entry.get("size", 0)
+            removed += 1
+        if removed:
+            print(f"🧹 Evicted {removed} cached design(s), cache now {total / 1e9:.2f} GB")
+        return removed
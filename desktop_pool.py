@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+import queue
+import threading
+import uuid
+
+
+# One warm non-graphical AEDT desktop, reached over its own gRPC port
+class PooledDesktop:
+    def __init__(self, port, version=None, max_uses=20):
+        self.port = port
+        self.version = version
+        self.max_uses = max_uses
+        self.uses = 0
+        self.desktop = None
+        self.start()
+
+    def start(self):
+        from ansys.aedt.core import Desktop
+        self.desktop = Desktop(
+            version=self.version,
+            non_graphical=True,
+            new_desktop=True,
+            close_on_exit=False,
+            port=self.port
+        )
+        self.uses = 0
+
+    def close(self):
+        if self.desktop is None:
+            return
+        try:
+            self.desktop.release_desktop(close_projects=True, close_on_exit=True)
+        except Exception as e:
+            print(f"❌ Failed to close AEDT on port {self.port}: {e}")
+        self.desktop = None
+
+    def recycle(self):
+        self.close()
+        self.start()
+
+    # A desktop is healthy if it still answers a cheap round trip
+    def healthy(self):
+        if self.desktop is None:
+            return False
+        try:
+            return self.desktop.odesktop.GetVersion() is not None
+        except Exception:
+            return False
+
+    def exhausted(self):
+        return self.uses >= self.max_uses
+
+
+# Keeps N non-graphical desktops alive and leases one per design.
+#
+#   with DesktopPool(size=4) as pool:
+#       with pool.lease(design="FR4PatchDesign") as hfss:
+#           ...build / analyze / post-process...
+#
+# Each lease opens a fresh project + design in a warm desktop and closes it on
+# release, so a design never pays the AEDT cold start. Desktops that fail the
+# health check, or have served max_uses leases, are restarted before reuse.
+class DesktopPool:
+    def __init__(self, size=2, version=None, max_uses=20, base_port=50100, timeout=None):
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        for i in range(size):
+            pooled = PooledDesktop(base_port + i, version=version, max_uses=max_uses)
+            self._all.append(pooled)
+            self._idle.put(pooled)
+        print(f"✅ Desktop pool ready: {size} AEDT session(s) on ports {base_port}-{base_port + size - 1}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def acquire(self):
+        try:
+            pooled = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No AEDT desktop became free within {self.timeout} s")
+        if not pooled.healthy() or pooled.exhausted():
+            print(f"♻️ Recycling AEDT on port {pooled.port} (uses={pooled.uses})")
+            try:
+                pooled.recycle()
+            except Exception:
+                # Back in the queue: the health check retries the restart on the next acquire
+                self._idle.put(pooled)
+                raise
+        return pooled
+
+    # The desktop always goes back to the pool, even when the restart fails
+    # (it is then unhealthy and restarted again by the next acquire)
+    def release(self, pooled):
+        pooled.uses += 1
+        try:
+            if pooled.exhausted():
+                print(f"♻️ Recycling AEDT on port {pooled.port} after {pooled.uses} uses")
+                pooled.recycle()
+        except Exception as e:
+            print(f"❌ Failed to restart AEDT on port {pooled.port}: {e}")
+        finally:
+            self._idle.put(pooled)
+
+    # Lease a desktop and open a fresh project/design in it. The project is
+    # closed (and saved when save=True) before the desktop goes back to the pool.
+    @contextmanager
+    def lease(self, project=None, design="FR4PatchDesign", solution_type="Modal", save=False):
+        from ansys.aedt.core import Hfss
+        pooled = self.acquire()
+        hfss = None
+        try:
+            hfss = Hfss(
+                project=project or f"Pool_{uuid.uuid4().hex[:8]}",
+                design=design,
+                solution_type=solution_type,
+                non_graphical=True,
+                new_desktop=False,
+                version=pooled.version,
+                port=pooled.port
+            )
+            yield hfss
+        finally:
+            if hfss is not None:
+                try:
+                    if save:
+                        hfss.save_project()
+                    hfss.close_project(save=False)
+                except Exception as e:
+                    print(f"❌ Failed to close project on port {pooled.port}: {e}")
+                    pooled.close()  # restarted by the next acquire
+            self.release(pooled)
+
+    def close(self):
+        with self._lock:
+            for pooled in self._all:
+                pooled.close()
+            self._all = []
+        print("✅ Desktop pool closed.")
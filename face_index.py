@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Face IDs, centers, normals and areas of a model in one AEDT round trip.
+#
+#   index = FaceIndex.load(hfss, ["AirBox"])
+#   index.select("AirBox", above=0)                     # every face with center z > 0
+#   index.select(normal=[0, 0, 1], above=0)             # faces facing +z above z = 0
+#   index.nearest([0, 0, 1.6], objects="Patch")         # face closest to a point
+#
+# The query is a small IronPython script run inside the desktop with
+# oDesktop.RunScript, which walks GetFaceIDs / GetFaceCenter / GetFaceArea /
+# GetVertexPosition locally and writes everything to one JSON file. Normals
+# of planar faces are computed here from the face vertices and point away
+# from the object centroid (sheets: along the positive axis); curved faces
+# and faces without vertices, like a circle sheet, get NaN. When RunScript
+# is unavailable (remote desktop, restricted session) the index falls back
+# to the per-face properties.
+
+FACE_SCRIPT = """\
+import json
+oProject = oDesktop.SetActiveProject({project!r})
+oDesign = oProject.SetActiveDesign({design!r})
+oEditor = oDesign.SetActiveEditor("3D Modeler")
+names = {objects!r}
+if names is None:
+    names = list(oEditor.GetObjectsInGroup("Solids")) + list(oEditor.GetObjectsInGroup("Sheets"))
+faces = []
+for name in names:
+    for fid in oEditor.GetFaceIDs(name):
+        fid = int(fid)
+        try:
+            center = [float(v) for v in oEditor.GetFaceCenter(fid)]
+        except Exception:
+            center = None
+        vertices = [[float(v) for v in oEditor.GetVertexPosition(vid)] for vid in oEditor.GetVertexIDsFromFace(fid)]
+        faces.append({{"id": fid, "object": name, "center": center, "area": float(oEditor.GetFaceArea(fid)),
+                      "vertices": vertices}})
+f = open({output!r}, "w")
+json.dump(faces, f)
+f.close()
+"""
+
+
+def _as_list(names):
+    return [names] if isinstance(names, str) else names
+
+
+# Unit normal of a planar face from its vertices, oriented away from `inside`
+def _plane_normal(vertices, inside):
+    v = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    for i in range(2, len(v)):
+        n = np.cross(v[1] - v[0], v[i] - v[0])
+        norm = np.linalg.norm(n)
+        if norm > 1e-9 * max(1.0, np.abs(v).max()) ** 2:
+            n = n / norm
+            # Every vertex must lie in the plane, otherwise the face is curved
+            if np.abs((v - v[0]) @ n).max() > 1e-6 * max(1.0, np.abs(v).max()):
+                break
+            side = np.dot(v.mean(axis=0) - inside, n)
+            # A sheet has its centroid in the plane: point along the dominant positive axis
+            if abs(side) < 1e-9 * max(1.0, np.abs(v).max()):
+                side = n[np.argmax(np.abs(n))]
+            return -n if side < 0 else n
+    return np.full(3, np.nan)
+
+
+class FaceIndex:
+    def __init__(self, faces):
+        self.ids = np.array([f["id"] for f in faces], dtype=int)
+        self.objects = np.array([f["object"] for f in faces], dtype=object)
+        self.centers = np.array([f["center"] if f["center"] is not None else [np.nan] * 3 for f in faces],
+                                dtype=float).reshape(-1, 3)
+        self.normals = np.array([f["normal"] for f in faces], dtype=float).reshape(-1, 3)
+        self.areas = np.array([f["area"] for f in faces], dtype=float)
+        self.rpc_count = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, hfss, objects=None, bulk=True):
+        objects = _as_list(objects)
+        if bulk:
+            try:
+                index = cls(cls._with_normals(cls._bulk_query(hfss, objects)))
+                index.rpc_count = 1
+                return index
+            except Exception as e:
+                print(f"♻️ Bulk face query unavailable ({e}), reading faces one by one")
+        return cls._per_face(hfss, objects)
+
+    @staticmethod
+    def _bulk_query(hfss, objects):
+        fd, script = tempfile.mkstemp(prefix="face_index_", suffix=".py")
+        output = script[:-3] + ".json"
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(FACE_SCRIPT.format(project=hfss.project_name, design=hfss.design_name,
+                                           objects=objects, output=output))
+            hfss.odesktop.RunScript(script)
+            with open(output, encoding="utf-8") as f:
+                return json.load(f)
+        finally:
+            for path in (script, output):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @staticmethod
+    def _with_normals(faces):
+        vertices = {}
+        for f in faces:
+            vertices.setdefault(f["object"], []).extend(f["vertices"])
+        centroids = {name: np.mean(v, axis=0) if v else np.zeros(3) for name, v in vertices.items()}
+        for f in faces:
+            f["normal"] = (_plane_normal(f["vertices"], centroids[f["object"]])
+                           if len(f["vertices"]) >= 3 else np.full(3, np.nan))
+        return faces
+
+    # Fallback: object.faces, then center / area / normal of every face
+    @classmethod
+    def _per_face(cls, hfss, objects):
+        calls = 0
+        if objects is None:
+            objects = list(hfss.modeler.object_names)
+        faces = []
+        for name in objects:
+            obj_faces = hfss.modeler[name].faces
+            calls += 2
+            for face in obj_faces:
+                center, normal = face.center, face.normal
+                faces.append({"id": face.id, "object": name, "center": center, "area": face.area,
+                              "normal": normal if normal is not None else [np.nan] * 3})
+                calls += 3
+        index = cls(faces)
+        index.rpc_count = calls
+        return index
+
+    # Boolean mask of the faces matching every given condition
+    def mask(self, objects=None, normal=None, above=None, below=None, axis=2, where=None, tol=1e-6):
+        keep = np.ones(len(self), dtype=bool)
+        if objects is not None:
+            keep &= np.isin(self.objects, _as_list(objects))
+        if normal is not None:
+            n = np.asarray(normal, dtype=float)
+            keep &= np.nan_to_num(self.normals @ (n / np.linalg.norm(n)), nan=-1.0) > 1 - tol
+        if above is not None:
+            keep &= np.nan_to_num(self.centers[:, axis], nan=-np.inf) > above + tol
+        if below is not None:
+            keep &= np.nan_to_num(self.centers[:, axis], nan=np.inf) < below - tol
+        if where is not None:
+            keep &= np.asarray(where(self), dtype=bool)
+        return keep
+
+    # Face IDs matching the conditions of mask(), in index order
+    def select(self, objects=None, normal=None, above=None, below=None, axis=2, where=None, tol=1e-6):
+        return [int(i) for i in self.ids[self.mask(objects, normal, above, below, axis, where, tol)]]
+
+    # ID of the face whose center is closest to point (optionally among a subset)
+    def nearest(self, point, objects=None, normal=None, tol=1e-6):
+        keep = self.mask(objects, normal, tol=tol) & ~np.isnan(self.centers).any(axis=1)
+        if not keep.any():
+            raise ValueError("No face matches the selection")
+        distances = np.linalg.norm(self.centers[keep] - np.asarray(point, dtype=float), axis=1)
+        return int(self.ids[keep][np.argmin(distances)])
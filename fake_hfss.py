@@ -0,0 +1,761 @@
+import math
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+# Local stand-in for ansys.aedt.core.Hfss, for benchmarks on machines without
+# AEDT. It implements the modeler, materials, boundary, setup, sweep and post
+# calls used by the scripts and patch_pipeline, counts every round trip and
+# can sleep `latency` seconds per call to model the gRPC/COM cost.
+#
+#   hfss = FakeHfss(latency=0.002)
+#   run_design(hfss)
+#   hfss.rpc_calls          # Counter of AEDT calls by name
+#
+# Solution data is synthetic but shaped like the real exports: an S11 dip at
+# RESONANCE and a right-hand circularly polarized far field, so post-processing
+# runs on realistic array sizes.
+
+RESONANCE = 1.5754e9    # Hz
+BANDWIDTH = 8e6         # Hz, half width of the synthetic S11 dip
+
+MATERIALS = {
+    "FR4_epoxy": {"permittivity": 4.4, "dielectric_loss_tangent": 0.02, "permeability": 1.0, "conductivity": 0.0},
+    "Rogers RO4003 (tm)": {"permittivity": 3.55, "dielectric_loss_tangent": 0.0027, "permeability": 1.0,
+                           "conductivity": 0.0},
+    "glass_PTFEreinf": {"permittivity": 2.55, "dielectric_loss_tangent": 0.00022, "permeability": 1.0,
+                        "conductivity": 0.0},
+    "air": {"permittivity": 1.0006, "dielectric_loss_tangent": 0.0, "permeability": 1.0000004, "conductivity": 0.0},
+    "vacuum": {"permittivity": 1.0, "dielectric_loss_tangent": 0.0, "permeability": 1.0, "conductivity": 0.0},
+    "copper": {"permittivity": 1.0, "dielectric_loss_tangent": 0.0, "permeability": 0.999991, "conductivity": 58000000},
+    "pec": {"permittivity": 1.0, "dielectric_loss_tangent": 0.0, "permeability": 1.0, "conductivity": 1e30},
+}
+
+_UNITS = {"mm": 1.0, "cm": 10.0, "m": 1000.0, "um": 1e-3, "mil": 0.0254, "in": 25.4, "meter": 1000.0}
+
+_FREQ_UNITS = {"Hz": 1.0, "kHz": 1e3, "MHz": 1e6, "GHz": 1e9}
+
+
+def parse_freq(text):
+    m = re.fullmatch(r"\s*([-+0-9.eE]+)\s*([kMG]?Hz)?\s*", str(text))
+    if not m:
+        raise ValueError(f"Bad frequency {text!r}")
+    return float(m.group(1)) * _FREQ_UNITS[m.group(2) or "Hz"]
+
+
+def _pairs(block):
+    return {block[i][:-2]: block[i + 1] for i in range(1, len(block) - 1, 2)
+            if isinstance(block[i], str) and block[i].endswith(":=")}
+
+
+# Design variables resolved on demand, so derived ones ("2*W") evaluate too
+class _Variables(dict):
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+    def __missing__(self, name):
+        return self.app.evaluate(self.app.variables[name])
+
+
+class _Value:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeMaterial:
+    def __init__(self, name, props):
+        self.name = name
+        for key, value in props.items():
+            setattr(self, key, _Value(value))
+
+
+class FakeMaterials:
+    def __init__(self, app, library):
+        self._app = app
+        self.material_keys = {k.lower(): FakeMaterial(k, v) for k, v in library.items()}
+
+    def exists_material(self, name):
+        self._app._rpc("materials.exists_material")
+        return self.material_keys.get(name.lower(), False)
+
+    def __getitem__(self, name):
+        self._app._rpc("materials.__getitem__")
+        return self.material_keys[name.lower()]
+
+
+class FakeFace:
+    def __init__(self, app, face_id, center, area, normal, vertices):
+        self._app = app
+        self.id = face_id
+        self._center = center
+        self._area = area
+        self._normal = normal
+        self.vertex_ids = []
+        for v in vertices:
+            self.vertex_ids.append(app._next_id())
+            app.vertices[self.vertex_ids[-1]] = v
+        app.faces[face_id] = self
+
+    @property
+    def center(self):
+        self._app._rpc("face.center")
+        return list(self._center)
+
+    @property
+    def area(self):
+        self._app._rpc("face.area")
+        return self._area
+
+    @property
+    def normal(self):
+        self._app._rpc("face.normal")
+        return list(self._normal)
+
+
+class FakeObject3d:
+    def __init__(self, app, name, bbox, material=None):
+        self._app = app
+        self.name = name
+        self.material_name = material
+        self.bounding_box = bbox
+        self._color = None
+        self._transparency = None
+        self._faces = None
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._app._rpc("object.color")
+        self._color = value
+
+    @property
+    def transparency(self):
+        return self._transparency
+
+    @transparency.setter
+    def transparency(self, value):
+        self._app._rpc("object.transparency")
+        self._transparency = value
+
+    @property
+    def faces(self):
+        self._app._rpc("object.faces")
+        return self.face_list()
+
+    # Faces of the bounding box (a sheet has only its top face), no round trip
+    def face_list(self):
+        if self._faces is None:
+            x0, y0, z0, x1, y1, z1 = self.bounding_box
+            xc, yc, zc = (x0 + x1) / 2, (y0 + y1) / 2, (z0 + z1) / 2
+            dx, dy, dz = x1 - x0, y1 - y0, z1 - z0
+            specs = [
+                ([xc, yc, z0], dx * dy, [0, 0, -1], [[x, y, z0] for x in (x0, x1) for y in (y0, y1)]),
+                ([xc, yc, z1], dx * dy, [0, 0, 1], [[x, y, z1] for x in (x0, x1) for y in (y0, y1)]),
+                ([xc, y0, zc], dx * dz, [0, -1, 0], [[x, y0, z] for x in (x0, x1) for z in (z0, z1)]),
+                ([xc, y1, zc], dx * dz, [0, 1, 0], [[x, y1, z] for x in (x0, x1) for z in (z0, z1)]),
+                ([x0, yc, zc], dy * dz, [-1, 0, 0], [[x0, y, z] for y in (y0, y1) for z in (z0, z1)]),
+                ([x1, yc, zc], dy * dz, [1, 0, 0], [[x1, y, z] for y in (y0, y1) for z in (z0, z1)]),
+            ]
+            if dz == 0:
+                specs = specs[1:2]
+            self._faces = [FakeFace(self._app, self._app._next_id(), *s) for s in specs]
+        return self._faces
+
+
+class FakeEditor:
+    def __init__(self, app):
+        self._app = app
+
+    def _create(self, method, params, attributes, bbox):
+        self._app._rpc(f"oeditor.{method}")
+        attrs = _pairs(attributes)
+        material = attrs.get("MaterialValue", "").strip('"') or None
+        return self._app.modeler._add(attrs["Name"], bbox, material).name
+
+    def CreateBox(self, params, attributes):
+        p = _pairs(params)
+        x, y, z, dx, dy, dz = (self._app.evaluate(p[k]) for k in
+                               ("XPosition", "YPosition", "ZPosition", "XSize", "YSize", "ZSize"))
+        return self._create("CreateBox", params, attributes,
+                            [min(x, x + dx), min(y, y + dy), min(z, z + dz), max(x, x + dx), max(y, y + dy), max(z, z + dz)])
+
+    def CreateCylinder(self, params, attributes):
+        p = _pairs(params)
+        x, y, z, r, h = (self._app.evaluate(p[k]) for k in ("XCenter", "YCenter", "ZCenter", "Radius", "Height"))
+        return self._create("CreateCylinder", params, attributes, [x - r, y - r, min(z, z + h), x + r, y + r, max(z, z + h)])
+
+    def CreateCircle(self, params, attributes):
+        p = _pairs(params)
+        x, y, z, r = (self._app.evaluate(p[k]) for k in ("XCenter", "YCenter", "ZCenter", "Radius"))
+        return self._create("CreateCircle", params, attributes, [x - r, y - r, z, x + r, y + r, z])
+
+    def CreateRectangle(self, params, attributes):
+        p = _pairs(params)
+        x, y, z, w, h = (self._app.evaluate(p[k]) for k in ("XStart", "YStart", "ZStart", "Width", "Height"))
+        return self._create("CreateRectangle", params, attributes, [x, y, z, x + w, y + h, z])
+
+    def CreatePolyline(self, params, attributes):
+        pl = next(p for p in params if isinstance(p, list) and p and p[0] == "NAME:PolylinePoints")
+        xyz = np.array([[self._app.evaluate(_pairs(q)[k]) for k in ("X", "Y", "Z")] for q in pl[1:]])
+        return self._create("CreatePolyline", params, attributes, [*xyz.min(axis=0), *xyz.max(axis=0)])
+
+    # Clones are named <source>_<n> with the next free n, translated k times the vector
+    def DuplicateAlongLine(self, selections, params, *options):
+        self._app._rpc("oeditor.DuplicateAlongLine")
+        p = _pairs(params)
+        dx, dy, dz = (self._app.evaluate(p[k]) for k in ("XComponent", "YComponent", "ZComponent"))
+        modeler = self._app.modeler
+        for name in _pairs(selections)["Selections"].split(","):
+            source = modeler.objects[name]
+            x0, y0, z0, x1, y1, z1 = source.bounding_box
+            n = 0
+            for k in range(1, int(p["NumClones"])):
+                n += 1
+                while f"{name}_{n}" in modeler.objects:
+                    n += 1
+                modeler._add(f"{name}_{n}", [x0 + k * dx, y0 + k * dy, z0 + k * dz, x1 + k * dx, y1 + k * dy,
+                                             z1 + k * dz], source.material_name)
+        return True
+
+    # Face and vertex queries, one round trip each (none inside RunScript)
+    def GetObjectsInGroup(self, group):
+        self._app._rpc("oeditor.GetObjectsInGroup")
+        sheets = group == "Sheets"
+        return [n for n, o in self._app.modeler.objects.items() if (o.bounding_box[5] == o.bounding_box[2]) == sheets]
+
+    def GetFaceIDs(self, name):
+        self._app._rpc("oeditor.GetFaceIDs")
+        return [str(f.id) for f in self._app.modeler.objects[name].face_list()]
+
+    def GetFaceCenter(self, face_id):
+        self._app._rpc("oeditor.GetFaceCenter")
+        return [str(v) for v in self._app.faces[int(face_id)]._center]
+
+    def GetFaceArea(self, face_id):
+        self._app._rpc("oeditor.GetFaceArea")
+        return self._app.faces[int(face_id)]._area
+
+    def GetVertexIDsFromFace(self, face_id):
+        self._app._rpc("oeditor.GetVertexIDsFromFace")
+        return [str(v) for v in self._app.faces[int(face_id)].vertex_ids]
+
+    def GetVertexPosition(self, vertex_id):
+        self._app._rpc("oeditor.GetVertexPosition")
+        return [str(v) for v in self._app.vertices[int(vertex_id)]]
+
+    def __getattr__(self, method):
+        # ThickenSheet, Subtract, Move, ... only cost a round trip here
+        if not method[:1].isupper():
+            raise AttributeError(method)
+
+        def call(*args):
+            self._app._rpc(f"oeditor.{method}")
+            return True
+        return call
+
+
+# Any raw module call (AssignWavePort, EditSources, ...) is one round trip
+class FakeModule:
+    def __init__(self, app, name):
+        self._app = app
+        self._name = name
+
+    def __getattr__(self, method):
+        if not method[:1].isupper():
+            raise AttributeError(method)
+
+        def call(*args):
+            self._app._rpc(f"{self._name}.{method}")
+            return True
+        return call
+
+
+# oDesktop: RunScript executes the (IronPython-compatible) script in-process
+# as a single round trip; the calls it makes are local to the desktop
+class FakeDesktop:
+    def __init__(self, app):
+        self._app = app
+
+    def RunScript(self, path):
+        self._app._rpc("odesktop.RunScript")
+        with open(path, encoding="utf-8") as f:
+            code = f.read()
+        self._app._in_script = True
+        try:
+            exec(code, {"oDesktop": self})
+        finally:
+            self._app._in_script = False
+        return True
+
+    def SetActiveProject(self, name):
+        return self
+
+    def SetActiveDesign(self, name):
+        return self
+
+    def SetActiveEditor(self, name):
+        return self._app.modeler.oeditor
+
+    def GetModule(self, name):
+        return self._app.oboundary if name == "BoundarySetup" else FakeModule(self._app, name)
+
+
+class FakeModeler:
+    def __init__(self, app):
+        self._app = app
+        self.objects = {}
+        self.oeditor = FakeEditor(app)
+
+    def _add(self, name, bbox, material=None):
+        obj = FakeObject3d(self._app, name, [float(v) for v in bbox], material)
+        self.objects[name] = obj
+        return obj
+
+    def __getitem__(self, name):
+        self._app._rpc("modeler.__getitem__")
+        return self.objects[name]
+
+    @property
+    def object_names(self):
+        return list(self.objects)
+
+    def create_box(self, origin, sizes, name=None, material=None, **kwargs):
+        self._app._rpc("modeler.create_box")
+        x, y, z = (self._app.evaluate(v) for v in origin)
+        dx, dy, dz = (self._app.evaluate(v) for v in sizes)
+        return self._add(name or f"Box{len(self.objects)}",
+                         [min(x, x + dx), min(y, y + dy), min(z, z + dz), max(x, x + dx), max(y, y + dy), max(z, z + dz)],
+                         material)
+
+    def create_cylinder(self, orientation, origin, radius, height, name=None, material=None, **kwargs):
+        self._app._rpc("modeler.create_cylinder")
+        x, y, z = (self._app.evaluate(v) for v in origin)
+        r, h = self._app.evaluate(radius), self._app.evaluate(height)
+        return self._add(name or f"Cylinder{len(self.objects)}",
+                         [x - r, y - r, min(z, z + h), x + r, y + r, max(z, z + h)], material)
+
+    def create_rectangle(self, orientation, origin, sizes, name=None, **kwargs):
+        self._app._rpc("modeler.create_rectangle")
+        x, y, *rest = (self._app.evaluate(v) for v in origin)
+        z = rest[0] if rest else 0.0
+        w, h = (self._app.evaluate(v) for v in sizes)
+        return self._add(name or f"Rectangle{len(self.objects)}", [x, y, z, x + w, y + h, z])
+
+    def create_circle(self, orientation, origin, radius, name=None, **kwargs):
+        self._app._rpc("modeler.create_circle")
+        x, y, *rest = (self._app.evaluate(v) for v in origin)
+        z = rest[0] if rest else 0.0
+        r = self._app.evaluate(radius)
+        return self._add(name or f"Circle{len(self.objects)}", [x - r, y - r, z, x + r, y + r, z])
+
+    def create_polyline(self, points, name=None, **kwargs):
+        self._app._rpc("modeler.create_polyline")
+        xyz = np.array([[self._app.evaluate(v) for v in p] for p in points])
+        return self._add(name or f"Polyline{len(self.objects)}", [*xyz.min(axis=0), *xyz.max(axis=0)])
+
+    def subtract(self, blank_list, tool_list, keep_originals=True, **kwargs):
+        self._app._rpc("modeler.subtract")
+        if not keep_originals:
+            for tool in [tool_list] if isinstance(tool_list, str) else tool_list:
+                self.objects.pop(getattr(tool, "name", tool), None)
+        return True
+
+    def thicken_sheet(self, assignment, thickness, **kwargs):
+        self._app._rpc("modeler.thicken_sheet")
+        return True
+
+    def refresh_all_ids(self):
+        self._app._rpc("modeler.refresh_all_ids")
+        return len(self.objects)
+
+    def fit_all(self):
+        self._app._rpc("modeler.fit_all")
+
+
+class FakeSweep:
+    def __init__(self, app, setup, name, props):
+        self._app = app
+        self.setup = setup
+        self.name = name
+        self.props = props
+
+    def frequencies(self):
+        props = self.props
+        if "Frequencies" in props:
+            return np.asarray(props["Frequencies"], dtype=float)
+        start, stop = parse_freq(props.get("RangeStart", "1GHz")), parse_freq(props.get("RangeEnd", "2GHz"))
+        if props.get("RangeType", "LinearCount") == "LinearStep":
+            return np.arange(start, stop + 1e-6, parse_freq(props["RangeStep"]))
+        return np.linspace(start, stop, int(props.get("RangeCount", 401)))
+
+    def update(self):
+        self._app._rpc("sweep.update")
+        return True
+
+
+class FakeSetup:
+    def __init__(self, app, name):
+        self._app = app
+        self.name = name
+        self.props = {"Frequency": "1GHz", "MaximumPasses": 6, "DeltaS": 0.02}
+        self.sweeps = []
+        self._done_at = None
+
+    def update(self):
+        self._app._rpc("setup.update")
+        return True
+
+    # Solutions available (a non-blocking solve is done)
+    @property
+    def is_solved(self):
+        self._app._rpc("setup.is_solved")
+        return self._done_at is not None and time.perf_counter() >= self._done_at
+
+    def add_sweep(self, name=None, sweep_type="Interpolating", **props):
+        self._app._rpc("setup.add_sweep")
+        sweep = FakeSweep(self._app, self, name or f"Sweep{len(self.sweeps) + 1}", {"Type": sweep_type, **props})
+        self.sweeps.append(sweep)
+        return sweep
+
+    def create_single_point_sweep(self, unit="GHz", freq=None, name=None, **kwargs):
+        self._app._rpc("setup.create_single_point_sweep")
+        freqs = [freq] if np.isscalar(freq) else list(freq)
+        sweep = FakeSweep(self._app, self, name or f"SinglePoint{len(self.sweeps) + 1}",
+                          {"Frequencies": [f * _FREQ_UNITS[unit] for f in freqs]})
+        self.sweeps.append(sweep)
+        return sweep
+
+    def get_sweep(self, name=None):
+        for sweep in self.sweeps:
+            if name is None or sweep.name == name:
+                return sweep
+        return None
+
+
+# Like pyaedt's SolutionData: data_real follows the primary sweep at the
+# active value of every other intrinsic variation
+class FakeSolutionData:
+    def __init__(self, columns, primary, sweeps):
+        self.columns = columns
+        self.primary = primary
+        self.primary_sweep = primary.split(" [")[0]
+        self._sweeps = {s.split(" [")[0]: s for s in sweeps}
+        self.intrinsics = {name: list(np.unique(columns[s])) for name, s in self._sweeps.items()}
+        self.units_sweeps = {name: s[s.find("[") + 1:-1] for name, s in self._sweeps.items()}
+        self.active_intrinsic = {name: values[0] for name, values in self.intrinsics.items()}
+
+    @property
+    def primary_sweep_values(self):
+        return list(np.unique(self.columns[self.primary]))
+
+    def data_real(self, expression=None):
+        name = next(c for c in self.columns if c.split(" [")[0].lower() == (expression or "").lower())
+        rows = np.ones(len(self.columns[name]), dtype=bool)
+        for sweep, column in self._sweeps.items():
+            if sweep != self.primary_sweep:
+                rows &= self.columns[column] == self.active_intrinsic[sweep]
+        order = np.argsort(self.columns[self.primary][rows], kind="stable")
+        return list(self.columns[name][rows][order])
+
+    def export_data_to_csv(self, output, delimiter=";"):
+        names = list(self.columns)
+        table = np.column_stack([self.columns[n] for n in names])
+        np.savetxt(output, table, delimiter=delimiter, header=delimiter.join(names), comments="", fmt="%.10g")
+        return True
+
+
+class FakePost:
+    def __init__(self, app):
+        self._app = app
+        self.reports = []
+
+    def create_report(self, expressions=None, **kwargs):
+        self._app._rpc("post.create_report")
+        self.reports.append(expressions)
+        return True
+
+    def get_solution_data(self, expressions=None, setup_sweep_name=None, primary_sweep_variable=None,
+                          report_category=None, context=None, variations=None, **kwargs):
+        self._app._rpc("post.get_solution_data")
+        expressions = [expressions] if isinstance(expressions, str) else list(expressions)
+        variations = variations or {}
+        far_field = report_category == "Far Fields"
+        freqs = self._app._solved_freqs(setup_sweep_name or (None if far_field else context))
+        if variations.get("Freq", ["All"]) != ["All"]:
+            freqs = np.array([parse_freq(f) for f in variations["Freq"]])
+
+        if not far_field:
+            columns = {"Freq [GHz]": freqs / 1e9}
+            for expr in expressions:
+                columns[f"{expr} []"] = self._app.s11_db(freqs)
+            return FakeSolutionData(columns, "Freq [GHz]", ["Freq [GHz]"])
+
+        sphere = self._app.spheres.get(context, {})
+        theta = self._angles(variations.get("Theta", ["All"]), sphere.get("x_start", -180),
+                             sphere.get("x_stop", 180), sphere.get("x_step", 10))
+        phi = self._angles(variations.get("Phi", ["All"]), sphere.get("y_start", 0),
+                           sphere.get("y_stop", 360), sphere.get("y_step", 10))
+        f, t, p = (a.ravel() for a in np.meshgrid(freqs, theta, phi, indexing="ij"))
+        e_theta, e_phi = self._app.far_field(f, np.radians(t), np.radians(p))
+        columns = {"Freq [GHz]": f / 1e9, "Theta [deg]": t, "Phi [deg]": p}
+        for expr in expressions:
+            key = expr.lower()
+            if key == "db(axialratiovalue)":
+                r = np.abs(e_theta - 1j * e_phi)
+                l = np.abs(e_theta + 1j * e_phi)
+                columns[f"{expr} []"] = 20 * np.log10((r + l) / np.maximum(np.abs(r - l), 1e-12))
+            else:
+                part, comp = re.fullmatch(r"(re|im)\(re(theta|phi)\)", key).groups()
+                value = e_theta if comp == "theta" else e_phi
+                columns[f"{expr} [V]"] = value.real if part == "re" else value.imag
+        return FakeSolutionData(columns, "Theta [deg]", ["Theta [deg]", "Freq [GHz]", "Phi [deg]"])
+
+    @staticmethod
+    def _angles(values, start, stop, step):
+        if values == ["All"]:
+            return np.arange(start, stop + step / 2, step, dtype=float)
+        return np.array([float(str(v).replace("deg", "")) for v in values])
+
+
+class FakeParametricSetup:
+    def __init__(self, app, name, solution):
+        self._app = app
+        self.name = name
+        self.solution = solution
+        self.variations = []
+        self.props = {"ProdOptiSetupDataV2": {"SaveFields": False, "CopyMesh": False, "SolveWithCopiedMeshOnly": True}}
+
+    def update(self):
+        self._app._rpc("parametric.update")
+        return True
+
+    def add_variation(self, variable, start_point, end_point=None, step=100, unit=None, variation_type="LinearCount"):
+        self._app._rpc("parametric.add_variation")
+        self.variations.append((variable, start_point, end_point, step, variation_type))
+        return True
+
+
+class FakeParametrics:
+    def __init__(self, app):
+        self._app = app
+        self.setups = []
+
+    def add(self, variable, start_point, end_point=None, step=100, variation_type="LinearCount",
+            solution=None, name=None):
+        self._app._rpc("parametrics.add")
+        setup = FakeParametricSetup(self._app, name or f"ParametricSetup{len(self.setups) + 1}", solution)
+        setup.variations.append((variable, start_point, end_point, step, variation_type))
+        self.setups.append(setup)
+        return setup
+
+
+# Design state kept by save_project and restored when an .aedt path is reopened
+PROJECT_STATE = ("variables", "boundaries", "excitations", "setups", "spheres", "solved", "_ids", "faces",
+                 "vertices", "modeler", "parametrics")
+
+
+class FakeHfss:
+    aedt_version_id = "2024.2"
+    latency = 0.0       # seconds per AEDT round trip, class-wide so scripts pick it up
+    solve_time = 0.0    # extra seconds per analyze call
+    saved_projects = {}
+
+    def __init__(self, project=None, design=None, solution_type=None, non_graphical=True, new_desktop=True,
+                 working_directory=None, materials=None, latency=None, **kwargs):
+        if latency is not None:
+            self.latency = latency
+        self.rpc_calls = Counter()
+        self.project_name = project or "Project1"
+        self.design_name = design or "HFSSDesign1"
+        self.solution_type = solution_type
+        self.non_graphical = non_graphical
+        self.working_directory = working_directory or tempfile.mkdtemp(prefix="fake_hfss_")
+        os.makedirs(self.working_directory, exist_ok=True)
+        self.project_file = os.path.join(self.working_directory, f"{self.project_name}.aedt")
+        self.variables = {}
+        self.boundaries = []
+        self.excitations = []
+        self.setups = []
+        self.spheres = {}
+        self.solved = set()
+        self._ids = 0
+        self._busy_until = 0.0
+        self._in_script = False
+        self.faces = {}
+        self.vertices = {}
+        self.materials = FakeMaterials(self, materials or MATERIALS)
+        self.modeler = FakeModeler(self)
+        self.post = FakePost(self)
+        self.parametrics = FakeParametrics(self)
+        self.oboundary = FakeModule(self, "oboundary")
+        self.odesktop = FakeDesktop(self)
+        if project and project.endswith(".aedt"):
+            self.project_file = os.path.abspath(project)
+            self.project_name = os.path.splitext(os.path.basename(project))[0]
+            if self.project_file in self.saved_projects:
+                self._restore(self.saved_projects[self.project_file])
+        self._rpc("Hfss")
+
+    def _restore(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        owned = [self.modeler, self.modeler.oeditor, self.parametrics, *self.parametrics.setups,
+                 *self.modeler.objects.values(), *self.faces.values(), *self.setups]
+        owned += [sweep for setup in self.setups for sweep in setup.sweeps]
+        for obj in owned:
+            obj._app = self
+
+    def _rpc(self, name):
+        if self._in_script:
+            return
+        self.rpc_calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _next_id(self):
+        self._ids += 1
+        return self._ids
+
+    @property
+    def are_there_simulations_running(self):
+        self._rpc("are_there_simulations_running")
+        return time.perf_counter() < self._busy_until
+
+    @property
+    def rpc_count(self):
+        return sum(self.rpc_calls.values())
+
+    # Numeric value in mm of a number, "12.5mm" or an expression of design variables
+    def evaluate(self, value):
+        if not isinstance(value, str):
+            return float(value)
+        text = value.strip()
+        m = re.fullmatch(r"([-+0-9.eE]+)\s*([a-z]*)", text)
+        if m and (not m.group(2) or m.group(2) in _UNITS):
+            return float(m.group(1)) * _UNITS.get(m.group(2), 1.0)
+        expr = re.sub(r"(?<=[0-9.])(mm|cm|um|mil|in|meter|m)\b", "", text)
+        return float(eval(expr, {"__builtins__": {}, "sqrt": math.sqrt, "pi": math.pi}, _Variables(self)))
+
+    def __setitem__(self, name, value):
+        self._rpc("variable.set")
+        self.variables[name] = value
+
+    def __getitem__(self, name):
+        self._rpc("variable.get")
+        return self.variables[name]
+
+    def assign_radiation_boundary_to_faces(self, assignment, name=None, **kwargs):
+        self._rpc("assign_radiation_boundary_to_faces")
+        self.boundaries.append(("Radiation", name, list(assignment)))
+        return True
+
+    def assign_radiation_boundary_to_objects(self, assignment, name=None, **kwargs):
+        self._rpc("assign_radiation_boundary_to_objects")
+        self.boundaries.append(("Radiation", name, assignment))
+        return True
+
+    def assign_perfecte_to_sheets(self, assignment, name=None, **kwargs):
+        self._rpc("assign_perfecte_to_sheets")
+        self.boundaries.append(("PerfectE", name, assignment))
+        return True
+
+    def wave_port(self, assignment, reference=None, name=None, **kwargs):
+        self._rpc("wave_port")
+        self.excitations.append(name or f"{len(self.excitations) + 1}")
+        return True
+
+    def edit_sources(self, assignment, **kwargs):
+        self._rpc("edit_sources")
+        self.sources = dict(assignment)
+        return True
+
+    def create_setup(self, name="Setup1", **kwargs):
+        self._rpc("create_setup")
+        setup = FakeSetup(self, name)
+        setup.props.update(kwargs)
+        self.setups.append(setup)
+        return setup
+
+    def get_setup(self, name):
+        return next(s for s in self.setups if s.name == name)
+
+    def insert_infinite_sphere(self, name="InfiniteSphere1", **kwargs):
+        self._rpc("insert_infinite_sphere")
+        self.spheres[name] = kwargs
+        return True
+
+    def analyze(self, cores=4, blocking=True, **kwargs):
+        self._rpc("analyze")
+        for setup in self.setups:
+            self._solve(setup, blocking)
+        return True
+
+    def analyze_setup(self, name=None, cores=4, blocking=True, **kwargs):
+        self._rpc("analyze_setup")
+        parametric = next((p for p in self.parametrics.setups if p.name == name), None)
+        if parametric is not None:
+            name = (parametric.solution or self.setups[0].name).split(" : ")[0]
+        self._solve(self.get_setup(name), blocking)
+        return True
+
+    # Non-blocking solves finish solve_time after submission
+    def _solve(self, setup, blocking=True):
+        if self.solve_time and blocking:
+            time.sleep(self.solve_time)
+        elif self.solve_time:
+            self._busy_until = max(self._busy_until, time.perf_counter()) + self.solve_time
+        setup._done_at = self._busy_until if self.solve_time and not blocking else 0.0
+        self.solved.update((setup.name, s.name) for s in setup.sweeps)
+
+    def _solved_freqs(self, context):
+        setup_name, _, sweep_name = (context or self.setups[0].name).partition(" : ")
+        setup = self.get_setup(setup_name.strip())
+        sweep = None if sweep_name.strip() == "LastAdaptive" else setup.get_sweep(sweep_name.strip() or None)
+        if sweep is None or (setup.name, sweep.name) not in self.solved:
+            return np.array([parse_freq(setup.props["Frequency"])])
+        return sweep.frequencies()
+
+    # Synthetic responses
+    def s11_db(self, freqs):
+        x = (np.asarray(freqs, dtype=float) - RESONANCE) / BANDWIDTH
+        return -0.5 - 24.0 / (1.0 + x * x)
+
+    def far_field(self, freqs, theta, phi):
+        amp = np.where(np.cos(theta) > 0, (1 + np.cos(theta)) / 2, 0.05 * (1 - np.cos(theta)) / 2)
+        amp = amp * (1.0 - 0.5 * np.abs(freqs - RESONANCE) / RESONANCE)
+        e_theta = amp * np.exp(1j * phi) * 10.0
+        e_phi = 1j * 0.9 * e_theta
+        return e_theta, e_phi
+
+    def save_project(self, file_name=None, **kwargs):
+        self._rpc("save_project")
+        if file_name:
+            self.project_file = os.path.abspath(file_name)
+        with open(self.project_file, "w", encoding="utf-8") as f:
+            f.write("$begin 'AnsoftProject'\n$end 'AnsoftProject'\n")
+        self.saved_projects[self.project_file] = {name: getattr(self, name) for name in PROJECT_STATE}
+        return True
+
+    # Mesh statistics in the AEDT table layout, tets scaled with the AirBox volume
+    def export_mesh_stats(self, setup, variation="", mesh_path=None):
+        self._rpc("export_mesh_stats")
+        box = self.modeler.objects.get("AirBox")
+        volume = np.prod(np.subtract(box.bounding_box[3:], box.bounding_box[:3])) if box else 0.0
+        tets = int(20_000 + volume * 3e-2)
+        mesh_path = mesh_path or os.path.join(os.path.dirname(self.project_file) or ".", "meshstats.ms")
+        with open(mesh_path, "w", encoding="utf-8") as f:
+            f.write("Mesh statistics\n\n   | Num Tets | Min edge length | Max edge length\n")
+            f.write(f"AirBox | {tets - 20_000} | 0.5 | 30\nTotal | {tets} | 0.1 | 30\n")
+        return mesh_path
+
+    def release_desktop(self, close_projects=True, close_desktop=True):
+        self._rpc("release_desktop")
+        return True
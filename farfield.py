@@ -0,0 +1,172 @@
+import os
+
+import numpy as np
+
+from result_loader import FarFieldTable, find_column
+
+# Local far-field engine: export the complex rETheta / rEPhi grid of
+# InfiniteSphere1 once, then compute axial ratio, RHCP/LHCP gain and
+# beamwidths in NumPy over every (freq, theta, phi) at once instead of one
+# AEDT report query per quantity and cut.
+#
+#   path = export_far_field(hfss, directory)
+#   ff = FarField.from_csv(path)
+#   ff.axial_ratio_db()          # (n_freq, n_theta, n_phi)
+#   ff.beamwidth(ff.gain_db("rhcp"))
+#
+# Circular components follow the HFSS definitions
+#   rERHCP = (rETheta - j rEPhi) / sqrt(2),  rELHCP = (rETheta + j rEPhi) / sqrt(2)
+
+ETA0 = 376.730313668  # Free-space impedance in ohms
+
+FIELD_EXPRESSIONS = ["re(rETheta)", "im(rETheta)", "re(rEPhi)", "im(rEPhi)"]
+
+UNIT_SCALE = {"": 1.0, "V": 1.0, "mV": 1e-3, "uV": 1e-6, "kV": 1e3}
+
+
+def _unit_scale(column):
+    unit = column[column.find("[") + 1:column.find("]")] if "[" in column else ""
+    return UNIT_SCALE.get(unit.strip(), 1.0)
+
+
+# One Far Fields query for the full complex rE grid, written to CSV
+def export_far_field(hfss, directory=None, sweep_name=None, freqs=None, sphere="InfiniteSphere1"):
+    variations = {"Theta": ["All"], "Phi": ["All"], "Freq": [f"{f / 1e9:g}GHz" for f in freqs] if freqs else ["All"]}
+    data = hfss.post.get_solution_data(
+        expressions=FIELD_EXPRESSIONS,
+        setup_sweep_name=f"Setup1 : {sweep_name}" if sweep_name else None,
+        primary_sweep_variable="Theta",
+        report_category="Far Fields",
+        context=sphere,
+        variations=variations
+    )
+    path = os.path.join(directory or hfss.working_directory, "rE_FarField.csv")
+    data.export_data_to_csv(path)
+    print(f"✅ CSV saved to: {path}")
+    return path
+
+
+# Width of the contiguous region around center where inside is True, with
+# edges linearly interpolated to level. Works along the last axis; returns
+# NaN when the region reaches the end of the cut (no edge found).
+def contiguous_width(theta, values, inside, center, level):
+    theta = np.asarray(theta, dtype=float)
+    n = theta.size
+    idx = np.arange(n)
+    center = np.asarray(center)[..., None]
+    outside = ~inside
+
+    left = np.where(outside & (idx < center), idx, -1).max(axis=-1)
+    right = np.where(outside & (idx > center), idx, n).min(axis=-1)
+
+    def edge(i_out, i_in):
+        i_out_c = np.clip(i_out, 0, n - 1)
+        i_in_c = np.clip(i_in, 0, n - 1)
+        v_out = np.take_along_axis(values, i_out_c[..., None], axis=-1)[..., 0]
+        v_in = np.take_along_axis(values, i_in_c[..., None], axis=-1)[..., 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(v_in != v_out, (level - v_out) / (v_in - v_out), 0.0)
+        return theta[i_out_c] + t * (theta[i_in_c] - theta[i_out_c])
+
+    theta_left = edge(left, left + 1)
+    theta_right = edge(right, right - 1)
+    width = theta_right - theta_left
+    return np.where((left < 0) | (right >= n), np.nan, width)
+
+
+class FarField:
+    # freq (GHz), theta and phi (deg) axes; e_theta / e_phi complex rE cubes (V)
+    # of shape (n_freq, n_theta, n_phi)
+    def __init__(self, freq, theta, phi, e_theta, e_phi, incident_power=1.0):
+        self.freq = np.asarray(freq, dtype=float)
+        self.theta = np.asarray(theta, dtype=float)
+        self.phi = np.asarray(phi, dtype=float)
+        self.e_theta = np.asarray(e_theta, dtype=complex)
+        self.e_phi = np.asarray(e_phi, dtype=complex)
+        self.incident_power = incident_power  # HFSS wave ports default to 1 W
+
+    @classmethod
+    def from_table(cls, table, incident_power=1.0):
+        names = list(table.columns)
+        cubes = []
+        for expr in FIELD_EXPRESSIONS:
+            column = find_column(names, expr)
+            cubes.append(table.grid(column) * _unit_scale(column))
+        re_t, im_t, re_p, im_p = cubes
+        return cls(*table.axes, re_t + 1j * im_t, re_p + 1j * im_p, incident_power)
+
+    @classmethod
+    def from_csv(cls, path, incident_power=1.0, chunk_rows=1_000_000):
+        return cls.from_table(FarFieldTable.from_csv(path, chunk_rows=chunk_rows), incident_power)
+
+    def rhcp(self):
+        return (self.e_theta - 1j * self.e_phi) / np.sqrt(2)
+
+    def lhcp(self):
+        return (self.e_theta + 1j * self.e_phi) / np.sqrt(2)
+
+    def axial_ratio(self):
+        r = np.abs(self.rhcp())
+        l = np.abs(self.lhcp())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (r + l) / np.abs(r - l)
+
+    def axial_ratio_db(self):
+        with np.errstate(divide="ignore"):
+            return 20 * np.log10(self.axial_ratio())
+
+    # Realized gain relative to the incident power, total or one CP component
+    def gain(self, polarization="total"):
+        if polarization == "rhcp":
+            e2 = np.abs(self.rhcp()) ** 2
+        elif polarization == "lhcp":
+            e2 = np.abs(self.lhcp()) ** 2
+        else:
+            e2 = np.abs(self.e_theta) ** 2 + np.abs(self.e_phi) ** 2
+        intensity = e2 / (2 * ETA0)  # W/sr
+        return 4 * np.pi * intensity / self.incident_power
+
+    def gain_db(self, polarization="total"):
+        with np.errstate(divide="ignore"):
+            return 10 * np.log10(self.gain(polarization))
+
+    # 3 dB beamwidth of every (freq, phi) theta cut, in degrees
+    def beamwidth(self, gain_db=None, drop_db=3.0):
+        g = np.moveaxis(self.gain_db("rhcp") if gain_db is None else gain_db, 1, -1)  # (freq, phi, theta)
+        g = np.nan_to_num(g, nan=-np.inf)
+        peak = np.argmax(g, axis=-1)
+        level = np.take_along_axis(g, peak[..., None], axis=-1)[..., 0] - drop_db
+        return contiguous_width(self.theta, g, g >= level[..., None], peak, level)
+
+    # Angular range around boresight where AR stays below ar_db_max, per (freq, phi)
+    def ar_beamwidth(self, ar_db_max=3.0):
+        ar = np.moveaxis(self.axial_ratio_db(), 1, -1)
+        ar = np.nan_to_num(ar, nan=1e3, posinf=1e3)
+        center = np.full(ar.shape[:-1], int(np.argmin(np.abs(self.theta))))
+        width = contiguous_width(self.theta, ar, ar <= ar_db_max, center, ar_db_max)
+        boresight_ok = np.take_along_axis(ar, center[..., None], axis=-1)[..., 0] <= ar_db_max
+        return np.where(boresight_ok, width, 0.0)
+
+    def index(self, freq=None, theta=None, phi=None):
+        pick = lambda axis, v: int(np.argmin(np.abs(axis - v))) if v is not None else slice(None)
+        return pick(self.freq, freq), pick(self.theta, theta), pick(self.phi, phi)
+
+    # Boresight AR / gain and beamwidths at f0 (GHz) for the principal cuts
+    def summary(self, f0_ghz):
+        fi, ti, _ = self.index(f0_ghz, 0)
+        p0 = self.index(phi=0)[2]
+        p90 = self.index(phi=90)[2]
+        ar = self.axial_ratio_db()[fi, ti]
+        g_r = self.gain_db("rhcp")[fi, ti]
+        g_l = self.gain_db("lhcp")[fi, ti]
+        bw = self.beamwidth()[fi]
+        ar_bw = self.ar_beamwidth()[fi]
+        return {
+            "AR_boresight_dB": float(ar[p0]),
+            "Gain_RHCP_boresight_dBi": float(g_r[p0]),
+            "Gain_LHCP_boresight_dBi": float(g_l[p0]),
+            "HPBW_phi0_deg": float(bw[p0]),
+            "HPBW_phi90_deg": float(bw[p90]),
+            "AR_BW_phi0_deg": float(ar_bw[p0]),
+            "AR_BW_phi90_deg": float(ar_bw[p90]),
+        }
@@ -0,0 +1,141 @@
+import numpy as np
+
+from mesh_estimator import MeshEstimator, read_mesh_stats
+from solution_batch import get_solution_data
+
+# Field-saving policy for the frequency sweep under a disk budget.
+#
+#   policy = FieldPolicy(budget_bytes=2e9)
+#   run_design(hfss, params, field_policy=policy)
+#
+# The main sweep keeps S-parameters at every point but no volume fields
+# (SaveFields=False). Fields are saved by one single-point sweep (FIELDS_SWEEP)
+# at the frequencies that are post-processed: the user's frequencies, f0 and
+# the band edges, then the S11 resonance once it is known. Every point costs
+# about point_bytes() (tetrahedra x BYTES_PER_TET), with the tetrahedra of
+# the design's own mesh: the mesh_estimator model before the solve, the solved
+# mesh statistics after it. Points beyond the budget are dropped lowest
+# priority first, except f0, which post-processing reads the boresight axial
+# ratio from. Radiation-surface fields in the main sweep are only kept when
+# they fit too. A DesignCache stores a project whose solutions still exceed
+# the budget without its .aedtresults (see DesignCache.put).
+
+FIELDS_SWEEP = "Fields"
+RESONANCE_SWEEP = "FieldsResonance"
+
+BYTES_PER_TET = 120         # E/H field data per tetrahedron and frequency (second-order basis, complex)
+DEFAULT_TETS = 150_000      # mesh assumed before the design is known
+RAD_FIELDS_FRACTION = 0.02  # radiation-surface fields relative to the volume fields of one point
+
+
+def _ghz(text):
+    return float(str(text).replace("GHz", "")) * 1e9
+
+
+class FieldPolicy:
+    def __init__(self, budget_bytes=2e9, freqs=None, edges=True, resonance=True, rad_fields=True,
+                 tets=None, point_bytes=None):
+        self.budget_bytes = budget_bytes
+        self.freqs = list(freqs or [])
+        self.edges = edges
+        self.resonance = resonance
+        self.rad_fields = rad_fields
+        self.tets = tets
+        self._point_bytes = point_bytes
+        self.saved_freqs = []
+        self.main_sweep = None
+
+    def point_bytes(self):
+        return self._point_bytes or (self.tets or DEFAULT_TETS) * BYTES_PER_TET
+
+    # Estimated mesh of the design (mesh_estimator), unless tets was given
+    def estimate_mesh(self, dims, eps_r, f0):
+        if self.tets is None:
+            self.tets = MeshEstimator().tets(dims, eps_r, f0)
+        return self.tets
+
+    # Tetrahedra of the solved mesh, from the setup's mesh statistics
+    def measure_mesh(self, hfss, setup):
+        stats = hfss.export_mesh_stats(setup.name)
+        tets = read_mesh_stats(stats) if stats else None
+        if tets:
+            self.tets = tets
+        return self.tets
+
+    # Disk use of n_fields field points plus radiation fields on rad_points sweep points
+    def estimate(self, n_fields, rad_points=0):
+        return self.point_bytes() * (n_fields + RAD_FIELDS_FRACTION * rad_points)
+
+    # Radiation fields over the whole sweep, if they fit next to the selected field points
+    def keep_rad_fields(self, sweep, n_fields=0):
+        return self.rad_fields and self.estimate(n_fields, int(sweep["RangeCount"])) <= self.budget_bytes
+
+    # Field frequencies in priority order (f0, user, band edges), cut to the budget.
+    # f0 is always kept; field points come first, radiation fields only take what is left.
+    def field_freqs(self, sweep, f0):
+        candidates = [f0] + list(self.freqs)
+        if self.edges:
+            candidates += [_ghz(sweep["RangeStart"]), _ghz(sweep["RangeEnd"])]
+        freqs = []
+        for f in candidates:
+            if all(abs(f - g) > 1.0 for g in freqs):
+                freqs.append(float(f))
+        affordable = max(1, int(self.budget_bytes // self.point_bytes()))
+        if self.point_bytes() > self.budget_bytes:
+            print(f"❌ Disk budget {self.budget_bytes / 1e9:g} GB is below one field point: keeping f0 only")
+        if len(freqs) > affordable:
+            print(f"❌ Disk budget {self.budget_bytes / 1e9:g} GB: no fields at "
+                  f"{', '.join(f'{f / 1e9:g} GHz' for f in freqs[affordable:])}")
+        return freqs[:affordable]
+
+    # Main sweep without volume fields (and without radiation fields when they do not fit)
+    def sweep(self, sweep, n_fields=0):
+        return {**sweep, "SaveFields": False, "SaveRadFields": self.keep_rad_fields(sweep, n_fields)}
+
+    def _field_sweep(self, setup, name, freqs):
+        setup.create_single_point_sweep(
+            unit="GHz",
+            freq=[round(f / 1e9, 9) for f in freqs],
+            name=name,
+            save_single_field=True,
+            save_fields=True,
+            save_radiating_fields=True
+        )
+        self.saved_freqs += list(freqs)
+
+    # Sweep to read the far field at f0 from (None: the main sweep)
+    def sweep_name(self, f0):
+        return FIELDS_SWEEP if any(abs(f - f0) <= 1.0 for f in self.saved_freqs) else None
+
+    # Main sweep and the field sweep on setup; returns the field frequencies
+    def apply(self, setup, sweep, f0):
+        self.saved_freqs = []
+        self.main_sweep = None
+        freqs = self.field_freqs(sweep, f0)
+        props = self.sweep(sweep, len(freqs))
+        self.main_sweep = props["name"]
+        sweep_obj = setup.add_sweep(name=props.pop("name"), sweep_type=props.pop("sweep_type"), **props)
+        sweep_obj.update()
+        if freqs:
+            self._field_sweep(setup, FIELDS_SWEEP, freqs)
+        rad_points = int(sweep["RangeCount"]) if props["SaveRadFields"] else 0
+        print(f"📌 Fields at {', '.join(f'{f / 1e9:g} GHz' for f in freqs) or 'no frequency'}, "
+              f"estimated {self.estimate(len(freqs), rad_points) / 1e9:.2f} GB")
+        return freqs
+
+    # After the solve: fields at the S11 resonance too, if it is new and fits the budget
+    def add_resonance(self, hfss, setup, cores=4):
+        if not self.resonance:
+            return None
+        data = get_solution_data(hfss, ["dB(S(1,1))"], primary_sweep_variable="Freq", context=setup.name)
+        freqs = np.asarray(data.primary_sweep_values, dtype=float) * 1e9  # GHz -> Hz
+        f_res = float(freqs[int(np.argmin(data.data_real("dB(S(1,1))")))])
+        step = float(np.min(np.diff(freqs))) if len(freqs) > 1 else 1.0
+        if any(abs(f_res - f) <= step * 1.001 for f in self.saved_freqs):
+            return None
+        if self.estimate(len(self.saved_freqs) + 1) > self.budget_bytes:
+            print(f"❌ Disk budget {self.budget_bytes / 1e9:g} GB: no fields at the resonance {f_res / 1e9:g} GHz")
+            return None
+        self._field_sweep(setup, RESONANCE_SWEEP, [f_res])
+        hfss.analyze_setup(setup.name, cores=cores)
+        return f_res
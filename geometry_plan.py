@@ -0,0 +1,155 @@
+# Declarative geometry plan: record primitives and booleans first, then send
+# them to AEDT in as few round trips as possible.
+#
+#   plan = GeometryPlan()
+#   plan.box("Patch", [x, y, z], [dx, dy, dz], material="copper", color=[255, 0, 0])
+#   plan.subtract("Patch", ["TruncTopLeft", "TruncBottomRight"])
+#   plan.execute(hfss)
+#
+# Every primitive is one raw oEditor call with color/transparency/material in
+# its attribute block (no follow-up property RPCs), sheets sharing a thickness
+# are thickened together, all tools of one blank are subtracted in one call,
+# the object cache is refreshed once and the view is fitted once, only in
+# graphical mode. Coordinates may be numbers (in `units`) or expression strings.
+
+CONDUCTORS = {"copper", "pec", "aluminum", "gold", "silver"}
+
+AXES = {"XY": "Z", "Z": "Z", "YZ": "X", "X": "X", "ZX": "Y", "Y": "Y"}
+
+
+class GeometryPlan:
+    def __init__(self, units="mm"):
+        self.units = units
+        self.primitives = []
+        self.thickens = {}
+        self.subtracts = {}
+        self.rpc_count = 0
+
+    def _value(self, v):
+        return v if isinstance(v, str) else f"{v:.12g}{self.units}"
+
+    def _attributes(self, name, material, color, transparency, solve_inside):
+        if solve_inside is None:
+            solve_inside = material is None or material.lower() not in CONDUCTORS
+        attributes = [
+            "NAME:Attributes",
+            "Name:=", name,
+            "Flags:=", "",
+            "Color:=", "({} {} {})".format(*(color or [143, 175, 143])),
+            "Transparency:=", transparency or 0,
+            "PartCoordinateSystem:=", "Global",
+            "UDMId:=", "",
+            "SurfaceMaterialValue:=", "\"\"",
+            "SolveInside:=", solve_inside,
+            "ShellElement:=", False,
+            "ShellElementThickness:=", "0mm",
+            "IsMaterialEditable:=", True,
+            "UseMaterialAppearance:=", False,
+            "IsLightweight:=", False,
+        ]
+        if material is not None:
+            attributes += ["MaterialValue:=", f"\"{material}\""]
+        return attributes
+
+    def box(self, name, origin, sizes, material=None, color=None, transparency=None, solve_inside=None):
+        x, y, z = (self._value(v) for v in origin)
+        dx, dy, dz = (self._value(v) for v in sizes)
+        params = [
+            "NAME:BoxParameters",
+            "XPosition:=", x, "YPosition:=", y, "ZPosition:=", z,
+            "XSize:=", dx, "YSize:=", dy, "ZSize:=", dz,
+        ]
+        self.primitives.append(("CreateBox", params, self._attributes(name, material, color, transparency, solve_inside)))
+        return name
+
+    def cylinder(self, name, origin, radius, height, orientation="XY", material=None, color=None,
+                 transparency=None, solve_inside=None):
+        x, y, z = (self._value(v) for v in origin)
+        params = [
+            "NAME:CylinderParameters",
+            "XCenter:=", x, "YCenter:=", y, "ZCenter:=", z,
+            "Radius:=", self._value(radius),
+            "Height:=", self._value(height),
+            "WhichAxis:=", AXES[orientation],
+            "NumSides:=", "0",
+        ]
+        self.primitives.append(("CreateCylinder", params, self._attributes(name, material, color, transparency, solve_inside)))
+        return name
+
+    def circle(self, name, origin, radius, orientation="XY", material=None, color=None, transparency=None):
+        x, y, z = (self._value(v) for v in origin)
+        params = [
+            "NAME:CircleParameters",
+            "IsCovered:=", True,
+            "XCenter:=", x, "YCenter:=", y, "ZCenter:=", z,
+            "Radius:=", self._value(radius),
+            "WhichAxis:=", AXES[orientation],
+            "NumSegments:=", "0",
+        ]
+        self.primitives.append(("CreateCircle", params, self._attributes(name, material, color, transparency, False)))
+        return name
+
+    # Covered closed polygon; thickness turns it into a solid via a (batched) thicken
+    def polygon(self, name, points, material=None, color=None, transparency=None, thickness=None):
+        if points[0] != points[-1]:
+            points = list(points) + [points[0]]
+        plpoints = ["NAME:PolylinePoints"] + [
+            ["NAME:PLPoint", "X:=", self._value(p[0]), "Y:=", self._value(p[1]), "Z:=", self._value(p[2])]
+            for p in points
+        ]
+        segments = ["NAME:PolylineSegments"] + [
+            ["NAME:PLSegment", "SegmentType:=", "Line", "StartIndex:=", i, "NoOfPoints:=", 2]
+            for i in range(len(points) - 1)
+        ]
+        params = [
+            "NAME:PolylineParameters",
+            "IsPolylineCovered:=", True,
+            "IsPolylineClosed:=", True,
+            plpoints,
+            segments,
+            ["NAME:PolylineXSection", "XSectionType:=", "None", "XSectionOrient:=", "Auto",
+             "XSectionWidth:=", "0mm", "XSectionTopWidth:=", "0mm", "XSectionHeight:=", "0mm",
+             "XSectionNumSegments:=", "0", "XSectionBendType:=", "Corner"],
+        ]
+        self.primitives.append(("CreatePolyline", params, self._attributes(name, material, color, transparency, False)))
+        if thickness is not None:
+            self.thickens.setdefault(self._value(thickness), []).append(name)
+        return name
+
+    def subtract(self, blank, tools):
+        tools = [tools] if isinstance(tools, str) else list(tools)
+        self.subtracts.setdefault(blank, []).extend(tools)
+
+    def _call(self, method, *args):
+        self.rpc_count += 1
+        return method(*args)
+
+    def execute(self, hfss):
+        oeditor = hfss.modeler.oeditor
+        self.rpc_count = 0
+
+        for method, params, attributes in self.primitives:
+            self._call(getattr(oeditor, method), params, attributes)
+
+        for thickness, sheets in self.thickens.items():
+            self._call(
+                oeditor.ThickenSheet,
+                ["NAME:Selections", "Selections:=", ",".join(sheets), "NewPartsModelFlag:=", "Model"],
+                ["NAME:SheetThickenParameters", "Thickness:=", thickness, "BothSides:=", False],
+            )
+
+        for blank, tools in self.subtracts.items():
+            self._call(
+                oeditor.Subtract,
+                ["NAME:Selections", "Blank Parts:=", blank, "Tool Parts:=", ",".join(tools)],
+                ["NAME:SubtractParameters", "KeepOriginals:=", False],
+            )
+
+        # One refresh so hfss.modeler[...] sees every new object
+        self._call(hfss.modeler.refresh_all_ids)
+
+        if not hfss.non_graphical:
+            self._call(hfss.modeler.fit_all)
+
+        print(f"✅ Geometry built: {len(self.primitives)} primitives in {self.rpc_count} AEDT calls")
+        return self.rpc_count
@@ -0,0 +1,81 @@
+import os
+import re
+
+# Deferred HFSS session: PyAEDT is imported and the desktop launched on the
+# first call that needs AEDT, so the analytic design, printing and params.txt
+# export run (and fail) in milliseconds without a licence.
+#
+#   hfss = LazyHfss(project="MyProject", design="FR4PatchDesign", non_graphical=False)
+#   material = read_material(hfss, "FR4_epoxy", snapshot=MaterialSnapshot())   # no launch on a hit
+#   hfss.start()                                                               # explicit launch, or
+#   hfss.modeler...                                                            # first use launches
+#
+# Takes the Hfss() keywords unchanged.
+
+
+# "2024.2" from "2024.2", "24.2" or "242"
+def normalize_version(version):
+    digits = re.sub(r"\D", "", str(version))
+    if len(digits) == 3:
+        digits = "20" + digits
+    return f"{digits[:4]}.{digits[4:]}" if len(digits) == 5 else str(version)
+
+
+# Latest AEDT found through the ANSYSEM_ROOT<ver> variables of the installer, as PyAEDT does
+def installed_version():
+    versions = [name[len("ANSYSEM_ROOT"):] for name in os.environ if re.fullmatch(r"ANSYSEM_ROOT\d{3}", name)]
+    return normalize_version(max(versions)) if versions else None
+
+
+class LazyHfss:
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._app = None
+
+    @property
+    def started(self):
+        return self._app is not None
+
+    # Change the Hfss() keywords before launch, e.g. to reopen a saved project
+    def configure(self, **kwargs):
+        if self.started:
+            raise RuntimeError("AEDT is already running")
+        self._kwargs.update(kwargs)
+
+    def start(self):
+        if self._app is None:
+            from ansys.aedt.core import Hfss
+            print("🚀 Launching AEDT...")
+            self._app = Hfss(**self._kwargs)
+        return self._app
+
+    # Answered without launching: the requested (or latest installed) version until AEDT runs
+    @property
+    def aedt_version_id(self):
+        if self.started:
+            return self._app.aedt_version_id
+        version = self._kwargs.get("version")
+        return installed_version() if version is None else normalize_version(version)
+
+    @property
+    def non_graphical(self):
+        return self._app.non_graphical if self.started else self._kwargs.get("non_graphical", False)
+
+    # Nothing to release if AEDT never started; once released, the session
+    # can be configured and started again
+    def release_desktop(self, close_projects=True, close_desktop=True):
+        if not self.started:
+            return True
+        app, self._app = self._app, None
+        return app.release_desktop(close_projects=close_projects, close_desktop=close_desktop)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.start(), name)
+
+    def __getitem__(self, name):
+        return self.start()[name]
+
+    def __setitem__(self, name, value):
+        self.start()[name] = value
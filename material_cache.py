@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import time
+
+# Local snapshot of material properties (eps_r, tan_d, mu_r, sigma), so the
+# analytic design step needs no running desktop and a live session only pays
+# for the material library on a miss.
+#
+#   snapshot = MaterialSnapshot()
+#   snapshot.get("FR4_epoxy")                               # offline, None on a miss
+#   read_material(hfss, "FR4_epoxy", snapshot=snapshot)     # snapshot first, live on a miss
+#   snapshot.export(hfss, ["FR4_epoxy", "Rogers RO4003 (tm)"])   # or: python material_cache.py
+#
+# The file records the AEDT version it was read from; a session of another
+# version discards it (library values change between releases). Before AEDT
+# is launched the session version is the requested one, or the latest
+# installed (LazyHfss.aedt_version_id). Names are case-insensitive, like the
+# AEDT library.
+
+SNAPSHOT_FORMAT = 1
+
+DEFAULT_MATERIALS = ["FR4_epoxy", "Rogers RO4003 (tm)", "glass_PTFEreinf", "copper", "air", "pec"]
+
+
+class MaterialSnapshot:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".patch_design_cache", "materials.json")
+        self.aedt_version = None
+        self.materials = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != SNAPSHOT_FORMAT:
+            print(f"♻️ Ignoring material snapshot {self.path} (format {data.get('format')})")
+            return
+        self.aedt_version = data.get("aedt_version")
+        self.materials = data.get("materials", {})
+
+    # Unique temporary file per writer: parallel workers save concurrently
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".materials_", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "format": SNAPSHOT_FORMAT,
+                "aedt_version": self.aedt_version,
+                "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "materials": self.materials,
+            }, f, indent=1)
+        os.replace(tmp, self.path)
+
+    # Drop the snapshot when it was read from another AEDT version
+    def validate(self, aedt_version):
+        if aedt_version is None or aedt_version == self.aedt_version:
+            return True
+        if self.materials:
+            print(f"♻️ Material snapshot is from AEDT {self.aedt_version}, session is {aedt_version}: discarding")
+        self.materials = {}
+        self.aedt_version = aedt_version
+        return False
+
+    def get(self, name):
+        entry = self.materials.get(name.lower())
+        return None if entry is None else {k: v for k, v in entry.items() if k != "name"}
+
+    def put(self, name, properties, aedt_version=None):
+        if aedt_version is not None:
+            self.validate(aedt_version)
+        self.materials[name.lower()] = {"name": name, **properties}
+        self.save()
+
+    def names(self):
+        return sorted(entry["name"] for entry in self.materials.values())
+
+    # Read materials from a live session into the snapshot in one pass
+    def export(self, hfss, names=None):
+        from patch_pipeline import read_material
+        self.validate(getattr(hfss, "aedt_version_id", None))
+        exported = []
+        for name in names or DEFAULT_MATERIALS:
+            try:
+                self.materials[name.lower()] = {"name": name, **read_material(hfss, name)}
+                exported.append(name)
+            except ValueError as e:
+                print(f"❌ {e}")
+        self.save()
+        print(f"✅ Material snapshot saved to: {self.path} ({len(exported)} material(s))")
+        return exported
+
+
+# One-off export: python material_cache.py [material ...]
+if __name__ == "__main__":
+    import sys
+    from ansys.aedt.core import Hfss
+
+    hfss = Hfss(project="MaterialSnapshot", design="Materials", non_graphical=True, new_desktop=True)
+    try:
+        MaterialSnapshot().export(hfss, sys.argv[1:] or None)
+    finally:
+        hfss.release_desktop(close_projects=True, close_desktop=True)
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from patch_design import c
+
+# Mesh-cost estimator for the radiation box and the smallest box that keeps
+# the results within tolerance of a stored convergence study.
+#
+#   estimator = MeshEstimator()
+#   estimator.estimate(dims, eps_r, f0)                     # tets, memory_gb, solve_s
+#   study = ConvergenceStudy("convergence_study.json")
+#   estimator.calibrate(study.runs, dims, eps_r, f0)        # fit to measured meshes
+#   recommend_margin(dims, eps_r, f0, study, estimator)     # margin in mm and its cost
+#   run_design(hfss, {**params, "air_margin": margin})
+#
+# The converged tetrahedra count is modelled per cubic wavelength of each
+# medium: air (λ0) and substrate (λ0 / sqrt(eps_r)), plus a fixed count for
+# the feed and patch edges. Memory grows linearly with tets and solve time as
+# tets**TIME_EXPONENT. A study (python mesh_estimator.py --run) solves the
+# same design at several margins and stores tets, memory, time, S11 and the
+# boresight axial ratio; the recommended margin is the smallest one below the
+# largest (reference) margin whose results, and those of every larger margin,
+# stay within tolerance of the reference. A study only applies to the design
+# it was solved for (material, f0, h, copper, W, L): a study of another design
+# is restarted by --run and ignored by recommend_margin.
+
+STUDY_FORMAT = 1
+
+# Parameters identifying the design a study was solved for
+DESIGN_KEYS = ("material_name", "f0", "h", "Cu_Thickness", "W", "L")
+
+AIR_TETS_PER_WL3 = 300          # converged tets per cubic free-space wavelength of air
+SUBSTRATE_TETS_PER_WL3 = 2000   # per cubic wavelength in the dielectric
+FIXED_TETS = 20_000             # feed, patch edges and truncations
+BYTES_PER_TET = 8_000           # solver memory per tet (second-order basis, direct solver)
+TIME_COEFFICIENT = 2e-5         # seconds for one tet**TIME_EXPONENT (adaptive passes included)
+TIME_EXPONENT = 1.3
+
+# Allowed deviation from the reference margin
+TOLERANCES = {
+    "f_res_GHz": 0.001,         # 1 MHz
+    "S11_f0_dB": 0.5,
+    "AR_boresight_dB": 0.3,
+}
+
+
+# Air and substrate volumes (mm³) of the radiation box around the patch
+def box_volumes(dims, air_margin=None):
+    m = dims["air_margin"] if air_margin is None else air_margin
+    box = (dims["W_sub"] + 2 * m) * (dims["L_sub"] + 2 * m) * (dims["patch_top"] + m)
+    substrate = dims["W_sub"] * dims["L_sub"] * dims["patch_top"]
+    return box - substrate, substrate
+
+
+def study_design(params):
+    return {k: params[k] for k in DESIGN_KEYS}
+
+
+class MeshEstimator:
+    def __init__(self, air_density=AIR_TETS_PER_WL3, substrate_density=SUBSTRATE_TETS_PER_WL3,
+                 fixed_tets=FIXED_TETS, bytes_per_tet=BYTES_PER_TET, time_coefficient=TIME_COEFFICIENT,
+                 time_exponent=TIME_EXPONENT):
+        self.air_density = air_density
+        self.substrate_density = substrate_density
+        self.fixed_tets = fixed_tets
+        self.bytes_per_tet = bytes_per_tet
+        self.time_coefficient = time_coefficient
+        self.time_exponent = time_exponent
+
+    # Volumes in cubic wavelengths of each medium
+    @staticmethod
+    def _wavelengths(dims, eps_r, f0, air_margin=None):
+        wl3 = (c / f0) ** 3
+        air, substrate = box_volumes(dims, air_margin)
+        return air / wl3, substrate * eps_r ** 1.5 / wl3
+
+    def tets(self, dims, eps_r, f0, air_margin=None):
+        air, substrate = self._wavelengths(dims, eps_r, f0, air_margin)
+        return int(self.air_density * air + self.substrate_density * substrate + self.fixed_tets)
+
+    def estimate(self, dims, eps_r, f0, air_margin=None):
+        tets = self.tets(dims, eps_r, f0, air_margin)
+        return {
+            "air_margin": dims["air_margin"] if air_margin is None else air_margin,
+            "tets": tets,
+            "memory_gb": tets * self.bytes_per_tet / 1e9,
+            "solve_s": self.time_coefficient * tets ** self.time_exponent,
+        }
+
+    # Least-squares fit of the densities, memory per tet and time law to measured runs
+    def calibrate(self, runs, dims, eps_r, f0):
+        runs = [r for r in runs if r.get("tets")]
+        if len(runs) >= 3:
+            a = np.array([[*self._wavelengths(dims, eps_r, f0, r["air_margin"]), 1.0] for r in runs])
+            coef, *_ = np.linalg.lstsq(a, np.array([r["tets"] for r in runs], dtype=float), rcond=None)
+            self.air_density, self.substrate_density, self.fixed_tets = (float(max(v, 0.0)) for v in coef)
+        memory = [r["memory_gb"] * 1e9 / r["tets"] for r in runs if r.get("memory_gb")]
+        if memory:
+            self.bytes_per_tet = float(np.mean(memory))
+        timed = [(r["tets"], r["solve_s"]) for r in runs if r.get("solve_s")]
+        if len(timed) >= 2 and len({t for t, _ in timed}) >= 2:
+            slope, intercept = np.polyfit(np.log([t for t, _ in timed]), np.log([s for _, s in timed]), 1)
+            self.time_exponent, self.time_coefficient = float(slope), float(np.exp(intercept))
+        return self
+
+
+class ConvergenceStudy:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".patch_design_cache", "convergence_study.json")
+        self.design = {}
+        self.runs = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") == STUDY_FORMAT:
+            self.design = data.get("design", {})
+            self.runs = data.get("runs", [])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": STUDY_FORMAT, "design": self.design, "runs": self.runs}, f, indent=1, default=float)
+        os.replace(tmp, self.path)
+
+    def add(self, run):
+        self.runs = [r for r in self.runs if r["air_margin"] != run["air_margin"]] + [run]
+        self.runs.sort(key=lambda r: r["air_margin"])
+        self.save()
+
+    # Deviation of every run from the largest margin, per quantity
+    def deviations(self):
+        if not self.runs:
+            return []
+        reference = self.runs[-1]
+        rows = []
+        for r in self.runs:
+            row = {"air_margin": r["air_margin"]}
+            for key in TOLERANCES:
+                if r.get(key) is not None and reference.get(key) is not None:
+                    row[key] = abs(r[key] - reference[key])
+            rows.append(row)
+        return rows
+
+    def matches(self, design):
+        return self.design == design
+
+    # Smallest margin below the reference from which every larger one stays
+    # within the tolerances; None with fewer than two runs
+    def converged_margin(self, tolerances=None):
+        tolerances = {**TOLERANCES, **(tolerances or {})}
+        margin = None
+        for row in reversed(self.deviations()[:-1]):
+            if any(row.get(k, 0.0) > tol for k, tol in tolerances.items()):
+                break
+            margin = row["air_margin"]
+        return margin
+
+
+# Smallest converged margin from the study (λ0/4 without one, or when the
+# study was solved for another design than params) and its cost next to the
+# λ0/4 default
+def recommend_margin(dims, eps_r, f0, study=None, estimator=None, tolerances=None, params=None):
+    from patch_pipeline import DEFAULT_PARAMS
+    estimator = estimator or MeshEstimator()
+    default = round(c / f0 / 4, 0)
+    design = study_design({**DEFAULT_PARAMS, "W": dims["W"], "L": dims["L"], **(params or {}), "f0": f0})
+    margin = None
+    source = "convergence study"
+    if study is not None and not study.matches(design):
+        source = "λ0/4 rule (study is for another design)"
+    elif study is not None:
+        margin = study.converged_margin(tolerances)
+    if margin is None:
+        margin = default
+        if source == "convergence study":
+            source = "λ0/4 rule (no converged study)"
+    best = estimator.estimate(dims, eps_r, f0, margin)
+    reference = estimator.estimate(dims, eps_r, f0, default)
+    return {
+        **best,
+        "source": source,
+        "default_margin": default,
+        "default_tets": reference["tets"],
+        "memory_saving": 1 - best["memory_gb"] / reference["memory_gb"],
+        "time_saving": 1 - best["solve_s"] / reference["solve_s"],
+    }
+
+
+# Total tets of the final mesh from an exported mesh statistics file
+def read_mesh_stats(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    column = None
+    for line in lines:
+        cells = [x.strip() for x in (line.split("|") if "|" in line else re.split(r"\s{2,}", line))]
+        if column is None and "Num Tets" in cells:
+            column = cells.index("Num Tets")
+        elif column is not None and cells and cells[0].lower() == "total" and len(cells) > column:
+            return int(float(cells[column]))
+    return None
+
+
+# Solve the design at every margin and store tets, time and results in the study
+def run_study(open_design, params, margins, study, cores=4):
+    from patch_pipeline import DEFAULT_PARAMS, run_design
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    design = study_design(params)
+    if study.runs and not study.matches(design):
+        print(f"♻️ Convergence study was solved for {study.design or 'an unknown design'}, starting over")
+        study.runs = []
+    study.design = design
+    for margin in margins:
+        hfss = open_design(margin)
+        try:
+            start = time.time()
+            result = run_design(hfss, {**params, "air_margin": margin}, cores=cores, report=False)
+            run = {"air_margin": margin, "solve_s": round(time.time() - start, 1),
+                   **{k: result.get(k) for k in TOLERANCES}}
+            stats = hfss.export_mesh_stats("Setup1")
+            run["tets"] = read_mesh_stats(stats) if stats else None
+            study.add(run)
+            print(f"✅ Margin {margin} mm: {run['tets']} tets in {run['solve_s']} s")
+        finally:
+            hfss.release_desktop(close_projects=True, close_desktop=True)
+    return study
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate mesh cost and recommend the radiation box margin.")
+    parser.add_argument("--study", help="Convergence study JSON (default: ~/.patch_design_cache)")
+    parser.add_argument("--run", nargs="+", type=float, metavar="MARGIN", help="Solve these margins (mm) first")
+    parser.add_argument("--eps-r", type=float, help="Substrate permittivity (default: the material snapshot)")
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--version", help="AEDT version, e.g. 2024.2")
+    args = parser.parse_args(argv)
+
+    from material_cache import MaterialSnapshot
+    from patch_pipeline import DEFAULT_PARAMS, read_material, patch_dimensions
+
+    params = dict(DEFAULT_PARAMS)
+    study = ConvergenceStudy(args.study)
+    if args.run:
+        from ansys.aedt.core import Hfss
+        run_study(lambda m: Hfss(project=f"Convergence_{m:g}mm", design="FR4PatchDesign", solution_type="Modal",
+                                 non_graphical=True, new_desktop=True, version=args.version),
+                  params, args.run, study, args.cores)
+
+    eps_r = args.eps_r or read_material(None, params["material_name"], MaterialSnapshot())["eps_r"]
+    dims = patch_dimensions(params, eps_r)
+    runs = study.runs if study.matches(study_design(params)) else []
+    estimator = MeshEstimator().calibrate(runs, dims, eps_r, params["f0"])
+
+    print(f"\n{'Margin (mm)':>12}{'Tets':>10}{'Memory (GB)':>13}{'Solve (s)':>11}")
+    for margin in sorted({r["air_margin"] for r in runs} | {dims["air_margin"]}):
+        e = estimator.estimate(dims, eps_r, params["f0"], margin)
+        print(f"{margin:>12g}{e['tets']:>10}{e['memory_gb']:>13.2f}{e['solve_s']:>11.0f}")
+
+    best = recommend_margin(dims, eps_r, params["f0"], study, estimator, params=params)
+    print(f"\n📌 Recommended air margin: {best['air_margin']:g} mm ({best['source']}), "
+          f"{best['tets']} tets vs {best['default_tets']} at {best['default_margin']:g} mm: "
+          f"{best['memory_saving']:.0%} less memory, {best['time_saving']:.0%} less solve time")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+import argparse
+import os
+import time
+
+from material_cache import MaterialSnapshot
+from patch_pipeline import (
+    DEFAULT_PARAMS,
+    SETUP_PROPS,
+    SWEEP,
+    read_material,
+    patch_dimensions,
+    build_geometry,
+    assign_excitations,
+    create_analysis,
+    post_process,
+    freq_str,
+)
+from sweep_scheduler import write_table
+
+# Multi-band GNSS design: one desktop, one project, one design per band.
+#
+#   python multiband.py --bands L1 L2 L5 --cores 8
+#   rows = run_bands(["L1", "L2", "L5"])
+#
+# Each band gets its own design (Patch_L1, ...): the hand-tuned L1 square
+# patch scaled to the band's center frequency, the shared setup template
+# (SETUP_PROPS) and a sweep of the SWEEP template re-centered on the band.
+# All designs are built first, then solved, then post-processed, and the
+# per-band results land in one combined table.
+
+BANDS = {
+    "L1": 1.57542e9,    # GPS L1 / Galileo E1
+    "L2": 1.22760e9,    # GPS L2
+    "L5": 1.17645e9,    # GPS L5 / Galileo E5a
+    "E6": 1.27875e9,    # Galileo E6
+    "B1I": 1.561098e9,  # BeiDou B1I
+    "G1": 1.602e9,      # GLONASS G1
+}
+
+# Hand-tuned L1 lengths scaled by f_L1 / f0 per band: the patch stays square for the
+# corner-truncated CP feed, which sits on the x centre line
+SCALED_PARAMS = ["W", "L", "truncation", "yf_trim"]
+
+TABLE_COLUMNS = ["band", "f0_GHz", "status", "S11_min_dB", "f_res_GHz", "S11_f0_dB", "AR_boresight_dB",
+                 "W", "L", "truncation", "xf_from_origin", "yf_from_origin"]
+
+
+# SWEEP template re-centered on f0, with the same relative span
+def band_sweep(f0, template=None):
+    template = template or SWEEP
+    ref = DEFAULT_PARAMS["f0"]
+    start = float(template["RangeStart"].replace("GHz", "")) * 1e9 / ref
+    stop = float(template["RangeEnd"].replace("GHz", "")) * 1e9 / ref
+    return {**template, "RangeStart": freq_str(f0 * start), "RangeEnd": freq_str(f0 * stop)}
+
+
+def band_params(band, params=None, overrides=None):
+    f0 = BANDS[band] if isinstance(band, str) else band
+    scale = DEFAULT_PARAMS["f0"] / f0
+    scaled = {k: round(DEFAULT_PARAMS[k] * scale, 3) for k in SCALED_PARAMS}
+    return {**DEFAULT_PARAMS, **scaled, "xf_from_origin": 0, **(params or {}),
+            **((overrides or {}).get(band, {})), "f0": f0}
+
+
+def _open_design(project, band, first, version=None, non_graphical=True):
+    from ansys.aedt.core import Hfss
+    return Hfss(
+        project=project,
+        design=f"Patch_{band}",
+        solution_type="Modal",
+        non_graphical=non_graphical,
+        new_desktop=first,
+        version=version
+    )
+
+
+def run_bands(bands=("L1", "L2", "L5"), params=None, overrides=None, project="GNSS_MultiBand", cores=4,
+              output_dir=None, version=None, non_graphical=True, setup_props=None, sweep=None,
+              materials=None, open_design=None):
+    output_dir = output_dir or os.path.join(os.getcwd(), "multiband_results")
+    materials = materials if materials is not None else MaterialSnapshot()
+    open_design = open_design or (lambda band, first: _open_design(project, band, first, version, non_graphical))
+    designs = []
+
+    # Build every band in the same project
+    for i, band in enumerate(bands):
+        p = band_params(band, params, overrides)
+        hfss = open_design(band, i == 0)
+        material = read_material(hfss, p["material_name"], materials)
+        dims = patch_dimensions(p, material["eps_r"])
+        build_geometry(hfss, p, dims)
+        assign_excitations(hfss)
+        create_analysis(hfss, p["f0"], setup_props or SETUP_PROPS, band_sweep(p["f0"], sweep))
+        designs.append({"band": band, "hfss": hfss, "params": p, "material": material, "dims": dims})
+        print(f"✅ {band}: design Patch_{band} built at {p['f0'] / 1e9:g} GHz")
+
+    # Solve, then export, band by band
+    for d in designs:
+        start = time.time()
+        try:
+            d["hfss"].analyze(cores=cores)
+            d["status"] = "ok"
+        except Exception as e:
+            d["status"] = f"failed: {e}"
+        d["solve_s"] = round(time.time() - start, 1)
+
+    rows = []
+    for d in designs:
+        dims = d["dims"]
+        row = {"band": d["band"], "f0_GHz": d["params"]["f0"] / 1e9, "status": d["status"], "solve_s": d["solve_s"]}
+        row.update({k: dims[k] for k in ("W", "L", "truncation", "xf_from_origin", "yf_from_origin")})
+        if d["status"] == "ok":
+            directory = os.path.join(output_dir, d["band"])
+            os.makedirs(directory, exist_ok=True)
+            try:
+                row.update(post_process(d["hfss"], d["params"], d["material"], dims, directory=directory,
+                                        report=not non_graphical))
+            except Exception as e:
+                row["status"] = f"failed: {e}"
+        rows.append(row)
+
+    designs[0]["hfss"].save_project()
+    return rows, designs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Design, build and solve a patch per GNSS band in one project.")
+    parser.add_argument("--bands", nargs="+", default=["L1", "L2", "L5"], choices=sorted(BANDS))
+    parser.add_argument("--project", default="GNSS_MultiBand")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "multiband_results"))
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--version", help="AEDT version, e.g. 2024.2")
+    parser.add_argument("--graphical", action="store_true", help="Open AEDT with its GUI")
+    parser.add_argument("--dry-run", action="store_true", help="Analytic dimensions per band only, no AEDT")
+    args = parser.parse_args(argv)
+
+    from batch_cli import format_table
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.dry_run:
+        snapshot = MaterialSnapshot()
+        rows = []
+        for band in args.bands:
+            p = band_params(band)
+            try:
+                material = read_material(None, p["material_name"], snapshot)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            dims = patch_dimensions(p, material["eps_r"])
+            rows.append({"band": band, "f0_GHz": p["f0"] / 1e9, "status": "dry-run",
+                         **{k: dims[k] for k in ("W", "L", "truncation", "xf_from_origin", "yf_from_origin")}})
+    else:
+        rows, designs = run_bands(args.bands, project=args.project, cores=args.cores, output_dir=args.output_dir,
+                                  version=args.version, non_graphical=not args.graphical)
+        designs[0]["hfss"].release_desktop(close_projects=True, close_desktop=True)
+
+    write_table(os.path.join(args.output_dir, "bands.csv"), rows)
+    print("\n" + format_table(rows, TABLE_COLUMNS) + "\n")
+    return 0 if all(r["status"] in ("ok", "dry-run") for r in rows) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
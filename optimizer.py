@@ -0,0 +1,158 @@
+import hashlib
+import json
+import math
+import os
+
+from patch_design import design_patch
+from patch_pipeline import DEFAULT_PARAMS
+from sweep_scheduler import SweepScheduler, worker_count
+
+# Closed-loop optimizer for W, L, corner truncation and feed point.
+#
+# Parallel compass (pattern) search: every iteration evaluates all 2n
+# neighbours x ± step_i in one HFSS batch, moves to the best improvement or
+# halves the steps when there is none. It starts from the analytic
+# transmission-line design instead of the hand-tuned constants, and every
+# successful evaluation is memoized (in memory and in memo_path), so restarts
+# and revisited points never re-solve. A failed evaluation (licence error,
+# solver crash, cancelled job) is only remembered for the current run and is
+# retried by the next one. Memo keys include a hash of the fixed parameters
+# (substrate, f0, h, copper, feed geometry...), so one memo file serves
+# several substrates without mixing their objectives.
+#
+#   opt = PatchOptimizer(eps_r=4.4, workers=4)
+#   best = opt.run()
+#
+# Objective: boresight axial ratio (dB) plus a penalty on S11 above -10 dB at f0.
+
+VARIABLES = ["W", "L", "truncation", "xf_from_origin", "yf_from_origin"]
+
+DEFAULT_STEPS = {"W": 1.0, "L": 1.0, "truncation": 1.0, "xf_from_origin": 1.0, "yf_from_origin": 1.0}
+MIN_STEPS = {"W": 0.05, "L": 0.05, "truncation": 0.05, "xf_from_origin": 0.05, "yf_from_origin": 0.05}
+
+
+def objective(result, s11_target_db=-10.0, penalty=1.0):
+    ar = result.get("AR_boresight_dB")
+    s11 = result.get("S11_f0_dB")
+    if result.get("status", "ok") != "ok" or ar is None or s11 is None:
+        return math.inf
+    return ar + penalty * max(0.0, s11 - s11_target_db)
+
+
+# Analytic W, L, truncation and feed point for the given substrate
+def analytic_start(params, eps_r):
+    design = design_patch(params["f0"], eps_r, params["h"], params["Cu_Thickness"])
+    return {v: round(float(design[v]), 3) for v in VARIABLES}
+
+
+class PatchOptimizer:
+    def __init__(self, eps_r, params=None, start=None, steps=None, min_steps=None, bounds=None,
+                 workers=2, cores_per_job=4, max_evaluations=200, memo_path=None,
+                 s11_target_db=-10.0, penalty=1.0, scheduler_options=None):
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.start = start or analytic_start(self.params, eps_r)
+        self.steps = {**DEFAULT_STEPS, **(steps or {})}
+        self.min_steps = {**MIN_STEPS, **(min_steps or {})}
+        self.bounds = bounds or {}
+        self.workers = workers
+        self.cores_per_job = cores_per_job
+        self.max_evaluations = max_evaluations
+        self.memo_path = memo_path or os.path.join(os.getcwd(), "optimizer_memo.json")
+        self.s11_target_db = s11_target_db
+        self.penalty = penalty
+        self.scheduler_options = scheduler_options or {}
+        self.context = hashlib.sha256(json.dumps(
+            {"eps_r": eps_r, **{k: v for k, v in self.params.items() if k not in VARIABLES}},
+            sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        self.memo = self._load_memo()
+        self.failed = {}
+        self.history = []
+        self.evaluations = 0
+
+    def _key(self, x):
+        return json.dumps([self.context] + [round(x[v], 4) for v in VARIABLES])
+
+    def _load_memo(self):
+        if os.path.exists(self.memo_path):
+            with open(self.memo_path, encoding="utf-8") as f:
+                memo = json.load(f)
+            # memo files of older versions also hold failed rows
+            return {key: row for key, row in memo.items() if row.get("status", "ok") == "ok"}
+        return {}
+
+    def _save_memo(self):
+        tmp = self.memo_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.memo, f, indent=1, default=str)
+        os.replace(tmp, self.memo_path)
+
+    def _clip(self, x):
+        for v, (lo, hi) in self.bounds.items():
+            x[v] = min(max(x[v], lo), hi)
+        return x
+
+    def _variant(self, x):
+        return {**{k: v for k, v in self.params.items() if k not in VARIABLES}, **{v: round(x[v], 4) for v in VARIABLES}}
+
+    def _row(self, x):
+        key = self._key(x)
+        return self.memo[key] if key in self.memo else self.failed[key]
+
+    # Evaluate a batch in parallel, skipping memoized points (objectives are
+    # recomputed from the stored results, so target and penalty may change)
+    def evaluate(self, scheduler, points):
+        pending = {}
+        for x in points:
+            key = self._key(x)
+            if key not in self.memo and key not in self.failed and key not in pending:
+                pending[key] = x
+        if pending:
+            rows = scheduler.run([self._variant(x) for x in pending.values()])
+            for key, row in zip(pending, rows):
+                row["objective"] = objective(row, self.s11_target_db, self.penalty)
+                if row.get("status", "ok") == "ok":
+                    self.memo[key] = row
+                else:
+                    self.failed[key] = row
+                self.history.append(row)
+            self.evaluations += len(pending)
+            self._save_memo()
+        return [objective(self._row(x), self.s11_target_db, self.penalty) for x in points]
+
+    def neighbours(self, x):
+        points = []
+        for v in VARIABLES:
+            for sign in (1, -1):
+                y = dict(x)
+                y[v] = x[v] + sign * self.steps[v]
+                points.append(self._clip(y))
+        return points
+
+    def run(self):
+        x = self._clip(dict(self.start))
+        workers = worker_count(2 * len(VARIABLES), self.cores_per_job,
+                               self.scheduler_options.get("core_budget"), self.workers)
+        options = {k: v for k, v in self.scheduler_options.items() if k != "core_budget"}
+
+        with SweepScheduler(workers, self.cores_per_job, **options) as scheduler:
+            f_x = self.evaluate(scheduler, [x])[0]
+            print(f"📌 Start {x}: objective {f_x:.3f}")
+
+            # Only this run's solves count against max_evaluations, not memo hits
+            while self.evaluations < self.max_evaluations:
+                candidates = self.neighbours(x)
+                values = self.evaluate(scheduler, candidates)
+                best = min(range(len(candidates)), key=values.__getitem__)
+                if values[best] < f_x:
+                    x, f_x = candidates[best], values[best]
+                    print(f"✅ Improved to {x}: objective {f_x:.3f}")
+                    continue
+
+                self.steps = {v: s / 2 for v, s in self.steps.items()}
+                if all(self.steps[v] < self.min_steps[v] for v in VARIABLES):
+                    break
+                print(f"🔎 No improvement, halving steps to {self.steps}")
+
+        best = {**x, **self._row(x), "objective": f_x}
+        print(f"✅ Optimum after {self.evaluations} evaluation(s): {x} (objective {f_x:.3f})")
+        return best
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from material_cache import MaterialSnapshot
+from patch_pipeline import (
+    DEFAULT_PARAMS,
+    read_material,
+    patch_dimensions,
+    build_geometry,
+    assign_excitations,
+    create_analysis,
+    post_process,
+)
+
+# Asyncio pipeline that hides post-processing behind the next solve.
+#
+#   rows = run_async(variants, project_dir="async_results")
+#
+# Each variant is its own project in one AEDT desktop. Its solve is submitted
+# non-blocking (analyze(blocking=False)) and polled, and as soon as it finishes
+# the next built design starts solving while the finished one is exported
+# (S11, far field, params.txt). Building the next design also overlaps the
+# running solve. AEDT calls are serialized on one thread (one gRPC session),
+# so a finished design waits with its export until the designs in flight have
+# submitted their solves. max_solves limits concurrent solves, max_pending the
+# designs in flight (3: one exporting, one solving, the next one building).
+# A design is done when its own setups report solutions; a design without
+# solutions once nothing runs on the desktop any more has failed, unless its
+# solve has not been seen running yet (AEDT can take a moment to register
+# it), which only fails after start_timeout.
+# Every project is closed, whether its design succeeded or not.
+
+
+class AsyncOrchestrator:
+    def __init__(self, cores=4, project_dir=None, max_solves=1, max_pending=3, poll_interval=2.0,
+                 version=None, port=50300, open_design=None, close_design=None, design_options=None,
+                 materials=None, start_timeout=60.0):
+        self.cores = cores
+        self.project_dir = project_dir or os.path.join(os.getcwd(), "async_results")
+        self.max_solves = max_solves
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.start_timeout = start_timeout
+        self.version = version
+        self.port = port
+        self.open_design = open_design or self._open_design
+        self.close_design = close_design or self._close_design
+        self.design_options = design_options or {}
+        self.materials = materials if materials is not None else MaterialSnapshot()
+        self.desktop = None
+        self.timeline = []
+        os.makedirs(self.project_dir, exist_ok=True)
+
+    # Default session: one warm non-graphical desktop, one project per variant
+    def _open_design(self, index, variant):
+        from ansys.aedt.core import Hfss
+        from desktop_pool import PooledDesktop
+        if self.desktop is None:
+            self.desktop = PooledDesktop(self.port, version=self.version)
+        return Hfss(
+            project=f"Async_{index:04d}",
+            design="FR4PatchDesign",
+            solution_type="Modal",
+            non_graphical=True,
+            new_desktop=False,
+            version=self.version,
+            port=self.port
+        )
+
+    def _close_design(self, hfss):
+        hfss.save_project()
+        hfss.close_project(save=False)
+
+    def close(self):
+        if self.desktop is not None:
+            self.desktop.close()
+            self.desktop = None
+
+    async def _aedt(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    def _mark(self, index, stage, start):
+        self.timeline.append({"index": index, "stage": stage, "start_s": start - self._t0,
+                              "end_s": time.perf_counter() - self._t0})
+
+    def _build(self, hfss, variant, directory):
+        params = {**DEFAULT_PARAMS, **{k: v for k, v in variant.items() if k != "name"}}
+        material = read_material(hfss, params["material_name"], self.materials)
+        dims = patch_dimensions(params, material["eps_r"])
+        if self.design_options.get("parametric"):
+            from parametric import build_parametric
+            build_parametric(hfss, params, dims)
+        else:
+            build_geometry(hfss, params, dims)
+        assign_excitations(hfss)
+        create_analysis(hfss, params["f0"])
+        return {"hfss": hfss, "params": params, "material": material, "dims": dims, "directory": directory}
+
+    def _post(self, design):
+        return post_process(design["hfss"], design["params"], design["material"], design["dims"],
+                            directory=design["directory"], report=False,
+                            local_far_field=self.design_options.get("local_far_field", False))
+
+    # Solved when this design's setups have solutions; the desktop-wide
+    # running flag only tells a running solve from a finished or failed one
+    def _solve_state(self, hfss):
+        if all(setup.is_solved for setup in hfss.setups):
+            return "solved"
+        return "running" if hfss.are_there_simulations_running else "idle"
+
+    async def _dequeue(self):
+        async with self._handoff:
+            self._queued -= 1
+            self._handoff.notify_all()
+
+    async def _wait_solved(self, hfss, submitted):
+        started = False
+        state = await self._aedt(self._solve_state, hfss)
+        while state != "solved":
+            started = started or state == "running"
+            if state == "idle" and started:
+                raise RuntimeError("solve finished without solutions")
+            if state == "idle" and time.perf_counter() - submitted > self.start_timeout:
+                raise RuntimeError(f"solve did not start within {self.start_timeout:g} s")
+            await asyncio.sleep(self.poll_interval)
+            state = await self._aedt(self._solve_state, hfss)
+
+    # A design in flight that has not submitted its solve yet goes first: its
+    # build and analyze are queued on the AEDT thread before this design's export
+    async def _wait_for_next_solve(self):
+        async with self._handoff:
+            await self._handoff.wait_for(lambda: self._queued == 0 or self._solving >= self.max_solves)
+
+    def _close(self, index, hfss):
+        try:
+            self.close_design(hfss)
+        except Exception as e:
+            print(f"❌ Failed to close the project of design {index}: {e}")
+
+    async def _run_one(self, index, variant):
+        row = {"index": index, **variant}
+        start = time.perf_counter()
+        async with self._pending:
+            hfss = None
+            queued = True
+            self._queued += 1
+            try:
+                directory = os.path.join(self.project_dir, f"Async_{index:04d}")
+                os.makedirs(directory, exist_ok=True)
+
+                t = time.perf_counter()
+                hfss = await self._aedt(self.open_design, index, variant)
+                design = await self._aedt(self._build, hfss, variant, directory)
+                self._mark(index, "build", t)
+
+                async with self._solves:
+                    self._solving += 1
+                    try:
+                        t = time.perf_counter()
+                        try:
+                            await self._aedt(hfss.analyze, cores=self.cores, blocking=False)
+                        finally:
+                            queued = False
+                            await self._dequeue()
+                        await self._wait_solved(hfss, t)
+                        self._mark(index, "solve", t)
+                    finally:
+                        self._solving -= 1
+
+                # Solve slot is free again: the next design solves while this one exports
+                await self._wait_for_next_solve()
+                t = time.perf_counter()
+                row.update(await self._aedt(self._post, design))
+                self._mark(index, "post", t)
+                row["status"] = "ok"
+            except Exception as e:
+                row["status"] = f"failed: {e}"
+            finally:
+                if queued:
+                    await self._dequeue()
+                if hfss is not None:
+                    await self._aedt(self._close, index, hfss)
+        row["elapsed_s"] = round(time.perf_counter() - start, 1)
+        print(f"{'✅' if row['status'] == 'ok' else '❌'} Design {index} {row['status']} ({row['elapsed_s']} s)")
+        return row
+
+    async def run(self, variants):
+        self._t0 = time.perf_counter()
+        self._solves = asyncio.Semaphore(self.max_solves)
+        self._pending = asyncio.Semaphore(self.max_pending)
+        self._handoff = asyncio.Condition()
+        self._queued = 0
+        self._solving = 0
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="aedt") as self._executor:
+            rows = await asyncio.gather(*(self._run_one(i, v) for i, v in enumerate(variants)))
+        return list(rows)
+
+
+def run_async(variants, **kwargs):
+    orchestrator = AsyncOrchestrator(**kwargs)
+    try:
+        return asyncio.run(orchestrator.run(variants))
+    finally:
+        orchestrator.close()
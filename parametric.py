@@ -0,0 +1,230 @@
+import os
+import re
+
+from patch_pipeline import (
+    DEFAULT_PARAMS,
+    read_material,
+    patch_dimensions,
+    patch_plan,
+    assign_excitations,
+    create_analysis,
+    post_process,
+)
+
+# Parametric build: every dimension is an AEDT design variable and the
+# geometry is built from expressions of them, so a variant is a variable
+# change (or an Optimetrics sweep) instead of a rebuild.
+#
+#   variables = build_parametric(hfss, params, dims)    # hfss["W"] = "45mm", ...
+#   apply_variant(hfss, {"W": 44.5, "truncation": 5.5})
+#   parametric_sweep(hfss, {"W": (44, 46, 0.5), "L": (44, 46, 0.5)})
+#   rows = run_variants(hfss, [{"W": 44.5}, {"W": 45.5, "truncation": 5}])
+#
+# Solved variations stay in the project, so revisiting one does not re-solve
+# (run_variants also reuses the results of a repeated variant). The
+# Optimetrics sweep copies meshes between geometrically equivalent variations
+# (CopyMesh); AEDT only reuses a mesh on identical geometry, so a variation
+# of a dimension is still meshed from scratch.
+
+# Design variable -> patch_dimensions key (all lengths in mm)
+VARIABLES = {
+    "W": "W",
+    "L": "L",
+    "h": "h",
+    "Cu_Thickness": "Cu_Thickness",
+    "truncation": "truncation",
+    "feed_x": "xf_from_origin",
+    "feed_y": "yf_from_origin",
+    "Coax_h": "Coax_h",
+    "Coax_R": "Coax_R",
+    "Coax_pin_R": "Coax_pin_R",
+    "air_margin": "air_margin",
+}
+
+# Derived variables, kept as expressions so they follow W, L, h, ...
+DERIVED = {
+    "W_sub": "2*W",
+    "L_sub": "2*L",
+    "patch_top": "Cu_Thickness + h + Cu_Thickness",
+}
+
+UNITS = "mm"
+
+
+# String expression that composes with +, -, *, / like the numbers patch_plan uses
+class Expr(str):
+    @staticmethod
+    def _term(v):
+        return v if isinstance(v, Expr) else Expr(f"{v:.12g}{UNITS}")
+
+    def __add__(self, other):
+        return Expr(f"({self} + {self._term(other)})")
+
+    def __radd__(self, other):
+        return Expr(f"({self._term(other)} + {self})")
+
+    def __sub__(self, other):
+        return Expr(f"({self} - {self._term(other)})")
+
+    def __rsub__(self, other):
+        return Expr(f"({self._term(other)} - {self})")
+
+    def __neg__(self):
+        return Expr(f"(-{self})")
+
+    def __mul__(self, k):
+        return Expr(f"({self}*{k})")
+
+    def __rmul__(self, k):
+        return Expr(f"({k}*{self})")
+
+    def __truediv__(self, k):
+        return Expr(f"({self}/{k})")
+
+
+def _dims_value(params, dims, key):
+    return dims[key] if key in dims else params[key]
+
+
+# Independent variables with their current values, then the derived ones
+def design_variables(params, dims):
+    variables = {name: f"{float(_dims_value(params, dims, key)):.12g}{UNITS}" for name, key in VARIABLES.items()}
+    variables.update(DERIVED)
+    return variables
+
+
+def assign_variables(hfss, variables):
+    for name, value in variables.items():
+        hfss[name] = value
+
+
+# patch_plan fed with expressions instead of numbers
+def parametric_plan(params, dims):
+    v = {name: Expr(name) for name in list(VARIABLES) + list(DERIVED)}
+    expr_params = {**params, "h": v["h"], "Cu_Thickness": v["Cu_Thickness"]}
+    expr_dims = {
+        **dims,
+        "W": v["W"],
+        "L": v["L"],
+        "W_sub": v["W_sub"],
+        "L_sub": v["L_sub"],
+        "W_half": v["W"] / 2,
+        "L_half": v["L"] / 2,
+        "W_sub_half": v["W_sub"] / 2,
+        "L_sub_half": v["L_sub"] / 2,
+        "truncation": v["truncation"],
+        "xf_from_origin": v["feed_x"],
+        "yf_from_origin": v["feed_y"],
+        "Coax_h": v["Coax_h"],
+        "Coax_R": v["Coax_R"],
+        "Coax_pin_R": v["Coax_pin_R"],
+        "patch_top": v["patch_top"],
+        "air_margin": v["air_margin"],
+        "rad_x_origin": -v["W_sub"] / 2 - v["air_margin"],
+        "rad_y_origin": -v["L_sub"] / 2 - v["air_margin"],
+        "rad_z_origin": 0,
+        "rad_x_size": v["W_sub"] + 2 * v["air_margin"],
+        "rad_y_size": v["L_sub"] + 2 * v["air_margin"],
+        "rad_z_size": v["patch_top"] + v["air_margin"],
+    }
+    return patch_plan(expr_params, expr_dims)
+
+
+def build_parametric(hfss, params, dims):
+    variables = design_variables(params, dims)
+    assign_variables(hfss, variables)
+    parametric_plan(params, dims).execute(hfss)
+    print(f"✅ Parametric geometry built on {len(VARIABLES)} design variables")
+    return variables
+
+
+def _variable_name(key):
+    if key in VARIABLES:
+        return key
+    for name, dims_key in VARIABLES.items():
+        if dims_key == key:
+            return name
+    raise KeyError(f"{key!r} is not a design variable ({', '.join(VARIABLES)})")
+
+
+# Value in mm of a variable value ("44.5mm"), None for an expression
+def _mm(value):
+    m = re.fullmatch(rf"\s*([-+0-9.eE]+)\s*{UNITS}\s*", value)
+    return float(m.group(1)) if m else None
+
+
+def _variant_values(variant):
+    return {_variable_name(key): value if isinstance(value, str) else f"{float(value):.12g}{UNITS}"
+            for key, value in variant.items()}
+
+
+# Set design variables from a variant ({"W": 44.5, "xf_from_origin": 0.2, ...})
+def apply_variant(hfss, variant):
+    applied = _variant_values(variant)
+    assign_variables(hfss, applied)
+    return applied
+
+
+# Native Optimetrics sweep over {variable: (start, stop, step)}; the ranges
+# combine as a full grid and are solved as one parametric setup. copy_mesh
+# reuses the mesh of geometrically equivalent variations; fields of the
+# variations are only kept with save_fields.
+def parametric_sweep(hfss, ranges, name="ParametricSetup1", solution="Setup1 : Sweep", analyze=False, cores=4,
+                     copy_mesh=True, save_fields=False):
+    sweep = None
+    for key, (start, stop, step) in ranges.items():
+        variable = _variable_name(key)
+        if sweep is None:
+            sweep = hfss.parametrics.add(variable, start, stop, step, variation_type="LinearStep",
+                                         solution=solution, name=name)
+        else:
+            sweep.add_variation(variable, start, stop, step, unit=UNITS, variation_type="LinearStep")
+    sweep.props["ProdOptiSetupDataV2"] = {"SaveFields": save_fields, "CopyMesh": copy_mesh,
+                                          "SolveWithCopiedMeshOnly": True}
+    sweep.update()
+    if analyze:
+        hfss.analyze_setup(name, cores=cores)
+    print(f"✅ Parametric sweep {name} over {', '.join(ranges)}")
+    return sweep
+
+
+# Build once, then solve and post-process each variant by changing variables
+# only. Variables a variant leaves out are at their nominal value, in the
+# solved geometry as well as in its params.txt and results (changing L does
+# not move the feed). Each variant exports into <directory>/variant_<i>; a
+# variant equal to an earlier one reuses its results without solving.
+def run_variants(hfss, variants, params=None, cores=4, directory=None, report=False, materials=None):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    material = read_material(hfss, params["material_name"], materials)
+    variables = build_parametric(hfss, params, patch_dimensions(params, material["eps_r"]))
+    assign_excitations(hfss)
+    create_analysis(hfss, params["f0"])
+
+    nominal = {name: variables[name] for name in VARIABLES}
+    current = dict(nominal)
+    rows = []
+    solved = {}
+    for i, variant in enumerate(variants):
+        target = {**nominal, **_variant_values(variant)}
+        assign_variables(hfss, {name: value for name, value in target.items() if current[name] != value})
+        current = target
+        applied = {name: value for name, value in target.items() if nominal[name] != value}
+        variation = tuple(sorted(target.items()))
+        if variation in solved:
+            print(f"♻️ Variant {i}: same variables as variant {solved[variation]['index']}, reusing its results")
+            rows.append({**solved[variation], "index": i, **variant})
+            continue
+        # params of the solved geometry: omitted variables (the feed too) stay nominal
+        variant_params = dict(params)
+        for name, value in target.items():
+            if _mm(value) is not None:
+                variant_params[VARIABLES[name]] = _mm(value)
+        dims = patch_dimensions(variant_params, material["eps_r"])
+        out = os.path.join(directory or hfss.working_directory, f"variant_{i}")
+        os.makedirs(out, exist_ok=True)
+        print(f"🚀 Variant {i}: {applied}")
+        hfss.analyze(cores=cores)
+        result = post_process(hfss, variant_params, material, dims, directory=out, report=report)
+        rows.append({"index": i, **variant, **result})
+        solved[variation] = rows[-1]
+    return rows
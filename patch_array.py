@@ -0,0 +1,209 @@
+import os
+import re
+import tempfile
+
+from geometry_plan import GeometryPlan
+from patch_pipeline import (
+    DEFAULT_PARAMS,
+    ELEMENT_PARTS,
+    read_material,
+    patch_dimensions,
+    add_patch_element,
+    assign_radiation,
+)
+from patch_design import c
+
+# N×M array of the single patch, built with native duplication.
+#
+#   array = PatchArray(nx=16, ny=16, sequential_rotation=True)
+#   array.build(hfss, params, dims)        # constant number of AEDT calls in N×M
+#   ports = array.assign_ports(hfss)       # one wave port per element, one AEDT call
+#   array.apply_feed_phases(hfss, ports)   # 0/90/180/270° for sequential rotation
+#
+# The unit cell (one element, or a 2×2 sequentially rotated sub-array) is
+# built once with a GeometryPlan, then copied with two DuplicateAlongLine
+# calls (x, then y). Every clone keeps its source name as prefix, so the
+# rotation group of each port is known from its name without geometry
+# queries. The probe and clearance holes of all elements are subtracted from
+# the shared substrate and ground in one call each. The wave ports are
+# assigned by one IronPython script run inside the desktop (oDesktop.RunScript,
+# as in face_index.py); without RunScript they fall back to one AssignWavePort
+# call per element, O(N×M) round trips.
+
+PORT_SCRIPT = """\
+oProject = oDesktop.SetActiveProject({project!r})
+oDesign = oProject.SetActiveDesign({design!r})
+oModule = oDesign.GetModule("BoundarySetup")
+for args in {ports!r}:
+    oModule.AssignWavePort(args)
+"""
+
+
+def _selections(names):
+    return ["NAME:Selections", "Selections:=", ",".join(names), "NewPartsModelFlag:=", "Model"]
+
+
+class PatchArray:
+    def __init__(self, nx=4, ny=4, pitch_x=None, pitch_y=None, sequential_rotation=False, f0=None):
+        f0 = f0 or DEFAULT_PARAMS["f0"]
+        self.nx = nx
+        self.ny = ny
+        self.pitch_x = pitch_x or round(c / f0 / 2, 3)     # λ0/2
+        self.pitch_y = pitch_y or self.pitch_x
+        self.sequential_rotation = sequential_rotation
+        if sequential_rotation:
+            if nx % 2 or ny % 2:
+                raise ValueError("Sequential rotation needs an even number of elements along x and y")
+            if self.pitch_x != self.pitch_y:
+                raise ValueError("Sequential rotation needs a square lattice (pitch_x == pitch_y)")
+        self.rpc_count = 0
+
+    # Unit cell size in elements and its elements as (suffix, offset, rotation)
+    def unit_cell(self):
+        if not self.sequential_rotation:
+            return 1, [("", (0, 0), 0)]
+        p = (-self.pitch_x / 2, -self.pitch_y / 2)
+        return 2, [(f"_r{k}", p, k) for k in range(4)]
+
+    def size(self, dims):
+        return self.nx * self.pitch_x, self.ny * self.pitch_y
+
+    def plan(self, params, dims):
+        material_name = params["material_name"]
+        h = params["h"]
+        Cu_Thickness = params["Cu_Thickness"]
+        cell, elements = self.unit_cell()
+        W_sub, L_sub = self.size(dims)
+        margin = dims["air_margin"]
+
+        # First unit cell at the lower-left corner of an array centered on the origin
+        origin = (-(self.nx / cell - 1) * cell * self.pitch_x / 2, -(self.ny / cell - 1) * cell * self.pitch_y / 2)
+
+        plan = GeometryPlan()
+        plan.box("Substrate", [-W_sub / 2, -L_sub / 2, Cu_Thickness], [W_sub, L_sub, h],
+                 material=material_name, color=[143, 175, 175], transparency=0.4)
+        plan.box("Ground", [-W_sub / 2, -L_sub / 2, 0], [W_sub, L_sub, Cu_Thickness],
+                 material="copper", color=[0, 255, 128], transparency=0.06)
+        for suffix, offset, rotation in elements:
+            add_patch_element(plan, params, dims, suffix=suffix, offset=offset, rotation=rotation, origin=origin)
+        plan.box("AirBox",
+                 [-W_sub / 2 - margin, -L_sub / 2 - margin, 0],
+                 [W_sub + 2 * margin, L_sub + 2 * margin, dims["patch_top"] + margin],
+                 material="air", color=[0, 0, 0], transparency=0.95)
+        return plan
+
+    def _call(self, method, *args):
+        self.rpc_count += 1
+        return method(*args)
+
+    def _element_objects(self, hfss):
+        self._call(hfss.modeler.refresh_all_ids)
+        return [n for n in hfss.modeler.object_names if any(n.startswith(part) for part in ELEMENT_PARTS)]
+
+    def _duplicate(self, oeditor, names, dx, dy, count):
+        self._call(
+            oeditor.DuplicateAlongLine,
+            _selections(names),
+            ["NAME:DuplicateToAlongLineParameters", "CreateNewObjects:=", True,
+             "XComponent:=", f"{dx:.12g}mm", "YComponent:=", f"{dy:.12g}mm", "ZComponent:=", "0mm",
+             "NumClones:=", str(count)],
+            ["NAME:Options", "DuplicateAssignments:=", False],
+            ["CreateGroupsForNewObjects:=", False],
+        )
+
+    def build(self, hfss, params, dims):
+        self.rpc_count = self.plan(params, dims).execute(hfss)
+        oeditor = hfss.modeler.oeditor
+        cell, _ = self.unit_cell()
+        cells_x, cells_y = self.nx // cell, self.ny // cell
+
+        # Replicate the unit cell along x, then the whole row along y
+        if cells_x > 1:
+            self._duplicate(oeditor, self._element_objects(hfss), cell * self.pitch_x, 0, cells_x)
+        if cells_y > 1:
+            self._duplicate(oeditor, self._element_objects(hfss), 0, cell * self.pitch_y, cells_y)
+
+        # All probe and clearance holes in one subtract each
+        objects = self._element_objects(hfss)
+        for blank, tool in (("Substrate", "SubstrateHole"), ("Ground", "Hole3D")):
+            self._call(
+                oeditor.Subtract,
+                ["NAME:Selections", "Blank Parts:=", blank,
+                 "Tool Parts:=", ",".join(n for n in objects if n.startswith(tool))],
+                ["NAME:SubtractParameters", "KeepOriginals:=", False],
+            )
+        self._call(hfss.modeler.refresh_all_ids)
+        print(f"✅ {self.nx}×{self.ny} array built in {self.rpc_count} AEDT calls")
+        return self.rpc_count
+
+    @staticmethod
+    def _port_args(port):
+        return [
+            f"NAME:{port}",
+            "Objects:=", [port],
+            "NumModes:=", 1,
+            "UseLineModeAlignment:=", False,
+            "DoDeembed:=", False,
+            "RenormalizeAllTerminals:=", True,
+            ["NAME:Modes", ["NAME:Mode1", "ModeNum:=", 1, "UseIntLine:=", False, "CharImp:=", "Zpi"]],
+            "ShowReporterFilter:=", False,
+            "ReporterFilter:=", [True],
+            "UseAnalyticAlignment:=", False,
+        ]
+
+    def _run_port_script(self, hfss, ports):
+        fd, script = tempfile.mkstemp(prefix="array_ports_", suffix=".py")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(PORT_SCRIPT.format(project=hfss.project_name, design=hfss.design_name,
+                                           ports=[self._port_args(p) for p in ports]))
+            self._call(hfss.odesktop.RunScript, script)
+        finally:
+            os.remove(script)
+
+    # One modal wave port per element port sheet, no per-port face lookups:
+    # all in one RunScript call, else (bulk=False or no RunScript) one
+    # AssignWavePort call per port
+    def assign_ports(self, hfss, bulk=True):
+        ports = sorted(n for n in hfss.modeler.object_names if n.startswith("Port"))
+        calls = self.rpc_count
+        assigned = False
+        if bulk:
+            try:
+                self._run_port_script(hfss, ports)
+                assigned = True
+            except Exception as e:
+                print(f"♻️ Bulk port assignment unavailable ({e}), assigning ports one by one")
+        if not assigned:
+            for port in ports:
+                self._call(hfss.oboundary.AssignWavePort, self._port_args(port))
+        print(f"✅ {len(ports)} wave ports assigned in {self.rpc_count - calls} AEDT call(s)")
+        return ports
+
+    # Sequential rotation: element rotated by k·90° is fed with k·90° phase
+    def feed_phases(self, ports):
+        phases = {}
+        for port in ports:
+            m = re.search(r"_r(\d)", port)
+            k = int(m.group(1)) if m and self.sequential_rotation else 0
+            phases[f"{port}:1"] = ("1W", f"{90 * k}deg")
+        return phases
+
+    def apply_feed_phases(self, hfss, ports):
+        phases = self.feed_phases(ports)
+        self._call(hfss.edit_sources, phases)
+        return phases
+
+
+# Material, dimensions, array geometry, radiation boundary, ports and feed phases
+def build_array(hfss, params=None, nx=4, ny=4, pitch_x=None, pitch_y=None, sequential_rotation=False,
+                materials=None):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    material = read_material(hfss, params["material_name"], materials)
+    dims = patch_dimensions(params, material["eps_r"])
+    array = PatchArray(nx, ny, pitch_x, pitch_y, sequential_rotation, params["f0"])
+    array.build(hfss, params, dims)
+    assign_radiation(hfss)
+    ports = array.assign_ports(hfss)
+    array.apply_feed_phases(hfss, ports)
+    return array, ports
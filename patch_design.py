@@ -0,0 +1,91 @@
+import numpy as np
+
+# Constants
+c = 3e11  # Speed of light in mm/s (converted to mm/s from m/s)
+
+
+# Vectorized transmission-line model of a rectangular microstrip patch.
+#
+# f0, eps_r, h and Cu_Thickness may be scalars or NumPy arrays of any
+# broadcast-compatible shape (f0 in Hz, lengths in mm), so a whole batch of
+# design points (bands x substrate stacks) is evaluated in one call.
+# Every returned value is an array with the broadcast shape.
+#
+# The substrate footprint is substrate_scale * patch + substrate_margin * h:
+#   create_fr4_patch.py -> substrate_scale=2, substrate_margin=0
+#   create_box.py       -> substrate_scale=1, substrate_margin=6
+def design_patch(f0, eps_r, h, Cu_Thickness=0.0, substrate_scale=2.0, substrate_margin=0.0):
+    f0 = np.asarray(f0, dtype=float)
+    eps_r = np.asarray(eps_r, dtype=float)
+    h = np.asarray(h, dtype=float)
+    Cu_Thickness = np.asarray(Cu_Thickness, dtype=float)
+
+    # Patch Width (W)
+    W = (c / (2 * f0)) * np.sqrt(2 / (eps_r + 1))
+
+    # Effective dielectric constant (εeff)
+    eps_eff = ((eps_r + 1) / 2) + (((eps_r - 1) / 2) * ((1 + (12 * h / W)) ** -0.5))
+    sqrt_eps_eff = np.sqrt(eps_eff)
+
+    # Effective Length (Leff)
+    Leff = c / (2 * f0 * sqrt_eps_eff)
+
+    # Length extension due to fringing (ΔL)
+    W_h = W / h
+    delta_L = (0.412 * h) * (((eps_eff + 0.3) * (W_h + 0.264)) / ((eps_eff - 0.258) * (W_h + 0.8)))
+
+    # Actual Patch Length (L)
+    L = Leff - 2 * delta_L
+
+    # Substrate size
+    W_sub = substrate_scale * W + substrate_margin * h
+    L_sub = substrate_scale * L + substrate_margin * h
+
+    # Feed point location (for coax-fed), measured from the patch corner
+    xf = W / 2
+    yf = L / (2 * sqrt_eps_eff)
+
+    # Corner truncation (for RHCP)
+    truncation = L * np.sqrt((4 * f0 * h) / (2 * c * np.sqrt(eps_r)))
+
+    # Free-space wavelength and λ/4 radiation box padding
+    lambda_0 = c / f0
+    air_margin = lambda_0 / 4
+    patch_top = Cu_Thickness + h + Cu_Thickness
+
+    return {
+        "W": W,
+        "L": L,
+        "eps_eff": eps_eff,
+        "Leff": Leff,
+        "delta_L": delta_L,
+        "W_sub": W_sub,
+        "L_sub": L_sub,
+        "xf": xf,
+        "yf": yf,
+        "xf_from_origin": xf - W / 2,
+        "yf_from_origin": yf - L / 2,
+        "truncation": truncation,
+        "lambda_0": lambda_0,
+        "air_margin": air_margin,
+        "patch_top": patch_top,
+        "rad_x_size": W_sub + 2 * air_margin,
+        "rad_y_size": L_sub + 2 * air_margin,
+        "rad_z_size": patch_top + air_margin,
+    }
+
+
+# Cartesian product of the swept inputs, flattened so design_patch() sees one
+# candidate per element. Returns the flat input columns alongside the results.
+def design_grid(f0, eps_r, h, Cu_Thickness=0.0, **kwargs):
+    grids = np.meshgrid(
+        np.atleast_1d(np.asarray(f0, dtype=float)),
+        np.atleast_1d(np.asarray(eps_r, dtype=float)),
+        np.atleast_1d(np.asarray(h, dtype=float)),
+        np.atleast_1d(np.asarray(Cu_Thickness, dtype=float)),
+        indexing="ij",
+    )
+    f0, eps_r, h, Cu_Thickness = (g.ravel() for g in grids)
+    result = design_patch(f0, eps_r, h, Cu_Thickness, **kwargs)
+    result.update({"f0": f0, "eps_r": eps_r, "h": h, "Cu_Thickness": Cu_Thickness})
+    return result
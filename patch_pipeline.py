@@ -0,0 +1,571 @@
+import os
+import math
+
+import numpy as np
+
+from farfield import FarField, export_far_field
+from geometry_plan import GeometryPlan
+from patch_design import c, design_patch
+from solution_batch import SolutionBatch
+
+# Hand-tuned single patch from create_fr4_patch.py. Set W, L, truncation,
+# xf_from_origin or yf_from_origin to None to use the analytic value instead.
+# An optional "air_margin" (mm) replaces the λ/4 radiation box padding.
+DEFAULT_PARAMS = {
+    "material_name": "FR4_epoxy",
+    "f0": 1.57542e9,        # Center frequency in Hz
+    "h": 1.6,               # Substrate thickness in millimeters
+    "Cu_Thickness": 0.035,  # Copper thickness in millimeters
+    "W": 45,
+    "L": 45,
+    "truncation": 6,
+    "xf_from_origin": None,
+    "yf_from_origin": None,
+    "yf_trim": -2.3873,     # Hand-tuned correction on the rounded analytic feed offset
+    "Coax_h": 5,
+    "Coax_R": 1.6,
+    "Coax_pin_R": 0.8,
+}
+
+# Objects making up one patch element (see add_patch_element)
+ELEMENT_PARTS = ["SubstrateHole", "Hole3D", "Patch", "Coax", "Coax_Pin", "Probe", "Port"]
+
+SETUP_PROPS = {
+    "MaximumPasses": 20,
+    "DeltaS": 0.02,
+}
+
+SWEEP = {
+    "name": "Sweep",
+    "sweep_type": "fast",
+    "RangeType": "LinearCount",
+    "RangeStart": "1.54GHz",
+    "RangeEnd": "1.58GHz",
+    "RangeCount": 2001,
+    "SaveFields": True,
+    "SaveRadFields": True,
+}
+
+SPHERE = {
+    "definition": "Theta-Phi",
+    "x_start": -180,   # Theta start
+    "x_stop": 180,     # Theta stop
+    "x_step": 10,      # Theta step
+    "y_start": 0,      # Phi start
+    "y_stop": 360,     # Phi stop
+    "y_step": 10,      # Phi step
+    "units": "deg",
+    "name": "InfiniteSphere1",
+}
+
+# CSV file of each extracted quantity (others: <name>.csv)
+OUTPUT_FILES = {
+    "S11": "S11.csv",
+    "AR": "AxialRatio_vs_Theta.csv",
+}
+
+
+def freq_str(f):
+    return f"{f / 1e9:g}GHz"
+
+
+# Read the substrate properties from the live material library. With a
+# MaterialSnapshot the local copy answers first and the live library is only
+# read (and snapshotted) on a miss; hfss may then be None for offline use.
+def read_material(hfss, material_name, snapshot=None):
+    if snapshot is not None:
+        if hfss is not None:
+            snapshot.validate(getattr(hfss, "aedt_version_id", None))
+        cached = snapshot.get(material_name)
+        if cached is not None:
+            return cached
+        if hfss is None:
+            raise ValueError(f"Material {material_name} not found in the material snapshot {snapshot.path} "
+                             f"(export it with: python material_cache.py \"{material_name}\").")
+
+    if not hfss.materials.exists_material(material_name):
+        raise ValueError(f"Material {material_name} not found in the material library.")
+    material = hfss.materials[material_name]
+    properties = {
+        "eps_r": float(material.permittivity.value),         # Dielectric constant
+        "tan_d": material.dielectric_loss_tangent.value,     # Loss tangent
+        "mu_r": material.permeability.value,                 # Magnetic permeability
+        "sigma": material.conductivity.value,                # Conductivity (for conductors)
+    }
+    if snapshot is not None:
+        snapshot.put(material_name, properties, getattr(hfss, "aedt_version_id", None))
+    return properties
+
+
+# Every dimension used to build the single patch, rounded like the original script
+def patch_dimensions(params, eps_r):
+    f0 = params["f0"]
+    h = params["h"]
+    Cu_Thickness = params["Cu_Thickness"]
+    design = {k: float(v) for k, v in design_patch(f0, eps_r, h, Cu_Thickness).items()}
+    eps_eff = design["eps_eff"]
+
+    W = design["W"] if params.get("W") is None else params["W"]
+    L = design["L"] if params.get("L") is None else params["L"]
+
+    # Substrate size (based on 2 times the Patch dimensions)
+    W_sub = round(2 * W, 3)
+    L_sub = round(2 * L, 3)
+
+    # Corner truncation (for RHCP)
+    truncation = params.get("truncation")
+    if truncation is None:
+        truncation = round(L * (math.sqrt((4 * f0 * h) / (2 * c * math.sqrt(eps_r)))), 0)
+
+    # Feed point location (for coax-fed)
+    xf = round(W / 2, 3)
+    # Estimate y-offset using approximate equation
+    yf = round(L / (2 * math.sqrt(eps_eff)), 3)
+
+    W = round(W, 3)
+    L = round(L, 3)
+    W_half = round(W / 2, 3)
+    L_half = round(L / 2, 3)
+
+    xf_from_origin = params.get("xf_from_origin")
+    if xf_from_origin is None:
+        xf_from_origin = round(xf - W_half, 3)
+    yf_from_origin = params.get("yf_from_origin")
+    if yf_from_origin is None:
+        yf_from_origin = round(yf - L_half, 0) + params.get("yf_trim", 0)
+
+    patch_top = Cu_Thickness + h + Cu_Thickness
+    lambda_0 = c / f0  # Free-space wavelength in mm
+    air_margin = params.get("air_margin")
+    if air_margin is None:
+        air_margin = round(lambda_0 / 4, 0)  # λ/4 padding (see mesh_estimator.recommend_margin)
+
+    return {
+        "eps_eff": eps_eff,
+        "W": W,
+        "L": L,
+        "W_sub": W_sub,
+        "L_sub": L_sub,
+        "W_half": W_half,
+        "L_half": L_half,
+        "W_sub_half": round(W_sub / 2, 3),
+        "L_sub_half": round(L_sub / 2, 3),
+        "truncation": truncation,
+        "xf_from_origin": xf_from_origin,
+        "yf_from_origin": yf_from_origin,
+        "Coax_h": params["Coax_h"],
+        "Coax_R": params["Coax_R"],
+        "Coax_pin_R": params["Coax_pin_R"],
+        "patch_top": patch_top,
+        "air_margin": air_margin,
+        # Radiation box, touching the ground plane
+        "rad_x_origin": -round(W_sub / 2, 3) - air_margin,
+        "rad_y_origin": -round(L_sub / 2, 3) - air_margin,
+        "rad_z_origin": 0,
+        "rad_x_size": W_sub + 2 * air_margin,
+        "rad_y_size": L_sub + 2 * air_margin,
+        "rad_z_size": patch_top + air_margin,
+    }
+
+
+def print_substrate(params, material):
+    print("\n================ Antenna Substrate and Design Parameters ================\n")
+    print(f"Center Design Frequency: {params['f0'] / 1e9} GHz")
+    print(f"Substrate Material: {params['material_name']}")
+    print(f"  Substrate Thickness (h): {params['h']} mm")
+    print(f"  Copper on Substrate Thickness (h): {params['Cu_Thickness']} mm")
+    print(f"  Relative Permittivity (εr): {material['eps_r']}")
+    print(f"  Loss Tangent (tanδ): {material['tan_d']}")
+    print(f"  Relative Permeability (μr): {material['mu_r']}")
+    print(f"  Conductivity (σ): {material['sigma']}")
+    print("\n=========================================================================\n")
+
+
+def print_dimensions(dims):
+    print("\n================== Computed Patch Antenna Parameters ==================\n")
+    print(f"Patch Width (W): {dims['W']} mm")
+    print(f"Patch Length (L): {dims['L']} mm")
+    print(f"Substrate Width (W_sub): {dims['W_sub']} mm")
+    print(f"Substrate Length (L_sub): {dims['L_sub']} mm")
+    print(f"Feed Point wrt Origin (x, y): ({dims['xf_from_origin']} mm, {dims['yf_from_origin']} mm)")
+    print(f"Corner Truncation Size: {dims['truncation']} mm")
+    print(f"Effective Dielectric Constant (εeff): {dims['eps_eff']:.2f}")
+    print(f"Coax Height below Ground: {dims['Coax_h']} mm")
+    print(f"Radiation Box Margin: {dims['air_margin']} mm")
+    print("\n=======================================================================\n")
+
+
+# Element coordinates: shifted by offset, rotated by rotation * 90° about
+# the unit-cell center, then moved to origin. Expressions pass through when
+# there is no rotation and no shift.
+def _place(x, y, offset=(0, 0), rotation=0, origin=(0, 0)):
+    x = x if not offset[0] else x + offset[0]
+    y = y if not offset[1] else y + offset[1]
+    for _ in range(rotation % 4):
+        x, y = -y, x
+    x = x if not origin[0] else x + origin[0]
+    y = y if not origin[1] else y + origin[1]
+    return x, y
+
+
+def _element_box(plan, name, corner, sizes, placement, **kwargs):
+    x, y, z = corner
+    dx, dy, dz = sizes
+    x0, y0 = _place(x, y, **placement)
+    if placement.get("rotation", 0) % 4:
+        x1, y1 = _place(x + dx, y + dy, **placement)
+        x0, y0, dx, dy = min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)
+    plan.box(name, [x0, y0, z], [dx, dy, dz], **kwargs)
+
+
+# Truncated patch, probe feed, coax, port sheet and the substrate/ground hole
+# tools of one element. Returns the element's object names; the holes are
+# subtracted by the caller, which owns the substrate and ground.
+def add_patch_element(plan, params, dims, suffix="", offset=(0, 0), rotation=0, origin=(0, 0)):
+    h = params["h"]
+    Cu_Thickness = params["Cu_Thickness"]
+    W, L = dims["W"], dims["L"]
+    W_half, L_half = dims["W_half"], dims["L_half"]
+    truncation = dims["truncation"]
+    patch_top = dims["patch_top"]
+    Coax_h, Coax_R, Coax_pin_R = dims["Coax_h"], dims["Coax_R"], dims["Coax_pin_R"]
+    placement = {"offset": offset, "rotation": rotation, "origin": origin}
+    xf, yf = _place(dims["xf_from_origin"], dims["yf_from_origin"], **placement)
+    names = {part: f"{part}{suffix}" for part in ELEMENT_PARTS}
+
+    # Cylindrical hole in the substrate for the probe feed
+    plan.cylinder(names["SubstrateHole"], [xf, yf, Cu_Thickness], radius=Coax_pin_R, height=h, orientation="Z")
+
+    # Coax clearance hole in the ground plane
+    plan.cylinder(names["Hole3D"], [xf, yf, 0], radius=Coax_R, height=Cu_Thickness, color=[255, 128, 64])
+
+    # Patch rectangle with thickness
+    _element_box(plan, names["Patch"], [-W_half, -L_half, Cu_Thickness + h], [W, L, Cu_Thickness], placement,
+                 material="copper", color=[255, 0, 0], transparency=0.11)
+
+    # --- Top-Left Corner (XY) ---
+    tl_base = [-W_half, L_half]  # corner point
+    tl_pt2 = [-W_half + truncation, L_half]  # move right
+    tl_pt3 = [-W_half, L_half - truncation]  # move down
+    plan.polygon(f"TruncTopLeft{suffix}", [[*_place(*p, **placement), patch_top] for p in (tl_base, tl_pt2, tl_pt3)],
+                 material="copper", thickness=Cu_Thickness)
+
+    # --- Bottom-Right Corner (XY) ---
+    br_base = [W_half, -L_half]  # corner point
+    br_pt2 = [W_half - truncation, -L_half]  # left
+    br_pt3 = [W_half, -L_half + truncation]  # up
+    plan.polygon(f"TruncBottomRight{suffix}", [[*_place(*p, **placement), patch_top] for p in (br_base, br_pt2, br_pt3)],
+                 material="copper", thickness=Cu_Thickness)
+
+    # --- Subtract triangular cuts from the patch ---
+    plan.subtract(names["Patch"], [f"TruncTopLeft{suffix}", f"TruncBottomRight{suffix}"])
+
+    # Coaxial cable, its pin and the pin going into the substrate
+    plan.cylinder(names["Coax"], [xf, yf, 0], radius=Coax_R, height=-Coax_h,
+                  material="glass_PTFEreinf", color=[128, 128, 192], transparency=0.5)
+    plan.cylinder(names["Coax_Pin"], [xf, yf, 0], radius=Coax_pin_R, height=-Coax_h,
+                  material="copper", color=[255, 0, 128], transparency=0)
+    plan.cylinder(names["Probe"], [xf, yf, 0], radius=Coax_pin_R, height=Cu_Thickness + h,
+                  material="copper", color=[255, 0, 128], transparency=0.5)
+
+    # Port sheet at the end of the coax
+    plan.circle(names["Port"], [xf, yf, -Coax_h], radius=Coax_R, color=[255, 128, 255])
+    return names
+
+
+# Substrate, ground, truncated patch, coax feed and radiation box as one plan
+def patch_plan(params, dims):
+    material_name = params["material_name"]
+    h = params["h"]
+    Cu_Thickness = params["Cu_Thickness"]
+    W_sub, L_sub = dims["W_sub"], dims["L_sub"]
+    W_sub_half, L_sub_half = dims["W_sub_half"], dims["L_sub_half"]
+
+    plan = GeometryPlan()
+
+    # Substrate and ground plane (as a box with thickness)
+    plan.box("Substrate", [-W_sub_half, -L_sub_half, Cu_Thickness], [W_sub, L_sub, h],
+             material=material_name, color=[143, 175, 175], transparency=0.4)
+    plan.box("Ground", [-W_sub_half, -L_sub_half, 0], [W_sub, L_sub, Cu_Thickness],
+             material="copper", color=[0, 255, 128], transparency=0.06)
+
+    # Patch, feed and port, with the probe hole in the substrate and the coax clearance hole in the ground
+    names = add_patch_element(plan, params, dims)
+    plan.subtract("Substrate", names["SubstrateHole"])
+    plan.subtract("Ground", names["Hole3D"])
+
+    # Radiation box
+    plan.box("AirBox",
+             [dims["rad_x_origin"], dims["rad_y_origin"], dims["rad_z_origin"]],
+             [dims["rad_x_size"], dims["rad_y_size"], dims["rad_z_size"]],
+             material="air", color=[0, 0, 0], transparency=0.95)
+    return plan
+
+
+def build_geometry(hfss, params, dims):
+    return patch_plan(params, dims).execute(hfss)
+
+
+# Radiation boundary on every air box face except the bottom (lowest Z-center).
+# The faces come from one bulk FaceIndex query instead of a call per face.
+def assign_radiation(hfss, index=None):
+    from face_index import FaceIndex
+    index = index or FaceIndex.load(hfss, "AirBox")
+    hfss.assign_radiation_boundary_to_faces(
+        index.select("AirBox", above=0),
+        name="Rad1"
+    )
+
+
+# Radiation boundary on the air box and wave port on the coax end
+def assign_excitations(hfss):
+    assign_radiation(hfss)
+
+    # Assign wave port with a simple integration line
+    hfss.wave_port(
+        "Port",
+        reference="Coax",
+        name="1",
+        renormalize=False
+    )
+
+
+# Adaptive setup at f0, the frequency sweep and the far-field sphere.
+# add_sweep=False leaves the sweeps to a SweepPlanner. With a FieldPolicy the
+# sweep saves no volume fields and a single-point sweep keeps them at f0, the
+# band edges and the user's frequencies within the disk budget.
+def create_analysis(hfss, f0, setup_props=None, sweep=None, sphere=None, add_sweep=True, field_policy=None):
+    setup = hfss.create_setup("Setup1")
+    setup.props["Frequency"] = freq_str(f0)
+    for key, value in (setup_props or SETUP_PROPS).items():
+        setup.props[key] = value
+    setup.update()
+
+    if add_sweep and field_policy is not None:
+        field_policy.apply(setup, sweep or SWEEP, f0)
+    elif add_sweep:
+        sweep_props = dict(sweep or SWEEP)
+        sweep_obj = setup.add_sweep(
+            name=sweep_props.pop("name"),
+            sweep_type=sweep_props.pop("sweep_type"),
+            **sweep_props
+        )
+        sweep_obj.update()
+
+    # Add infinite sphere with specified angular ranges
+    hfss.insert_infinite_sphere(**(sphere or SPHERE))
+    return setup
+
+
+# Create S11 report inside Ansys GUI
+def s11_report(hfss):
+    hfss.post.create_report(
+        expressions=["dB(S(1,1))"],
+        primary_sweep_variable="Freq",
+        variations={"Freq": ["All"]},
+        report_category="S Parameter",
+        context="Setup1",
+        plot_type="Rectangular Plot",
+    )
+
+
+# Axial ratio vs theta report at f0, phi = 0 inside Ansys GUI
+def axial_ratio_report(hfss, f0, sweep_name=None):
+    hfss.post.create_report(
+        expressions=["dB(AxialRatioValue)"],
+        primary_sweep_variable="Theta",
+        variations={
+            "Freq": [freq_str(f0)],
+            "Phi": ["0deg"],
+            "Theta": [f"{i}deg" for i in range(-180, 181, 10)]
+        },
+        setup_sweep_name=f"Setup1 : {sweep_name}" if sweep_name else None,
+        context="InfiniteSphere1",
+        report_category="Far Fields",
+        plot_type="Rectangular Plot"
+    )
+
+
+# Resonance and S11 at f0 from the S11 solution data
+def summarize_s11(solution_data, f0):
+    freqs = [float(f) for f in solution_data.primary_sweep_values]
+    s11 = [float(v) for v in solution_data.data_real("dB(S(1,1))")]
+    i_min = min(range(len(s11)), key=s11.__getitem__)
+    i_f0 = min(range(len(freqs)), key=lambda i: abs(freqs[i] - f0 / 1e9))
+    return {
+        "S11_min_dB": s11[i_min],
+        "f_res_GHz": freqs[i_min],
+        "S11_f0_dB": s11[i_f0],
+    }
+
+
+# S11 over the sweep and axial ratio vs theta at f0, phi = 0, plus any extra
+# (name, expression, query) quantities, in one SolutionBatch pass: one
+# get_solution_data call per report category instead of one per quantity.
+def extract_solutions(hfss, f0, sweep_name=None, s11=True, axial_ratio=True, quantities=None):
+    batch = SolutionBatch(hfss)
+    if s11:
+        batch.add("S11", "dB(S(1,1))", context="Setup1")
+    if axial_ratio:
+        batch.add("AR", "db(AxialRatioValue)",
+                  report_category="Far Fields",
+                  context="InfiniteSphere1",
+                  setup_sweep_name=f"Setup1 : {sweep_name}" if sweep_name else None,
+                  primary_sweep_variable="Theta",
+                  variations={"Freq": [freq_str(f0)], "Phi": ["0deg"]})
+    for name, expression, query in quantities or []:
+        batch.add(name, expression, **query)
+    return batch.run()
+
+
+# Axial ratio at θ = 0°, ϕ = 0°, f = f0 from the extracted AR quantity (None if absent)
+def boresight_axial_ratio(solutions, f0):
+    ar = solutions["AR"]
+    theta = ar.axes["Theta"]
+    ar_val = ar.at(Theta=0, Freq=f0 / 1e9)
+    if not len(theta) or np.abs(theta).min() > 1e-3 or math.isnan(ar_val):
+        print(f"❌ θ = 0°, ϕ = 0°, f = {f0 / 1e9} GHz not found in the solution data.")
+        return None
+    print(f"📌 Axial Ratio at θ = 0°, ϕ = 0°: {ar_val:.2f} dB")
+    return ar_val
+
+
+def write_params_txt(txt_path, params, material, dims):
+    try:
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(f"Center Frequency (GHz): {params['f0'] / 1e9:.12g}\n")
+            f.write(f"Material: {params['material_name']}\n")
+            f.write(f"Substrate thickness (h): {params['h']} mm\n")
+            f.write(f"Copper on Substrate thickness (h): {params['Cu_Thickness']} mm\n")
+            f.write(f"Relative Permittivity (εr): {material['eps_r']}\n")
+            f.write(f"Effective Dielectric Constant (εeff): {dims['eps_eff']:.3f}\n")
+            f.write(f"Loss Tangent: {material['tan_d']}\n")
+            f.write(f"Relative Permeability (μr): {material['mu_r']}\n")
+            f.write(f"Conductivity (σ): {material['sigma']}\n")
+            f.write(f"Patch Width (W): {dims['W']} mm\n")
+            f.write(f"Patch Length (L): {dims['L']} mm\n")
+            f.write(f"Substrate Width (W_sub): {dims['W_sub']} mm\n")
+            f.write(f"Substrate Length (L_sub): {dims['L_sub']} mm\n")
+            f.write(f"Feed Point wrt Origin (x, y): ({dims['xf_from_origin']}, {dims['yf_from_origin']}) mm\n")
+            f.write(f"Coax Height below Ground: {dims['Coax_h']} mm\n")
+            f.write(f"Coax Radius: {dims['Coax_R']} mm\n")
+            f.write(f"Coax Pin Radius: {dims['Coax_pin_R']} mm\n")
+            f.write(f"Radiation Box Margin: {dims['air_margin']} mm\n")
+            f.write(f"Corner Truncation Size: {dims['truncation']} mm\n")
+
+        print(f"✅ TXT saved to: {txt_path}")
+    except Exception as e:
+        print(f"❌ Failed to write TXT file: {e}")
+
+
+# S11 / axial-ratio extraction, boresight axial ratio and params.txt.
+# All quantities come from one extract_solutions pass into NumPy; GUI
+# reports (report=True) and the S11.csv / AxialRatio_vs_Theta.csv files
+# (csv=True) are optional outputs of the same data.
+# arrays_path also keeps the extracted arrays as one .npz (SolutionSet.load).
+# planned is a SweepPlanner result whose S11 summary replaces the S11 export.
+# local_far_field exports the rE grid once and computes axial ratio, CP gain
+# and beamwidths locally instead of querying an axial-ratio report.
+def post_process(hfss, params, material, dims, directory=None, report=True, planned=None, sweep_name=None,
+                 local_far_field=False, csv=True, quantities=None, arrays_path=None):
+    directory = directory or hfss.working_directory
+    f0 = params["f0"]
+    solutions = extract_solutions(hfss, f0, sweep_name, s11=planned is None, axial_ratio=not local_far_field,
+                                  quantities=quantities)
+    if arrays_path:
+        solutions.save(arrays_path)
+    if report:
+        if planned is None:
+            s11_report(hfss)
+        if not local_far_field:
+            axial_ratio_report(hfss, f0, sweep_name)
+    if csv:
+        files = {name: OUTPUT_FILES.get(name, f"{name}.csv") for name in solutions}
+        solutions.export_csv(directory, files)
+
+    if planned is None:
+        result = summarize_s11(solutions["S11"], f0)
+    else:
+        result = {k: v for k, v in planned.items() if k not in ("freqs", "s11_db")}
+    if local_far_field:
+        ff_path = export_far_field(hfss, directory, sweep_name=sweep_name, freqs=[f0])
+        result.update(FarField.from_csv(ff_path).summary(f0 / 1e9))
+        print(f"📌 Axial Ratio at θ = 0°, ϕ = 0°: {result['AR_boresight_dB']:.2f} dB")
+    else:
+        result["AR_boresight_dB"] = boresight_axial_ratio(solutions, f0)
+    write_params_txt(os.path.join(directory, "params.txt"), params, material, dims)
+    return result
+
+
+# Full build -> setup -> solve -> post pipeline for one parameter set.
+# With a DesignCache, identical inputs return the stored results without
+# building or solving; misses are solved and stored with their project.
+# With a ResultsStore, the exported arrays and params.txt are indexed too.
+# With a SweepPlanner, the fixed sweep is replaced by an adaptive one.
+# parametric=True builds on AEDT design variables (see parametric.py).
+# With a MaterialSnapshot the substrate is read from the local copy.
+# With a FieldPolicy fields are saved only at selected frequencies, and a
+# cached project keeps its solutions only within the policy's disk budget.
+def run_design(hfss, params=None, cores=4, report=True, directory=None,
+               setup_props=None, sweep=None, sphere=None, cache=None, store=None, planner=None,
+               local_far_field=False, parametric=False, materials=None, field_policy=None):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    setup_props = setup_props or SETUP_PROPS
+    sweep = planner.config() if planner is not None else (sweep or SWEEP)
+    sphere = sphere or SPHERE
+    material = read_material(hfss, params["material_name"], materials)
+    dims = patch_dimensions(params, material["eps_r"])
+
+    key = None
+    if cache is not None:
+        key = cache.key(params=params, material=material, dims=dims,
+                        setup=setup_props, sweep=sweep, sphere=sphere,
+                        fields=None if field_policy is None else field_policy.freqs,
+                        planner=planner is not None, local_far_field=local_far_field, parametric=parametric)
+        entry = cache.get(key)
+        if entry is not None:
+            print(f"♻️ Cache hit {key[:12]}: skipping build and solve")
+            cache.restore_outputs(entry, directory or hfss.working_directory)
+            return {**entry["results"], "cached": True, "project": entry["project"]}
+
+    if parametric:
+        from parametric import build_parametric
+        build_parametric(hfss, params, dims)
+    else:
+        build_geometry(hfss, params, dims)
+    assign_excitations(hfss)
+    if planner is None:
+        if field_policy is not None:
+            field_policy.estimate_mesh(dims, material["eps_r"], params["f0"])
+        setup = create_analysis(hfss, params["f0"], setup_props, sweep, sphere, field_policy=field_policy)
+        hfss.analyze(cores=cores)
+        sweep_name = None
+        if field_policy is not None:
+            field_policy.measure_mesh(hfss, setup)
+            field_policy.add_resonance(hfss, setup, cores)
+            sweep_name = field_policy.sweep_name(params["f0"])
+        result = post_process(hfss, params, material, dims, directory=directory, report=report,
+                              sweep_name=sweep_name, local_far_field=local_far_field)
+    else:
+        setup = create_analysis(hfss, params["f0"], setup_props, sphere=sphere, add_sweep=False)
+        planned = planner.run(hfss, setup, params["f0"], directory=directory or hfss.working_directory, cores=cores)
+        result = post_process(hfss, params, material, dims, directory=directory, report=report,
+                              planned=planned, sweep_name=planner.FIELDS_SWEEP, local_far_field=local_far_field)
+    result.update({
+        "W": dims["W"],
+        "L": dims["L"],
+        "truncation": dims["truncation"],
+        "xf_from_origin": dims["xf_from_origin"],
+        "yf_from_origin": dims["yf_from_origin"],
+    })
+    if store is not None:
+        result["run_id"] = store.add_from_directory(directory or hfss.working_directory)
+
+    if cache is not None:
+        hfss.save_project()
+        outputs = ["params.txt", OUTPUT_FILES["S11"], "rE_FarField.csv" if local_far_field else OUTPUT_FILES["AR"]]
+        cache.put(key, result, project_file=hfss.project_file,
+                  outputs=[os.path.join(directory or hfss.working_directory, name) for name in outputs],
+                  max_results_bytes=None if field_policy is None else field_policy.budget_bytes)
+        result["cached"] = False
+    return result
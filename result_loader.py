@@ -0,0 +1,152 @@
+import itertools
+
+import numpy as np
+
+# Loader for the ';'-delimited CSVs written by solution_data.export_data_to_csv
+# (S11.csv, AxialRatio_vs_Theta.csv, full-sphere far-field exports).
+#
+#   columns = load_columns("S11.csv")                     # {"Freq [GHz]": array, ...}
+#   table = FarFieldTable.from_csv("AxialRatio_vs_Theta.csv")
+#   table.lookup("db(AxialRatioValue)", freq=1.57542, theta=0, phi=0)
+#
+# Rows are parsed straight into float columns in chunks of chunk_rows lines,
+# so multi-GB exports stream through with bounded memory.
+
+DELIMITER = ";"
+
+
+def read_header(path):
+    with open(path, mode="r", encoding="utf-8") as file:
+        header = file.readline()
+    return [name.strip().strip('"') for name in header.rstrip("\r\n").split(DELIMITER)]
+
+
+# Exact column name, else the first column starting with it ("Freq" -> "Freq [GHz]")
+def find_column(columns, name):
+    if name in columns:
+        return name
+    lowered = name.lower()
+    for column in columns:
+        if column.lower().startswith(lowered):
+            return column
+    raise KeyError(f"Column {name!r} not found in {columns}")
+
+
+def _parse_chunk(lines, usecols, dtype):
+    try:
+        return np.loadtxt(lines, delimiter=DELIMITER, usecols=usecols, dtype=dtype, ndmin=2)
+    except ValueError:
+        # Skip malformed lines, only paying for the slow path on a bad chunk
+        rows = []
+        for line in lines:
+            try:
+                rows.append(np.loadtxt([line], delimiter=DELIMITER, usecols=usecols, dtype=dtype, ndmin=2))
+            except ValueError:
+                continue
+        if not rows:
+            return np.empty((0, len(usecols)), dtype=dtype)
+        return np.vstack(rows)
+
+
+# Yield {column: array} for consecutive blocks of at most chunk_rows rows
+def iter_chunks(path, columns=None, chunk_rows=1_000_000, dtype=np.float64):
+    header = read_header(path)
+    names = header if columns is None else [find_column(header, c) for c in columns]
+    usecols = [header.index(n) for n in names]
+    with open(path, mode="r", encoding="utf-8") as file:
+        file.readline()
+        while True:
+            lines = list(itertools.islice(file, chunk_rows))
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip()]
+            data = _parse_chunk(lines, usecols, dtype)
+            yield {name: data[:, i] for i, name in enumerate(names)}
+
+
+# Whole file (or the selected columns) as NumPy columns in one pass
+def load_columns(path, columns=None, chunk_rows=1_000_000, dtype=np.float64):
+    blocks = list(iter_chunks(path, columns, chunk_rows, dtype))
+    if not blocks:
+        header = read_header(path)
+        names = header if columns is None else [find_column(header, c) for c in columns]
+        return {name: np.empty(0, dtype=dtype) for name in names}
+    return {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]}
+
+
+# Far-field samples indexed on (freq, theta, phi).
+#
+# Each axis is reduced to its sorted unique values and every row gets an
+# integer grid position, so lookups are a searchsorted per axis plus one
+# fancy-index into a dense (n_freq, n_theta, n_phi) row map. Missing grid
+# points map to -1 and read back as NaN.
+class FarFieldTable:
+    def __init__(self, columns, freq="Freq", theta="Theta", phi="Phi"):
+        names = list(columns)
+        self.columns = columns
+        self.axis_names = [find_column(names, a) for a in (freq, theta, phi)]
+        self.axes = []
+        positions = []
+        for name in self.axis_names:
+            values, inverse = np.unique(columns[name], return_inverse=True)
+            self.axes.append(values)
+            positions.append(inverse)
+        shape = tuple(len(a) for a in self.axes)
+        self.row_map = np.full(shape, -1, dtype=np.int64)
+        self.row_map[tuple(positions)] = np.arange(len(columns[self.axis_names[0]]))
+
+    @classmethod
+    def from_csv(cls, path, columns=None, chunk_rows=1_000_000, freq="Freq", theta="Theta", phi="Phi"):
+        if columns is not None:
+            columns = [freq, theta, phi] + list(columns)
+        return cls(load_columns(path, columns, chunk_rows), freq=freq, theta=theta, phi=phi)
+
+    # Nearest grid index per value, and whether it lies within tol
+    def _positions(self, axis, values, tol):
+        grid = self.axes[axis]
+        if len(grid) == 1:
+            idx = np.zeros(values.shape, dtype=np.int64)
+        else:
+            hi = np.clip(np.searchsorted(grid, values), 1, len(grid) - 1)
+            lo = hi - 1
+            idx = np.where(np.abs(values - grid[lo]) <= np.abs(grid[hi] - values), lo, hi)
+        return idx, np.abs(grid[idx] - values) <= tol
+
+    # Vectorized lookup: freq/theta/phi broadcast against each other.
+    # Returns NaN where no sample lies within the tolerance.
+    def lookup(self, column, freq, theta, phi, freq_tol=1e-5, angle_tol=1e-3):
+        column = find_column(list(self.columns), column)
+        freq, theta, phi = np.broadcast_arrays(
+            np.asarray(freq, dtype=float), np.asarray(theta, dtype=float), np.asarray(phi, dtype=float)
+        )
+        fi, f_ok = self._positions(0, freq, freq_tol)
+        ti, t_ok = self._positions(1, theta, angle_tol)
+        pi, p_ok = self._positions(2, phi, angle_tol)
+        rows = self.row_map[fi, ti, pi]
+        ok = f_ok & t_ok & p_ok & (rows >= 0)
+        out = np.full(rows.shape, np.nan)
+        out[ok] = self.columns[column][rows[ok]]
+        return out if out.ndim else float(out)
+
+    # Dense (n_freq, n_theta, n_phi) cube of one column, NaN where missing
+    def grid(self, column):
+        column = find_column(list(self.columns), column)
+        cube = np.full(self.row_map.shape, np.nan)
+        present = self.row_map >= 0
+        cube[present] = self.columns[column][self.row_map[present]]
+        return cube
+
+
+# Single-point lookup that streams the file chunk by chunk instead of loading
+# it, for one-off queries on exports too large to index in memory
+def stream_lookup(path, column, freq, theta, phi, freq_tol=1e-5, angle_tol=1e-3, chunk_rows=1_000_000):
+    header = read_header(path)
+    names = [find_column(header, n) for n in ("Freq", "Theta", "Phi", column)]
+    for chunk in iter_chunks(path, names, chunk_rows):
+        f, t, p, v = (chunk[n] for n in names)
+        hit = np.flatnonzero(
+            (np.abs(f - freq) < freq_tol) & (np.abs(t - theta) < angle_tol) & (np.abs(p - phi) < angle_tol)
+        )
+        if hit.size:
+            return float(v[hit[0]])
+    return None
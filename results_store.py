@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import sqlite3
+import time
+import uuid
+
+import numpy as np
+
+from result_loader import FarFieldTable, find_column, load_columns
+
+# On-disk results store: one folder of .npy arrays per run (memory-mappable
+# with np.load(..., mmap_mode="r")) plus a SQLite index of the design
+# parameters, so queries never touch the arrays themselves.
+#
+#   store = ResultsStore("results_db")
+#   run_id = store.add_from_directory(hfss.working_directory)
+#   for run in store.query(material="FR4_epoxy", h=1.6, truncation=(5, 7)):
+#       s11 = store.load(run["run_id"], "s11_db")
+
+# params.txt label -> indexed column
+PARAMS_TXT_FIELDS = {
+    "Center Frequency (GHz)": "f0_ghz",
+    "Material": "material",
+    "Substrate thickness (h)": "h",
+    "Copper on Substrate thickness (h)": "Cu_Thickness",
+    "Relative Permittivity (εr)": "eps_r",
+    "Effective Dielectric Constant (εeff)": "eps_eff",
+    "Loss Tangent": "tan_d",
+    "Relative Permeability (μr)": "mu_r",
+    "Conductivity (σ)": "sigma",
+    "Patch Width (W)": "W",
+    "Patch Length (L)": "L",
+    "Substrate Width (W_sub)": "W_sub",
+    "Substrate Length (L_sub)": "L_sub",
+    "Coax Height below Ground": "Coax_h",
+    "Coax Radius": "Coax_R",
+    "Coax Pin Radius": "Coax_pin_R",
+    "Radiation Box Margin": "air_margin",
+    "Corner Truncation Size": "truncation",
+}
+
+NUMERIC_COLUMNS = [
+    "f0_ghz", "h", "Cu_Thickness", "eps_r", "eps_eff", "tan_d", "mu_r", "sigma",
+    "W", "L", "W_sub", "L_sub", "xf_from_origin", "yf_from_origin",
+    "Coax_h", "Coax_R", "Coax_pin_R", "air_margin", "truncation",
+]
+
+INDEXED_COLUMNS = ["material", "f0_ghz", "h", "truncation", "W", "L"]
+
+_NUMBER = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+
+
+def _to_float(text):
+    match = _NUMBER.search(str(text))
+    return float(match.group()) if match else None
+
+
+# Parse the params.txt written by patch_pipeline.write_params_txt
+def read_params_txt(path):
+    params = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            label, sep, value = line.partition(":")
+            if not sep:
+                continue
+            label, value = label.strip(), value.strip()
+            if label == "Feed Point wrt Origin (x, y)":
+                x, y = _NUMBER.findall(value)[:2]
+                params["xf_from_origin"] = float(x)
+                params["yf_from_origin"] = float(y)
+            elif label in PARAMS_TXT_FIELDS:
+                key = PARAMS_TXT_FIELDS[label]
+                params[key] = value if key == "material" else _to_float(value)
+    return params
+
+
+class ResultsStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30)
+        self.db.row_factory = sqlite3.Row
+        columns = ", ".join(f"{c} REAL" for c in NUMERIC_COLUMNS)
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, created REAL, material TEXT, "
+            f"{columns}, params_json TEXT)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS arrays (run_id TEXT, name TEXT, shape TEXT, dtype TEXT, "
+            "PRIMARY KEY (run_id, name))"
+        )
+        for column in INDEXED_COLUMNS:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS idx_runs_{column} ON runs ({column})")
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def _run_dir(self, run_id):
+        return os.path.join(self.root, "runs", run_id)
+
+    # Store one run's arrays and index its parameters
+    def add_run(self, params, arrays, run_id=None):
+        run_id = run_id or time.strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:8]
+        run_dir = self._run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(run_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+        row = {c: params.get(c) for c in NUMERIC_COLUMNS}
+        self.db.execute(
+            f"INSERT OR REPLACE INTO runs (run_id, created, material, {', '.join(NUMERIC_COLUMNS)}, params_json) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in NUMERIC_COLUMNS)}, ?)",
+            [run_id, time.time(), params.get("material")] + [row[c] for c in NUMERIC_COLUMNS]
+            + [json.dumps(params, default=str)],
+        )
+        self.db.executemany(
+            "INSERT OR REPLACE INTO arrays (run_id, name, shape, dtype) VALUES (?, ?, ?, ?)",
+            [(run_id, name, json.dumps(list(np.shape(a))), str(np.asarray(a).dtype)) for name, a in arrays.items()],
+        )
+        self.db.commit()
+        return run_id
+
+    # Import a finished run folder: params.txt, S11.csv and AxialRatio_vs_Theta.csv
+    def add_from_directory(self, directory, run_id=None):
+        params = read_params_txt(os.path.join(directory, "params.txt"))
+        arrays = {}
+
+        s11_path = os.path.join(directory, "S11.csv")
+        if os.path.exists(s11_path):
+            columns = load_columns(s11_path)
+            names = list(columns)
+            arrays["s11_freq_ghz"] = columns[find_column(names, "Freq")]
+            arrays["s11_db"] = columns[find_column(names, "dB(S(1,1))")]
+
+        ar_path = os.path.join(directory, "AxialRatio_vs_Theta.csv")
+        if os.path.exists(ar_path):
+            table = FarFieldTable.from_csv(ar_path)
+            arrays["ar_freq_ghz"], arrays["ar_theta_deg"], arrays["ar_phi_deg"] = table.axes
+            arrays["ar_db"] = table.grid("db(AxialRatioValue)")
+
+        return self.add_run(params, arrays, run_id=run_id)
+
+    # Filter on indexed parameters: a scalar means equality, a (lo, hi) tuple
+    # an inclusive range, e.g. query(material="FR4_epoxy", truncation=(5, 7))
+    def query(self, **filters):
+        clauses, values = [], []
+        for column, value in filters.items():
+            if column != "material" and column not in NUMERIC_COLUMNS:
+                raise KeyError(f"Unknown parameter {column!r}")
+            if isinstance(value, tuple):
+                lo, hi = value
+                if lo is not None:
+                    clauses.append(f"{column} >= ?")
+                    values.append(lo)
+                if hi is not None:
+                    clauses.append(f"{column} <= ?")
+                    values.append(hi)
+            elif isinstance(value, float):
+                # A range, unlike ABS(col - ?), can be answered from the index
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                values += [value - 1e-9, value + 1e-9]
+            else:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(f"SELECT * FROM runs{where} ORDER BY created", values).fetchall()
+        return [dict(row) for row in rows]
+
+    def arrays(self, run_id):
+        rows = self.db.execute("SELECT name FROM arrays WHERE run_id = ?", (run_id,)).fetchall()
+        return [row["name"] for row in rows]
+
+    # Memory-mapped by default: only the pages actually read are loaded
+    def load(self, run_id, name, mmap=True):
+        return np.load(os.path.join(self._run_dir(run_id), f"{name}.npy"), mmap_mode="r" if mmap else None)
@@ -0,0 +1,204 @@
+import itertools
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from result_loader import load_columns
+
+# Several solution quantities in as few get_solution_data calls as possible,
+# straight into NumPy arrays.
+#
+#   batch = SolutionBatch(hfss)
+#   batch.add("S11", "dB(S(1,1))", context="Setup1")
+#   batch.add("Z11", "re(Z(1,1))", context="Setup1")       # same query as S11
+#   batch.add("AR", "db(AxialRatioValue)", report_category="Far Fields",
+#             context="InfiniteSphere1", primary_sweep_variable="Theta",
+#             variations={"Freq": ["1.57542GHz"], "Phi": ["0deg"]})
+#   solutions = batch.run()                 # 2 round trips for the 3 quantities
+#   solutions["S11"].values                 # array on solutions["S11"].axes
+#   solutions["AR"].at(Theta=0)
+#   solutions.export_csv(directory, {"S11": "S11.csv"})     # optional
+#   solutions.save("solutions.npz"); SolutionSet.load("solutions.npz")
+#
+# Requests sharing category, context, setup/sweep, primary sweep and
+# variations are merged into one query with all their expressions. The
+# returned data is unpacked in memory over every intrinsic variation
+# (Freq, Theta, Phi, ...) into a dense array per quantity; CSV files and GUI
+# reports are only written on request.
+
+QUERY_KEYS = ("report_category", "context", "setup_sweep_name", "primary_sweep_variable", "variations")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _axis_name(column):
+    return column.split(" [")[0]
+
+
+# {axis or expression: flat array} of a solution-data object, in memory when
+# it exposes its intrinsic variations, else through a temporary CSV export
+def solution_columns(data, expressions):
+    intrinsics = getattr(data, "intrinsics", None)
+    if intrinsics is None:
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            data.export_data_to_csv(path)
+            return {_axis_name(k): v for k, v in load_columns(path).items()}
+        finally:
+            os.remove(path)
+
+    primary = data.primary_sweep
+    others = [name for name in intrinsics if name != primary]
+    saved = dict(data.active_intrinsic)
+    sweep = np.asarray(data.primary_sweep_values, dtype=float)
+    columns = {name: [] for name in [primary, *others, *expressions]}
+    try:
+        for combo in itertools.product(*(intrinsics[name] for name in others)):
+            data.active_intrinsic.update(zip(others, combo))
+            columns[primary].append(sweep)
+            for name, value in zip(others, combo):
+                columns[name].append(np.full(sweep.shape, float(value)))
+            for expr in expressions:
+                columns[expr].append(np.asarray(data.data_real(expr), dtype=float))
+    finally:
+        data.active_intrinsic.update(saved)
+    return {name: np.concatenate(parts) if parts else np.array([]) for name, parts in columns.items()}
+
+
+class Quantity:
+    # values is a dense array on the axes (name -> sorted unique values), NaN where missing
+    def __init__(self, name, expression, axes, values, units=None):
+        self.name = name
+        self.expression = expression
+        self.axes = axes
+        self.values = values
+        self.units = units or {}
+
+    @classmethod
+    def from_columns(cls, name, expression, columns, axis_names, units=None):
+        axes, positions = {}, []
+        for axis in axis_names:
+            axes[axis], inverse = np.unique(columns[axis], return_inverse=True)
+            positions.append(inverse)
+        values = np.full(tuple(len(a) for a in axes.values()), np.nan)
+        values[tuple(positions)] = columns[expression]
+        return cls(name, expression, axes, values, units)
+
+    # Same reading interface as a solution-data object along the first axis
+    @property
+    def primary_sweep_values(self):
+        return list(next(iter(self.axes.values())))
+
+    def data_real(self, expression=None):
+        return list(self.values.reshape(self.values.shape[0], -1)[:, 0])
+
+    # Value at the grid point nearest to the given coordinates (other axes: first point)
+    def at(self, **coords):
+        index = tuple(int(np.argmin(np.abs(values - coords[axis]))) if axis in coords else 0
+                      for axis, values in self.axes.items())
+        return float(self.values[index])
+
+    # Flat columns with unit-labelled headers, as export_data_to_csv writes them
+    def columns(self):
+        grids = np.meshgrid(*self.axes.values(), indexing="ij")
+        columns = {f"{axis} [{self.units.get(axis, '')}]": g.ravel() for axis, g in zip(self.axes, grids)}
+        columns[f"{self.expression} []"] = self.values.ravel()
+        return columns
+
+
+class SolutionSet(dict):
+    # Every quantity (axes, values, expression, units) in one .npz, written atomically
+    def save(self, path):
+        arrays, meta = {}, {}
+        for name, q in self.items():
+            arrays[f"{name}:values"] = q.values
+            for i, values in enumerate(q.axes.values()):
+                arrays[f"{name}:axis{i}"] = values
+            meta[name] = {"expression": q.expression, "axes": list(q.axes), "units": q.units}
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, __meta__=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        solutions = cls()
+        with np.load(path) as data:
+            for name, m in json.loads(str(data["__meta__"])).items():
+                axes = {axis: data[f"{name}:axis{i}"] for i, axis in enumerate(m["axes"])}
+                solutions[name] = Quantity(name, m["expression"], axes, data[f"{name}:values"], m["units"])
+        return solutions
+
+    def export_csv(self, directory, files=None, delimiter=";"):
+        files = files or {name: f"{name}.csv" for name in self}
+        paths = {}
+        for name, file_name in files.items():
+            columns = self[name].columns()
+            path = os.path.join(directory, file_name)
+            np.savetxt(path, np.column_stack(list(columns.values())), delimiter=delimiter,
+                       header=delimiter.join(columns), comments="", fmt="%.10g")
+            print(f"✅ CSV saved to: {path}")
+            paths[name] = path
+        return paths
+
+
+# hfss.post.get_solution_data with a clear error instead of a False result:
+# pyaedt returns False when the report cannot be built (unsolved setup, wrong context...)
+def get_solution_data(hfss, expressions, **query):
+    data = hfss.post.get_solution_data(expressions=expressions, **query)
+    if data is None or data is False:
+        where = ", ".join(f"{k}={query[k]!r}" for k in ("setup_sweep_name", "context", "report_category")
+                          if k in query) or "the nominal solution"
+        raise RuntimeError(f"No solution data for {', '.join(expressions)} ({where})")
+    return data
+
+
+class SolutionBatch:
+    def __init__(self, hfss):
+        self.hfss = hfss
+        self.requests = []
+        self.rpc_count = 0
+
+    def add(self, name, expression, report_category=None, context=None, setup_sweep_name=None,
+            primary_sweep_variable="Freq", variations=None):
+        self.requests.append({
+            "name": name,
+            "expression": expression,
+            "report_category": report_category,
+            "context": context,
+            "setup_sweep_name": setup_sweep_name,
+            "primary_sweep_variable": primary_sweep_variable,
+            "variations": variations,
+        })
+        return self
+
+    # Requests grouped by identical query arguments, in insertion order
+    def groups(self):
+        groups = {}
+        for request in self.requests:
+            groups.setdefault(_freeze([request[k] for k in QUERY_KEYS]), []).append(request)
+        return list(groups.values())
+
+    def run(self):
+        solutions = SolutionSet()
+        for group in self.groups():
+            query = {k: group[0][k] for k in QUERY_KEYS if group[0][k] is not None}
+            expressions = list(dict.fromkeys(r["expression"] for r in group))
+            self.rpc_count += 1
+            data = get_solution_data(self.hfss, expressions, **query)
+            columns = solution_columns(data, expressions)
+            axis_names = [k for k in columns if k not in expressions]
+            units = getattr(data, "units_sweeps", {})
+            for r in group:
+                solutions[r["name"]] = Quantity.from_columns(r["name"], r["expression"], columns, axis_names, units)
+        return solutions
@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+
+from solution_batch import get_solution_data
+
+# Adaptive frequency-sweep planner, replacing the fixed 1001/2001-point sweeps.
+#
+# 1. A coarse discrete sweep (no fields) locates the S11 resonance.
+# 2. Refinement passes add single-point sweeps only where linear
+#    interpolation between neighbours would be off by more than tolerance_db
+#    (sharp curvature), plus at the resonance and -10 dB crossings until they
+#    are resolved to min_step.
+# 3. One last single-point sweep saves fields only at the frequencies that are
+#    post-processed: f0 plus field_freqs (default: the resonance).
+#
+#   planner = SweepPlanner(start=1.54e9, stop=1.58e9)
+#   result = planner.run(hfss, setup, f0)
+#   post_process(hfss, params, material, dims, planned=result, sweep_name=planner.FIELDS_SWEEP)
+
+
+# Resonance and -10 dB band of an S11 curve (freqs ascending, s11 in dB)
+def find_band(freqs, s11, level=-10.0):
+    freqs = np.asarray(freqs, dtype=float)
+    s11 = np.asarray(s11, dtype=float)
+    i_min = int(np.argmin(s11))
+    band = {"f_res": freqs[i_min], "S11_min_dB": s11[i_min], "f_low": None, "f_high": None, "bandwidth": None}
+    if s11[i_min] > level:
+        return band
+
+    below = s11 <= level
+    lo = i_min
+    while lo > 0 and below[lo - 1]:
+        lo -= 1
+    hi = i_min
+    while hi < len(s11) - 1 and below[hi + 1]:
+        hi += 1
+
+    # Linear interpolation of the crossings inside the bracketing intervals
+    if lo > 0:
+        band["f_low"] = np.interp(level, [s11[lo], s11[lo - 1]], [freqs[lo], freqs[lo - 1]])
+    if hi < len(s11) - 1:
+        band["f_high"] = np.interp(level, [s11[hi], s11[hi + 1]], [freqs[hi], freqs[hi + 1]])
+    if band["f_low"] is not None and band["f_high"] is not None:
+        band["bandwidth"] = band["f_high"] - band["f_low"]
+    return band
+
+
+# Midpoints of the intervals that still need points.
+#
+# The linear-interpolation error over an interval of width h is about
+# h^2/8 * |S11''|, with S11'' from second divided differences at its ends.
+# Intervals above tolerance_db, and intervals holding the resonance or a
+# -10 dB crossing that are wider than min_step, are split in two.
+def refine_points(freqs, s11, tolerance_db=0.5, min_step=0.5e6, level=-10.0):
+    freqs = np.asarray(freqs, dtype=float)
+    s11 = np.asarray(s11, dtype=float)
+    if len(freqs) < 3:
+        return np.empty(0)
+
+    widths = np.diff(freqs)
+    slopes = np.diff(s11) / widths
+    d2 = np.zeros_like(s11)
+    d2[1:-1] = 2 * np.diff(slopes) / (freqs[2:] - freqs[:-2])
+    curvature = np.maximum(np.abs(d2[:-1]), np.abs(d2[1:]))
+    split = widths ** 2 / 8 * curvature > tolerance_db
+
+    # Resonance and -10 dB crossings
+    i_min = int(np.argmin(s11))
+    features = [max(i_min - 1, 0), min(i_min, len(widths) - 1)]
+    crossings = np.flatnonzero(np.diff(np.sign(s11 - level)) != 0)
+    features.extend(crossings.tolist())
+    split[features] = True
+
+    split &= widths > min_step
+    return freqs[:-1][split] + widths[split] / 2
+
+
+def write_s11_csv(path, freqs, s11):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Freq [GHz];dB(S(1,1)) []\n")
+        for freq, value in zip(freqs, s11):
+            f.write(f"{freq / 1e9:.9g};{value:.9g}\n")
+    print(f"✅ CSV saved to: {path}")
+
+
+class SweepPlanner:
+    COARSE_SWEEP = "Coarse"
+    FIELDS_SWEEP = "Fields"
+
+    def __init__(self, start=1.54e9, stop=1.58e9, coarse_points=41, max_points=201,
+                 max_iterations=4, tolerance_db=0.5, min_step=0.5e6, field_freqs=None):
+        self.start = start
+        self.stop = stop
+        self.coarse_points = coarse_points
+        self.max_points = max_points
+        self.max_iterations = max_iterations
+        self.tolerance_db = tolerance_db
+        self.min_step = min_step
+        self.field_freqs = field_freqs
+        self.sweeps = []
+
+    # Everything that changes the planned sweeps, for cache keys
+    def config(self):
+        return {
+            "planner": "adaptive",
+            "start": self.start,
+            "stop": self.stop,
+            "coarse_points": self.coarse_points,
+            "max_points": self.max_points,
+            "max_iterations": self.max_iterations,
+            "tolerance_db": self.tolerance_db,
+            "min_step": self.min_step,
+            "field_freqs": self.field_freqs,
+        }
+
+    def _s11(self, hfss, setup, sweep_name):
+        data = get_solution_data(
+            hfss,
+            ["dB(S(1,1))"],
+            primary_sweep_variable="Freq",
+            setup_sweep_name=f"{setup.name} : {sweep_name}"
+        )
+        freqs = np.asarray(data.primary_sweep_values, dtype=float) * 1e9  # GHz -> Hz
+        return freqs, np.asarray(data.data_real("dB(S(1,1))"), dtype=float)
+
+    def _solve_points(self, hfss, setup, name, freqs, cores, save_fields=False):
+        setup.create_single_point_sweep(
+            unit="GHz",
+            freq=[round(f / 1e9, 9) for f in freqs],
+            name=name,
+            save_single_field=save_fields,
+            save_fields=save_fields,
+            save_radiating_fields=save_fields
+        )
+        self.sweeps.append(name)
+        hfss.analyze_setup(setup.name, cores=cores)
+
+    def run(self, hfss, setup, f0, directory=None, cores=4):
+        self.sweeps = []
+
+        # Coarse pass, no fields
+        sweep = setup.add_sweep(
+            name=self.COARSE_SWEEP,
+            sweep_type="discrete",
+            RangeType="LinearCount",
+            RangeStart=f"{self.start / 1e9:g}GHz",
+            RangeEnd=f"{self.stop / 1e9:g}GHz",
+            RangeCount=self.coarse_points,
+            SaveFields=False,
+            SaveRadFields=False
+        )
+        sweep.update()
+        self.sweeps.append(self.COARSE_SWEEP)
+        hfss.analyze_setup(setup.name, cores=cores)
+        freqs, s11 = self._s11(hfss, setup, self.COARSE_SWEEP)
+
+        # Refinement passes where the curve bends
+        for k in range(1, self.max_iterations + 1):
+            budget = self.max_points - len(freqs)
+            new = refine_points(freqs, s11, self.tolerance_db, self.min_step)[:max(budget, 0)]
+            if not len(new):
+                break
+            name = f"Refine{k}"
+            print(f"🔎 {name}: adding {len(new)} point(s)")
+            self._solve_points(hfss, setup, name, new, cores)
+            f_new, s_new = self._s11(hfss, setup, name)
+            freqs, idx = np.unique(np.concatenate([freqs, f_new]), return_index=True)
+            s11 = np.concatenate([s11, s_new])[idx]
+
+        band = find_band(freqs, s11)
+
+        # Fields only where they are post-processed; f0 always (boresight axial ratio)
+        field_freqs = list(self.field_freqs or [float(band["f_res"])])
+        if all(abs(f - f0) > 1.0 for f in field_freqs):
+            field_freqs.append(f0)
+        field_freqs = sorted(field_freqs)
+        self._solve_points(hfss, setup, self.FIELDS_SWEEP, field_freqs, cores, save_fields=True)
+
+        print(f"✅ Adaptive sweep: {len(freqs)} points instead of a fixed sweep, fields at "
+              f"{', '.join(f'{f / 1e9:g} GHz' for f in field_freqs)}")
+
+        if directory:
+            write_s11_csv(os.path.join(directory, "S11.csv"), freqs, s11)
+
+        i_f0 = int(np.argmin(np.abs(freqs - f0)))
+        return {
+            "S11_min_dB": float(band["S11_min_dB"]),
+            "f_res_GHz": float(band["f_res"]) / 1e9,
+            "S11_f0_dB": float(s11[i_f0]),
+            "f_low_GHz": None if band["f_low"] is None else float(band["f_low"]) / 1e9,
+            "f_high_GHz": None if band["f_high"] is None else float(band["f_high"]) / 1e9,
+            "sweep_points": int(len(freqs)),
+            "freqs": freqs,
+            "s11_db": s11,
+        }
@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import itertools
+import multiprocessing
+import os
+import time
+
+# Per-process state: each worker owns one warm non-graphical AEDT session
+_worker = {}
+
+
+# Expand {"truncation": [5, 6, 7], "yf_from_origin": [-13, -12]} into one
+# parameter dict per combination, in a stable order
+def parameter_grid(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+# Number of concurrent HFSS sessions allowed by the core and licence budgets
+def worker_count(n_jobs, cores_per_job=4, core_budget=None, licences=None):
+    core_budget = core_budget or os.cpu_count() or 1
+    workers = max(1, core_budget // cores_per_job)
+    if licences is not None:
+        workers = min(workers, licences)
+    return max(1, min(workers, n_jobs))
+
+
+def _init_worker(ports, version, cache_dir, cache_bytes, store_dir):
+    from desktop_pool import DesktopPool
+    from design_cache import DesignCache
+    from material_cache import MaterialSnapshot
+    from results_store import ResultsStore
+    _worker["pool"] = DesktopPool(size=1, version=version, base_port=ports.get())
+    _worker["cache"] = DesignCache(cache_dir, cache_bytes) if cache_dir else None
+    _worker["store"] = ResultsStore(store_dir) if store_dir else None
+    _worker["materials"] = MaterialSnapshot()
+
+
+# A variant may carry a "name" label; every other key is a design parameter
+def _run_variant(index, variant, cores_per_job, project_dir, design_options):
+    from patch_pipeline import run_design
+    start = time.time()
+    row = {"index": index, **variant}
+    params = {k: v for k, v in variant.items() if k != "name"}
+    try:
+        project = f"Sweep_{index:04d}"
+        with _worker["pool"].lease(project=project, design="FR4PatchDesign", save=True) as hfss:
+            directory = os.path.join(project_dir, project)
+            os.makedirs(directory, exist_ok=True)
+            row.update(run_design(hfss, params, cores=cores_per_job, report=False, directory=directory,
+                                  cache=_worker["cache"], store=_worker["store"], materials=_worker["materials"],
+                                  **(design_options or {})))
+        row["status"] = "ok"
+    except Exception as e:
+        row["status"] = f"failed: {e}"
+    row["elapsed_s"] = round(time.time() - start, 1)
+    return row
+
+
+# Pool of worker processes, each owning one warm non-graphical HFSS session.
+# Kept open across batches so iterative callers (optimizers) pay the AEDT
+# start-up once per worker:
+#
+#   with SweepScheduler(workers=4) as scheduler:
+#       rows = scheduler.run(variants)
+#
+# With cache_dir, unchanged variants are served from the DesignCache; with
+# store_dir, every run is indexed in a ResultsStore. design_options are extra
+# run_design keywords (planner, local_far_field, ...).
+class SweepScheduler:
+    def __init__(self, workers, cores_per_job=4, version=None, base_port=50200, project_dir=None,
+                 cache_dir=None, cache_bytes=20e9, store_dir=None, design_options=None):
+        self.workers = workers
+        self.cores_per_job = cores_per_job
+        self.project_dir = project_dir or os.path.join(os.getcwd(), "sweep_results")
+        self.design_options = design_options
+        self.submitted = 0
+        os.makedirs(self.project_dir, exist_ok=True)
+
+        ctx = multiprocessing.get_context("spawn")
+        ports = ctx.Queue()
+        for i in range(workers):
+            ports.put(base_port + i)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker,
+            initargs=(ports, version, cache_dir, cache_bytes, store_dir)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    # Build and analyze a batch; rows come back in the order of variants
+    def run(self, variants):
+        variants = list(variants)
+        print(f"🚀 Running {len(variants)} variant(s) on {self.workers} HFSS worker(s) x {self.cores_per_job} cores")
+        futures = []
+        for variant in variants:
+            futures.append(self.executor.submit(
+                _run_variant, self.submitted, variant, self.cores_per_job, self.project_dir, self.design_options
+            ))
+            self.submitted += 1
+
+        rows = []
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"✅ Variant {row['index']} {row['status']} in {row['elapsed_s']} s")
+        rows.sort(key=lambda r: r["index"])
+        return rows
+
+
+# Build and analyze every variant in a pool of worker processes.
+# Returns one result row per variant (ordered like the grid) with S11 and the
+# boresight axial ratio, and writes them to results_csv when given.
+def run_sweep(variants, cores_per_job=4, core_budget=None, licences=None,
+              version=None, base_port=50200, project_dir=None, results_csv=None,
+              cache_dir=None, cache_bytes=20e9, store_dir=None, design_options=None):
+    variants = list(variants)
+    workers = worker_count(len(variants), cores_per_job, core_budget, licences)
+    with SweepScheduler(workers, cores_per_job, version, base_port, project_dir,
+                        cache_dir, cache_bytes, store_dir, design_options) as scheduler:
+        rows = scheduler.run(variants)
+    if results_csv:
+        write_table(results_csv, rows)
+    return rows
+
+
+def write_table(path, rows):
+    columns = []
+    for row in rows:
+        columns.extend(k for k in row if k not in columns)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, delimiter=";")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Results table saved to: {path}")
+
+
+if __name__ == "__main__":
+    grid = parameter_grid({
+        "truncation": [5, 6, 7],
+        "yf_from_origin": [-14.3873, -13.3873, -12.3873],
+    })
+    run_sweep(grid, results_csv=os.path.join(os.getcwd(), "sweep_results.csv"))
@@ -0,0 +1,185 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from solution_batch import Quantity, SolutionBatch, SolutionSet
+
+# Frequency sweep split into sub-bands solved concurrently by local worker
+# processes, then merged back into one dataset.
+#
+#   setup = create_analysis(hfss, f0, add_sweep=False)
+#   solutions = run_split_sweep(hfss, f0, parts=4, cores_per_part=2)
+#   summarize_s11(solutions["S11"], f0)                 # same API as one sweep
+#   solutions["AR"].at(Theta=0, Freq=f0 / 1e9)
+#
+# The adaptive solution of Setup1 is solved once in the main project and
+# saved. Each worker opens its own copy of the project (.aedt + .aedtresults)
+# in a separate non-graphical desktop, so every sub-band sweep starts from the
+# converged mesh, adds its sub-band to Setup1, solves it and extracts the
+# quantities into a SolutionSet. Sub-bands share their edge points; the
+# merge sorts along Freq and drops the duplicates.
+
+# Extracted per sub-band: S11 and the axial ratio vs theta (phi = 0) at every frequency
+PART_QUANTITIES = [
+    ("S11", "dB(S(1,1))", {}),
+    ("AR", "db(AxialRatioValue)", {"report_category": "Far Fields", "context": "InfiniteSphere1",
+                                   "primary_sweep_variable": "Theta",
+                                   "variations": {"Freq": ["All"], "Phi": ["0deg"], "Theta": ["All"]}}),
+]
+
+
+def _ghz(text):
+    return float(str(text).replace("GHz", ""))
+
+
+# LinearCount sweep -> parts sub-sweeps on the same frequency grid, sharing edge points
+def split_sweep(sweep, parts):
+    if sweep.get("RangeType", "LinearCount") != "LinearCount":
+        raise ValueError("Only LinearCount sweeps can be split")
+    start, end, count = _ghz(sweep["RangeStart"]), _ghz(sweep["RangeEnd"]), int(sweep["RangeCount"])
+    parts = max(1, min(parts, count - 1))
+    step = (end - start) / (count - 1)
+    edges = np.linspace(0, count - 1, parts + 1).round().astype(int)
+    return [{
+        **sweep,
+        "name": f"{sweep['name']}_{i + 1}",
+        "RangeStart": f"{start + lo * step:.12g}GHz",
+        "RangeEnd": f"{start + hi * step:.12g}GHz",
+        "RangeCount": int(hi - lo + 1),
+    } for i, (lo, hi) in enumerate(zip(edges[:-1], edges[1:]))]
+
+
+def copy_project(project_file, directory):
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, os.path.basename(project_file))
+    shutil.copy2(project_file, target)
+    results_dir = os.path.splitext(project_file)[0] + ".aedtresults"
+    if os.path.isdir(results_dir):
+        target_results = os.path.splitext(target)[0] + ".aedtresults"
+        shutil.rmtree(target_results, ignore_errors=True)
+        shutil.copytree(results_dir, target_results)
+    return target
+
+
+# Quantities of several sub-bands concatenated along `axis`, sorted, with
+# points closer than tol (in axis units) kept once
+def merge_solutions(sets, axis="Freq", tol=1e-9):
+    merged = SolutionSet()
+    for name in sets[0]:
+        parts = [s[name] for s in sets]
+        first = parts[0]
+        if axis not in first.axes:
+            merged[name] = first
+            continue
+        k = list(first.axes).index(axis)
+        values = np.concatenate([p.axes[axis] for p in parts])
+        data = np.concatenate([p.values for p in parts], axis=k)
+        order = np.argsort(values, kind="stable")
+        values, data = values[order], np.take(data, order, axis=k)
+        keep = np.concatenate([[True], np.diff(values) > tol])
+        axes = dict(first.axes)
+        axes[axis] = values[keep]
+        merged[name] = Quantity(name, first.expression, axes, np.compress(keep, data, axis=k), first.units)
+    return merged
+
+
+# Worker: open the project copy, add the sub-band to Setup1, solve, extract
+def _solve_part(project_file, design, sweep, cores, version, quantities):
+    from ansys.aedt.core import Hfss
+    start = time.time()
+    hfss = Hfss(project=project_file, design=design, non_graphical=True, new_desktop=True,
+                version=version, remove_lock=True)
+    try:
+        props = dict(sweep)
+        setup = hfss.get_setup("Setup1")
+        sub = setup.add_sweep(name=props.pop("name"), sweep_type=props.pop("sweep_type"), **props)
+        sub.update()
+        hfss.analyze_setup("Setup1", cores=cores)
+
+        batch = SolutionBatch(hfss)
+        for name, expression, query in quantities:
+            batch.add(name, expression, **{"setup_sweep_name": f"Setup1 : {sweep['name']}", **query})
+        path = os.path.join(os.path.dirname(project_file), "solutions.npz")
+        batch.run().save(path)
+        hfss.save_project()
+    finally:
+        hfss.release_desktop(close_projects=True, close_desktop=True)
+    return path, round(time.time() - start, 1)
+
+
+# Adaptive solve here, sub-band sweeps in parallel workers, merged SolutionSet back.
+# hfss must hold the built design with Setup1 and no sweep (create_analysis(add_sweep=False)).
+def run_split_sweep(hfss, f0, sweep=None, parts=None, cores_per_part=2, core_budget=None, work_dir=None,
+                    version=None, design=None, quantities=None):
+    from patch_pipeline import SWEEP
+    core_budget = core_budget or os.cpu_count() or 1
+    parts = parts or max(1, core_budget // cores_per_part)
+    work_dir = os.path.abspath(work_dir or os.path.join(os.getcwd(), "split_sweep"))
+    subs = split_sweep(sweep or SWEEP, parts)
+
+    print(f"🚀 Adaptive solve of Setup1 at {f0 / 1e9:g} GHz")
+    hfss.analyze_setup("Setup1", cores=core_budget)
+    hfss.save_project()
+    copies = [copy_project(hfss.project_file, os.path.join(work_dir, f"Part_{i + 1}")) for i in range(len(subs))]
+
+    print(f"🚀 Solving {len(subs)} sub-band(s) on {len(subs)} worker(s) x {cores_per_part} cores")
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(subs), mp_context=ctx) as executor:
+        futures = [executor.submit(_solve_part, copy, design or hfss.design_name, sub, cores_per_part, version,
+                                   quantities or PART_QUANTITIES)
+                   for copy, sub in zip(copies, subs)]
+        sets = []
+        for sub, future in zip(subs, futures):
+            path, elapsed = future.result()
+            print(f"✅ {sub['name']} ({sub['RangeStart']} - {sub['RangeEnd']}) solved in {elapsed} s")
+            sets.append(SolutionSet.load(path))
+
+    merged = merge_solutions(sets)
+    merged.save(os.path.join(work_dir, "solutions.npz"))
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve the patch sweep split into sub-bands on parallel workers.")
+    parser.add_argument("--parts", type=int, help="Number of sub-bands (default: cores / cores-per-part)")
+    parser.add_argument("--cores-per-part", type=int, default=2)
+    parser.add_argument("--work-dir", default=os.path.join(os.getcwd(), "split_sweep"))
+    parser.add_argument("--version", help="AEDT version, e.g. 2024.2")
+    args = parser.parse_args(argv)
+
+    from ansys.aedt.core import Hfss
+    from patch_pipeline import (
+        DEFAULT_PARAMS, OUTPUT_FILES, read_material, patch_dimensions, build_geometry, assign_excitations,
+        create_analysis, summarize_s11, boresight_axial_ratio, write_params_txt,
+    )
+
+    params = dict(DEFAULT_PARAMS)
+    os.makedirs(args.work_dir, exist_ok=True)
+    hfss = Hfss(project="SplitSweep", design="FR4PatchDesign", solution_type="Modal", non_graphical=True,
+                new_desktop=True, version=args.version)
+    try:
+        material = read_material(hfss, params["material_name"])
+        dims = patch_dimensions(params, material["eps_r"])
+        build_geometry(hfss, params, dims)
+        assign_excitations(hfss)
+        create_analysis(hfss, params["f0"], add_sweep=False)
+        solutions = run_split_sweep(hfss, params["f0"], parts=args.parts, cores_per_part=args.cores_per_part,
+                                    work_dir=args.work_dir, version=args.version)
+    finally:
+        hfss.release_desktop(close_projects=True, close_desktop=True)
+
+    solutions.export_csv(args.work_dir, {name: OUTPUT_FILES.get(name, f"{name}.csv") for name in solutions})
+    result = summarize_s11(solutions["S11"], params["f0"])
+    result["AR_boresight_dB"] = boresight_axial_ratio(solutions, params["f0"])
+    write_params_txt(os.path.join(args.work_dir, "params.txt"), params, material, dims)
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Behaviour checks on the FakeHfss backend (fake_hfss.py), no AEDT needed.
+#
+#   python -m pytest -q tests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Keep ~/.patch_design_cache (material snapshot, caches, studies) out of the real home
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path / "home"))
+    return tmp_path / "home"
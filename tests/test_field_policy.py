@@ -0,0 +1,42 @@
+import os
+
+from design_cache import DesignCache
+from fake_hfss import FakeHfss
+from field_policy import BYTES_PER_TET, FieldPolicy
+from mesh_estimator import read_mesh_stats
+from patch_pipeline import run_design
+
+
+def test_point_size_follows_the_solved_mesh(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path / "work"))
+    policy = FieldPolicy(budget_bytes=1e9)
+    run_design(hfss, report=False, field_policy=policy)
+
+    tets = read_mesh_stats(hfss.export_mesh_stats("Setup1"))
+    assert policy.tets == tets
+    assert policy.point_bytes() == tets * BYTES_PER_TET
+
+
+def test_f0_fields_kept_below_one_point(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path / "work"))
+    policy = FieldPolicy(budget_bytes=1.0)
+    result = run_design(hfss, report=False, field_policy=policy)
+
+    assert policy.saved_freqs == [hfss.get_setup("Setup1").get_sweep("Fields").frequencies()[0]]
+    assert result["AR_boresight_dB"] is not None
+
+
+def test_cached_project_drops_solutions_over_budget(tmp_path):
+    project = tmp_path / "work" / "Big.aedt"
+    results = tmp_path / "work" / "Big.aedtresults"
+    results.mkdir(parents=True)
+    project.write_text("project")
+    (results / "fields.dat").write_bytes(b"0" * 2000)
+    cache = DesignCache(str(tmp_path / "cache"))
+
+    entry = cache.put("small", {}, project_file=str(project), max_results_bytes=1000)
+    assert sorted(os.listdir(tmp_path / "cache" / "small")) == ["Big.aedt", "entry.json"]
+    assert entry["project"] == "Big.aedt"
+
+    cache.put("large", {}, project_file=str(project), max_results_bytes=10_000)
+    assert (tmp_path / "cache" / "large" / "Big.aedtresults" / "fields.dat").exists()
@@ -0,0 +1,57 @@
+import json
+
+from optimizer import PatchOptimizer
+
+
+# Stands in for SweepScheduler.run: one row per variant, failing the first `failures` calls
+class Scheduler:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.solved = []
+
+    def run(self, variants):
+        rows = []
+        for variant in variants:
+            self.solved.append(variant)
+            if self.failures:
+                self.failures -= 1
+                rows.append({"status": "failed: licence checkout failed"})
+            else:
+                rows.append({"status": "ok", "AR_boresight_dB": abs(variant["W"] - 45), "S11_f0_dB": -20.0})
+        return rows
+
+
+def test_failed_evaluations_are_not_memoized(tmp_path):
+    memo_path = str(tmp_path / "optimizer_memo.json")
+    point = {"W": 45.0, "L": 45.0, "truncation": 6.0, "xf_from_origin": 0.0, "yf_from_origin": -13.0}
+
+    first = PatchOptimizer(eps_r=4.4, start=point, memo_path=memo_path)
+    scheduler = Scheduler(failures=1)
+    assert first.evaluate(scheduler, [point]) == [float("inf")]
+    assert first.evaluate(scheduler, [point]) == [float("inf")]    # not retried in the same run
+    assert len(scheduler.solved) == 1
+    assert first.history[0]["status"].startswith("failed")
+    with open(memo_path, encoding="utf-8") as f:
+        assert json.load(f) == {}
+
+    second = PatchOptimizer(eps_r=4.4, start=point, memo_path=memo_path)
+    scheduler = Scheduler()
+    assert second.evaluate(scheduler, [point]) == [0.0]
+    assert len(scheduler.solved) == 1
+
+    third = PatchOptimizer(eps_r=4.4, start=point, memo_path=memo_path)
+    scheduler = Scheduler()
+    assert third.evaluate(scheduler, [point]) == [0.0]
+    assert scheduler.solved == []
+
+
+def test_failed_rows_of_old_memo_files_are_retried(tmp_path):
+    memo_path = tmp_path / "optimizer_memo.json"
+    point = {"W": 45.0, "L": 45.0, "truncation": 6.0, "xf_from_origin": 0.0, "yf_from_origin": -13.0}
+    optimizer = PatchOptimizer(eps_r=4.4, start=point, memo_path=str(memo_path))
+    memo_path.write_text(json.dumps({optimizer._key(point): {"status": "failed: solver crashed"}}))
+
+    optimizer = PatchOptimizer(eps_r=4.4, start=point, memo_path=str(memo_path))
+    scheduler = Scheduler()
+    assert optimizer.evaluate(scheduler, [point]) == [0.0]
+    assert len(scheduler.solved) == 1
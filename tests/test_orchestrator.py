@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from fake_hfss import FakeHfss
+from orchestrator import AsyncOrchestrator
+
+SOLVE_S = 0.4
+POST_S = 0.4
+
+
+class SlowPostOrchestrator(AsyncOrchestrator):
+    def _post(self, design):
+        time.sleep(POST_S)
+        return super()._post(design)
+
+
+class LateStartHfss(FakeHfss):
+    # AEDT registers a submitted solve only after start_delay seconds
+    start_delay = 0.2
+
+    def analyze(self, cores=4, blocking=True, **kwargs):
+        self._rpc("analyze")
+        self._submitted_at = time.perf_counter()
+        return True
+
+    @property
+    def are_there_simulations_running(self):
+        started = time.perf_counter() - self._submitted_at >= self.start_delay
+        if started and not self.setups[0].is_solved and self.setups[0]._done_at is None:
+            for setup in self.setups:
+                self._solve(setup, blocking=False)
+        return started and time.perf_counter() < self._busy_until
+
+
+def run(tmp_path, variants, orchestrator_class=AsyncOrchestrator, hfss_class=FakeHfss, **kwargs):
+    def open_design(index, variant):
+        hfss = hfss_class(project=f"Async_{index:04d}", design="FR4PatchDesign",
+                          working_directory=str(tmp_path / f"work_{index}"))
+        hfss.solve_time = SOLVE_S
+        return hfss
+
+    orchestrator = orchestrator_class(project_dir=str(tmp_path / "results"), poll_interval=0.02,
+                                      open_design=open_design, close_design=lambda hfss: None, **kwargs)
+    start = time.perf_counter()
+    rows = asyncio.run(orchestrator.run(variants))
+    return rows, orchestrator.timeline, time.perf_counter() - start
+
+
+def stage(timeline, index, name):
+    return next(t for t in timeline if t["index"] == index and t["stage"] == name)
+
+
+def test_next_solve_overlaps_export(tmp_path):
+    rows, timeline, elapsed = run(tmp_path, [{"name": f"v{i}"} for i in range(3)], SlowPostOrchestrator)
+
+    assert [r["status"] for r in rows] == ["ok"] * 3
+    for i in range(2):
+        assert stage(timeline, i + 1, "solve")["start_s"] < stage(timeline, i, "post")["end_s"]
+    # Serial would be 3 * (solve + post); overlapped about 3 solves and one export
+    assert elapsed < 3 * (SOLVE_S + POST_S) - POST_S
+
+
+def test_solve_not_yet_running_is_not_a_failure(tmp_path):
+    rows, _, _ = run(tmp_path, [{"name": "late"}], hfss_class=LateStartHfss)
+
+    assert rows[0]["status"] == "ok"
+
+
+def test_solve_that_never_starts_times_out(tmp_path):
+    class NeverStarts(LateStartHfss):
+        start_delay = 60
+
+    rows, _, _ = run(tmp_path, [{"name": "stuck"}], hfss_class=NeverStarts, start_timeout=0.2)
+
+    assert rows[0]["status"].startswith("failed: solve did not start")
@@ -0,0 +1,36 @@
+import re
+
+from fake_hfss import FakeHfss
+from parametric import VARIABLES, run_variants
+
+
+def params_txt(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    x, y = re.search(r"Feed Point wrt Origin \(x, y\): \(([-0-9.e]+), ([-0-9.e]+)\) mm", text).groups()
+    length = re.search(r"Patch Length \(L\): ([-0-9.e]+) mm", text).group(1)
+    return {"feed_x": float(x), "feed_y": float(y), "L": float(length)}
+
+
+def test_params_txt_describes_the_solved_variables(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path / "work"))
+    rows = run_variants(hfss, [{"L": 40}, {"L": 42, "feed_y": -10}], directory=str(tmp_path))
+
+    assert [r["index"] for r in rows] == [0, 1]
+    # the fake keeps the variables of the last variant
+    written = params_txt(tmp_path / "variant_1" / "params.txt")
+    for name in ("feed_x", "feed_y", "L"):
+        assert written[name] == hfss.evaluate(hfss.variables[name])
+    assert written["feed_y"] == -10
+
+
+def test_omitted_variables_stay_nominal(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path / "work"))
+    run_variants(hfss, [{"L": 40}], directory=str(tmp_path))
+    nominal = FakeHfss(working_directory=str(tmp_path / "nominal"))
+    run_variants(nominal, [{}], directory=str(tmp_path / "nominal"))
+
+    written = params_txt(tmp_path / "variant_0" / "params.txt")
+    assert written["L"] == 40
+    assert written["feed_y"] == nominal.evaluate(nominal.variables["feed_y"])
+    assert set(VARIABLES) <= set(hfss.variables)
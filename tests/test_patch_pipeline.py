@@ -0,0 +1,50 @@
+import os
+
+from design_cache import DesignCache
+from fake_hfss import FakeHfss
+from mesh_estimator import ConvergenceStudy
+from patch_pipeline import DEFAULT_PARAMS, run_design
+from results_store import ResultsStore
+from sweep_planner import SweepPlanner
+
+
+def test_cache_hit_restores_outputs_without_solving(tmp_path):
+    cache = DesignCache(str(tmp_path / "cache"))
+    first = run_design(FakeHfss(working_directory=str(tmp_path / "first")), report=False, cache=cache)
+
+    hfss = FakeHfss(working_directory=str(tmp_path / "second"))
+    second = run_design(hfss, report=False, cache=cache)
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["AR_boresight_dB"] == first["AR_boresight_dB"]
+    assert sorted(os.listdir(tmp_path / "second")) == ["AxialRatio_vs_Theta.csv", "S11.csv", "params.txt"]
+    assert hfss.rpc_calls["analyze"] == 0
+
+
+def test_results_store_finds_runs_by_float_parameters(tmp_path):
+    store = ResultsStore(str(tmp_path / "store"))
+    result = run_design(FakeHfss(working_directory=str(tmp_path / "work")), report=False, store=store)
+
+    runs = store.query(f0_ghz=DEFAULT_PARAMS["f0"] / 1e9, h=1.6)
+    assert [run["run_id"] for run in runs] == [result["run_id"]]
+    store.close()
+
+
+def test_planner_saves_fields_at_f0(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path / "work"))
+    planner = SweepPlanner(field_freqs=[1.56e9])
+    result = run_design(hfss, report=False, planner=planner)
+
+    fields = hfss.get_setup("Setup1").get_sweep(SweepPlanner.FIELDS_SWEEP).frequencies()
+    assert any(abs(f - DEFAULT_PARAMS["f0"]) <= 1.0 for f in fields)
+    assert result["AR_boresight_dB"] is not None
+
+
+def test_converged_margin_needs_a_larger_reference(tmp_path):
+    study = ConvergenceStudy(str(tmp_path / "study.json"))
+    study.add({"air_margin": 48, "f_res_GHz": 1.575, "S11_f0_dB": -20.0, "AR_boresight_dB": 1.0})
+    assert study.converged_margin() is None
+
+    study.add({"air_margin": 30, "f_res_GHz": 1.5752, "S11_f0_dB": -20.1, "AR_boresight_dB": 1.1})
+    study.add({"air_margin": 20, "f_res_GHz": 1.58, "S11_f0_dB": -20.1, "AR_boresight_dB": 1.1})
+    assert study.converged_margin() == 30
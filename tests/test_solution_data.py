@@ -0,0 +1,26 @@
+import pytest
+
+from fake_hfss import FakeHfss
+from field_policy import FieldPolicy
+from patch_pipeline import create_analysis
+from sweep_planner import SweepPlanner
+
+
+# Solved fake design whose reports cannot be built (pyaedt returns False)
+@pytest.fixture
+def hfss(tmp_path):
+    hfss = FakeHfss(working_directory=str(tmp_path))
+    create_analysis(hfss, 1.57542e9)
+    hfss.analyze()
+    hfss.post.get_solution_data = lambda **kwargs: False
+    return hfss
+
+
+def test_sweep_planner_reports_missing_solution_data(hfss):
+    with pytest.raises(RuntimeError, match="No solution data for dB\\(S\\(1,1\\)\\)"):
+        SweepPlanner()._s11(hfss, hfss.setups[0], SweepPlanner.COARSE_SWEEP)
+
+
+def test_field_policy_reports_missing_solution_data(hfss):
+    with pytest.raises(RuntimeError, match="No solution data for dB\\(S\\(1,1\\)\\) \\(context='Setup1'\\)"):
+        FieldPolicy().add_resonance(hfss, hfss.setups[0])
@@ -0,0 +1,229 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Per-call instrumentation for the hfss object.
+#
+#   tracer = Tracer()
+#   hfss = tracer.call("Hfss()", Hfss, project=..., ...)   # timed start-up, wrapped result
+#   with tracer.stage("build"):
+#       build_geometry(hfss, params, dims)
+#   tracer.write_chrome_trace("aedt_trace.json")           # chrome://tracing / Perfetto
+#   tracer.print_summary()
+#
+# Every method call and property write reached through the wrapped object
+# (hfss.modeler.create_box, obj.color = ..., ...) is recorded with its wall
+# time and payload size (repr length of arguments and result). Property reads
+# (hfss.modeler, face.center) only appear in the Chrome trace, as "read"
+# events, and are not counted as AEDT calls. Returned API objects are wrapped
+# too, so nested objects such as modeler, post, setups, Object3d and faces
+# are traced transparently.
+
+_PLAIN = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _size(value):
+    try:
+        return len(repr(value))
+    except Exception:
+        return 0
+
+
+def _unwrap(value):
+    if isinstance(value, _Proxy):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+def _wrappable(value):
+    if isinstance(value, _PLAIN) or isinstance(value, (dict, set, _Proxy)):
+        return False
+    module = type(value).__module__ or ""
+    return not module.startswith(("numpy", "builtins"))
+
+
+class Tracer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.events = []
+        self.stats = {}
+        self.stages = {}
+        self._stage = None
+
+    def _now_us(self):
+        return (time.perf_counter() - self.t0) * 1e6
+
+    def record(self, name, start_us, dur_us, args_bytes=0, result_bytes=0, category="aedt"):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": dur_us,
+            "pid": os.getpid(),
+            "tid": 1,
+            "args": {"args_bytes": args_bytes, "result_bytes": result_bytes, "stage": self._stage},
+        })
+        if category != "aedt":
+            return
+        stat = self.stats.setdefault(name, {"calls": 0, "total_us": 0.0, "max_us": 0.0, "bytes": 0})
+        stat["calls"] += 1
+        stat["total_us"] += dur_us
+        stat["max_us"] = max(stat["max_us"], dur_us)
+        stat["bytes"] += args_bytes + result_bytes
+        if self._stage is not None:
+            stage = self.stages.setdefault(self._stage, {"calls": 0, "aedt_us": 0.0, "wall_us": 0.0})
+            stage["calls"] += 1
+            stage["aedt_us"] += dur_us
+
+    def wrap(self, target, name="hfss"):
+        return _Proxy(self, target, name)
+
+    # Time a call (e.g. the Hfss() constructor) and wrap what it returns
+    def call(self, name, fn, *args, **kwargs):
+        start = self._now_us()
+        result = fn(*args, **kwargs)
+        self.record(name, start, self._now_us() - start, _size(args) + _size(kwargs))
+        return self.wrap(result, name.rstrip("()")) if _wrappable(result) else result
+
+    @contextmanager
+    def stage(self, name):
+        previous, self._stage = self._stage, name
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            dur = self._now_us() - start
+            self._stage = previous
+            self.record(name, start, dur, category="stage")
+            stage = self.stages.setdefault(name, {"calls": 0, "aedt_us": 0.0, "wall_us": 0.0})
+            stage["wall_us"] += dur
+
+    def write_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        print(f"✅ Trace saved to: {path}")
+        return path
+
+    def summary_rows(self):
+        rows = [
+            {
+                "call": name,
+                "calls": s["calls"],
+                "total_s": s["total_us"] / 1e6,
+                "mean_ms": s["total_us"] / s["calls"] / 1e3,
+                "max_ms": s["max_us"] / 1e3,
+                "payload_bytes": s["bytes"],
+            }
+            for name, s in self.stats.items()
+        ]
+        return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+    def print_summary(self, limit=30):
+        total = sum(s["total_us"] for s in self.stats.values()) / 1e6
+        calls = sum(s["calls"] for s in self.stats.values())
+        print("\n======================= AEDT Call Profile =======================\n")
+        if self.stages:
+            print(f"{'Stage':<28}{'Wall (s)':>10}{'AEDT (s)':>10}{'Calls':>8}")
+            for name, s in self.stages.items():
+                print(f"{name:<28}{s['wall_us'] / 1e6:>10.3f}{s['aedt_us'] / 1e6:>10.3f}{s['calls']:>8}")
+            print()
+        print(f"{'Call':<48}{'Calls':>7}{'Total (s)':>11}{'Mean (ms)':>11}{'Max (ms)':>10}{'Bytes':>9}")
+        for row in self.summary_rows()[:limit]:
+            print(f"{row['call'][:47]:<48}{row['calls']:>7}{row['total_s']:>11.3f}"
+                  f"{row['mean_ms']:>11.2f}{row['max_ms']:>10.2f}{row['payload_bytes']:>9}")
+        print(f"\n{calls} AEDT calls, {total:.3f} s in AEDT")
+        print("\n=================================================================\n")
+
+
+class _Proxy:
+    __slots__ = ("_tracer", "_target", "_name")
+
+    def __init__(self, tracer, target, name):
+        object.__setattr__(self, "_tracer", tracer)
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_name", name)
+
+    def _wrap_result(self, value, name):
+        tracer = object.__getattribute__(self, "_tracer")
+        if isinstance(value, list) and any(_wrappable(v) for v in value):
+            return [tracer.wrap(v, f"{name}[]") if _wrappable(v) else v for v in value]
+        if _wrappable(value):
+            return tracer.wrap(value, name)
+        return value
+
+    def __getattr__(self, attr):
+        tracer = object.__getattribute__(self, "_tracer")
+        target = object.__getattribute__(self, "_target")
+        name = f"{object.__getattribute__(self, '_name')}.{attr}"
+
+        start = tracer._now_us()
+        value = getattr(target, attr)
+        dur = tracer._now_us() - start
+
+        if callable(value) and not isinstance(value, type):
+            def traced(*args, **kwargs):
+                call_start = tracer._now_us()
+                result = value(*_unwrap(args), **_unwrap(kwargs))
+                tracer.record(f"{name}()", call_start, tracer._now_us() - call_start,
+                              _size(args) + _size(kwargs), _size(result) if isinstance(result, _PLAIN) else 0)
+                return self._wrap_result(result, name)
+            return traced
+
+        # Property reads are in the trace but not in the call counts
+        tracer.record(name, start, dur, 0, _size(value) if isinstance(value, _PLAIN) else 0, category="read")
+        return self._wrap_result(value, name)
+
+    def __setattr__(self, attr, value):
+        tracer = object.__getattribute__(self, "_tracer")
+        target = object.__getattribute__(self, "_target")
+        start = tracer._now_us()
+        setattr(target, attr, _unwrap(value))
+        tracer.record(f"{object.__getattribute__(self, '_name')}.{attr}=", start, tracer._now_us() - start, _size(value))
+
+    def __getitem__(self, key):
+        tracer = object.__getattribute__(self, "_tracer")
+        target = object.__getattribute__(self, "_target")
+        name = f"{object.__getattribute__(self, '_name')}[]"
+        start = tracer._now_us()
+        value = target[_unwrap(key)]
+        tracer.record(name, start, tracer._now_us() - start, _size(key))
+        return self._wrap_result(value, name)
+
+    def __setitem__(self, key, value):
+        tracer = object.__getattribute__(self, "_tracer")
+        target = object.__getattribute__(self, "_target")
+        start = tracer._now_us()
+        target[_unwrap(key)] = _unwrap(value)
+        tracer.record(f"{object.__getattribute__(self, '_name')}[]=", start, tracer._now_us() - start,
+                      _size(key) + _size(value))
+
+    def __iter__(self):
+        name = f"{object.__getattribute__(self, '_name')}[]"
+        for item in object.__getattribute__(self, "_target"):
+            yield self._wrap_result(item, name)
+
+    def __len__(self):
+        return len(object.__getattribute__(self, "_target"))
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, "_target"))
+
+    def __call__(self, *args, **kwargs):
+        tracer = object.__getattribute__(self, "_tracer")
+        target = object.__getattribute__(self, "_target")
+        name = f"{object.__getattribute__(self, '_name')}()"
+        start = tracer._now_us()
+        result = target(*_unwrap(args), **_unwrap(kwargs))
+        tracer.record(name, start, tracer._now_us() - start, _size(args) + _size(kwargs))
+        return self._wrap_result(result, name)
+
+    def __repr__(self):
+        return f"<traced {object.__getattribute__(self, '_name')}: {object.__getattribute__(self, '_target')!r}>"